@@ -0,0 +1,32 @@
+"""add_submission_text_hash
+
+Revision ID: 7c1f3a9e2b54
+Revises: 4166ebc15bbd
+Create Date: 2026-10-17 10:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f3a9e2b54'
+down_revision: Union[str, Sequence[str], None] = '4166ebc15bbd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SHA-256 of the normalized submission text, used to reuse analysis results
+    # (existing rows stay NULL and are simply never cache hits)
+    op.add_column('submissions', sa.Column('text_hash', sa.String(64), nullable=True))
+    op.create_index('ix_submissions_text_hash', 'submissions', ['text_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submissions_text_hash', table_name='submissions')
+    op.drop_column('submissions', 'text_hash')
@@ -0,0 +1,38 @@
+"""add_style_profiles
+
+Revision ID: 9d4e5b1c7a20
+Revises: 7c1f3a9e2b54
+Create Date: 2026-10-17 16:40:12.502913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e5b1c7a20'
+down_revision: Union[str, Sequence[str], None] = '7c1f3a9e2b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One row per student, shared by every worker; written with versioned upserts
+    op.create_table(
+        'style_profiles',
+        sa.Column('student_id', sa.String(length=255), nullable=False),
+        sa.Column('profile', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('total_texts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('student_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('style_profiles')
@@ -0,0 +1,35 @@
+"""add_submission_job_status
+
+Revision ID: e2a8c4f61b37
+Revises: 9d4e5b1c7a20
+Create Date: 2026-10-17 21:05:37.114620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8c4f61b37'
+down_revision: Union[str, Sequence[str], None] = '9d4e5b1c7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Job-mode submissions record what was requested and how the job ended, so
+    # its status can be reported after it leaves the worker's in-memory queue
+    op.add_column('submissions', sa.Column('requested_analyzers', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('submissions', sa.Column('job_status', sa.String(20), nullable=True))
+    op.add_column('submissions', sa.Column('job_error', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('submissions', 'job_error')
+    op.drop_column('submissions', 'job_status')
+    op.drop_column('submissions', 'requested_analyzers')
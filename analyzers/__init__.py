@@ -40,3 +40,26 @@ def create_standard_response(
         "confidence": round(confidence, 3) if confidence is not None else None,
         "details": details or {}
     }
+
+
+def create_timeout_response(deadline: float) -> Dict[str, Any]:
+    """
+    Creates the standardized result for an analyzer that missed its deadline.
+    
+    Args:
+        deadline: The deadline in seconds
+    
+    Returns:
+        Standardized response with no score and ``"status": "timeout"``
+    """
+    response = create_standard_response(raw={"error": f"Analysis did not finish within {deadline:g}s"})
+    response["status"] = "timeout"
+    return response
+
+
+def result_status(result: Dict[str, Any]) -> str:
+    """
+    Returns an analyzer result's status: "ok" unless the result was degraded
+    (e.g. "timeout").
+    """
+    return result.get("status", "ok") if isinstance(result, dict) else "ok"
@@ -2,12 +2,28 @@
 Anomaly detection module for identifying deviations in writing style.
 
 This module provides functions to compare current writing style profiles
-against baseline profiles to detect anomalies in writing patterns.
+against baseline profiles to detect anomalies in writing patterns. Numeric
+metrics are compared as per-student z-scores against the running statistics
+each profile keeps, all metrics at once (see style_profile_module.feature_vector).
 """
 
+import os
 from typing import List, Dict, Any
 import numpy as np
 from style_profile_module.style_profile import StyleProfile
+from style_profile_module.feature_vector import FEATURES, stack
+
+# A metric this many of the student's standard deviations from their mean is anomalous
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", 3.0))
+
+# Values a metric needs in the baseline before it is scored
+ANOMALY_MIN_SAMPLES = int(os.getenv("ANOMALY_MIN_SAMPLES", 5))
+
+# Lower bound of the spread, as a fraction of the mean
+ANOMALY_MIN_STD_RATIO = 0.05
+
+# Tone distributions less similar than this (cosine) are a shift
+TONE_SIMILARITY_THRESHOLD = 0.85
 
 
 def percentage_diff(a: float, b: float) -> float:
@@ -67,52 +83,72 @@ def tone_similarity_score(t1: Dict[str, float], t2: Dict[str, float]) -> float:
     return dot_product / (norm1 * norm2)
 
 
+def z_scores(values: np.ndarray, count: np.ndarray, center: np.ndarray, spread: np.ndarray) -> np.ndarray:
+    """
+    How many of each student's own standard deviations each value is from their mean.
+
+    All arguments are arrays over FEATURES (one row per submission when
+    stacked). The spread is floored at ANOMALY_MIN_STD_RATIO of the mean,
+    so a metric that has barely varied does not turn rounding noise into an
+    anomaly.
+
+    Returns:
+        z-scores, NaN where the value is missing, the baseline has fewer than
+        ANOMALY_MIN_SAMPLES values or no spread at all
+    """
+    spread = np.maximum(spread, ANOMALY_MIN_STD_RATIO * np.abs(center))
+    scored = (count >= ANOMALY_MIN_SAMPLES) & (spread > 0) & ~np.isnan(values)
+    return np.divide(values - center, spread, out=np.full(np.shape(scored), np.nan), where=scored)
+
+
+def score_profiles(currents: List[StyleProfile], baselines: List[StyleProfile]) -> np.ndarray:
+    """
+    Scores many submissions at once, e.g. a whole class.
+
+    Uses the decayed statistics of baselines that keep them (PROFILE_DECAY).
+
+    Args:
+        currents: Profiles of the submissions
+        baselines: The matching students' profiles before each submission
+
+    Returns:
+        z-score matrix of shape (len(currents), len(FEATURES)), NaN where not scored
+    """
+    if not currents:
+        return np.empty((0, len(FEATURES)))
+    values = np.vstack([current.features.values() for current in currents])
+    return z_scores(values, *stack([baseline.features for baseline in baselines]))
+
+
 def detect_anomaly(current: StyleProfile, baseline: StyleProfile) -> Dict[str, Any]:
     """
     Detect anomalies by comparing current style profile against baseline.
+
+    Each metric of the current submission is scored against the student's
+    own running mean and variance, so a noisy writer needs a larger change to
+    be flagged than a steady one. All metrics are scored in one vectorized
+    step and no history is read.
     
     Args:
-        current: Current style profile to analyze
-        baseline: Baseline style profile for comparison
+        current: Current style profile to analyze (usually one submission)
+        baseline: The student's profile before this submission
         
     Returns:
         Dictionary containing anomaly detection results:
         - anomaly: Boolean indicating if anomaly was detected
         - anomaly_reasons: List of reasons for the anomaly
-        - details: Detailed comparison metrics
+        - details: z-score of every metric with enough history, and tone similarity
     """
     reasons = []
     details = {}
     
-    # Compare average sentence length (threshold: ±15%)
-    if current.complexity.get("sentence_length") and baseline.complexity.get("sentence_length"):
-        current_avg_sentence = np.mean(current.complexity["sentence_length"])
-        baseline_avg_sentence = np.mean(baseline.complexity["sentence_length"])
-        
-        sentence_diff = percentage_diff(current_avg_sentence, baseline_avg_sentence)
-        details["sentence_length_diff"] = sentence_diff
-        
-        if sentence_diff > 0.15:
-            reasons.append(f"Sentence length deviation: {sentence_diff:.1%}")
-    
-    # Compare lexical density (threshold: ±15%)
-    if current.complexity.get("lexical_density") and baseline.complexity.get("lexical_density"):
-        current_avg_lexical = np.mean(current.complexity["lexical_density"])
-        baseline_avg_lexical = np.mean(baseline.complexity["lexical_density"])
+    z = score_profiles([current], [baseline])[0]
+    for index in np.flatnonzero(~np.isnan(z)):
+        name, score = FEATURES[index], float(z[index])
+        details[f"{name}_z"] = round(score, 2)
         
-        lexical_diff = percentage_diff(current_avg_lexical, baseline_avg_lexical)
-        details["lexical_density_diff"] = lexical_diff
-        
-        if lexical_diff > 0.15:
-            reasons.append(f"Lexical density deviation: {lexical_diff:.1%}")
-    
-    # Compare formality score (threshold: ±10%)
-    if current.average_formality > 0 and baseline.average_formality > 0:
-        formality_diff = percentage_diff(current.average_formality, baseline.average_formality)
-        details["formality_diff"] = formality_diff
-        
-        if formality_diff > 0.10:
-            reasons.append(f"Formality deviation: {formality_diff:.1%}")
+        if abs(score) > ANOMALY_Z_THRESHOLD:
+            reasons.append(f"{name.replace('_', ' ').capitalize()} deviation: z={score:+.1f}")
     
     # Compare tone distribution using cosine similarity
     if current.tone_distribution and baseline.tone_distribution:
@@ -127,54 +163,9 @@ def detect_anomaly(current: StyleProfile, baseline: StyleProfile) -> Dict[str, A
             tone_similarity = tone_similarity_score(current_tone_props, baseline_tone_props)
             details["tone_similarity"] = tone_similarity
             
-            if tone_similarity < 0.85:
+            if tone_similarity < TONE_SIMILARITY_THRESHOLD:
                 reasons.append(f"Tone distribution shift: similarity {tone_similarity:.2f}")
     
-    # Compare lexical diversity (threshold: ±15%)
-    if current.average_lexical_diversity > 0 and baseline.average_lexical_diversity > 0:
-        lexical_diversity_diff = percentage_diff(current.average_lexical_diversity, baseline.average_lexical_diversity)
-        details["lexical_diversity_diff"] = lexical_diversity_diff
-        
-        if lexical_diversity_diff > 0.15:
-            reasons.append(f"Lexical diversity deviation: {lexical_diversity_diff:.1%}")
-    
-    # Compare sentiment (threshold: ±20%)
-    if current.average_sentiment != 0 and baseline.average_sentiment != 0:
-        sentiment_diff = percentage_diff(current.average_sentiment, baseline.average_sentiment)
-        details["sentiment_diff"] = sentiment_diff
-        
-        if sentiment_diff > 0.20:
-            reasons.append(f"Sentiment deviation: {sentiment_diff:.1%}")
-    
-    # Compare grammar errors (threshold: ±25%)
-    if current.average_grammar_errors > 0 and baseline.average_grammar_errors > 0:
-        grammar_diff = percentage_diff(current.average_grammar_errors, baseline.average_grammar_errors)
-        details["grammar_diff"] = grammar_diff
-        
-        if grammar_diff > 0.25:
-            reasons.append(f"Grammar error deviation: {grammar_diff:.1%}")
-    
-    # Compare lexical richness (threshold: ±20%)
-    if current.average_lexical_richness > 0 and baseline.average_lexical_richness > 0:
-        lexical_richness_diff = percentage_diff(current.average_lexical_richness, baseline.average_lexical_richness)
-        details["lexical_richness_diff"] = lexical_richness_diff
-        
-        if lexical_richness_diff > 0.20:
-            reasons.append(f"Lexical richness deviation: {lexical_richness_diff:.1%}")
-    
-    # Compare readability scores (threshold: ±15%)
-    for metric in ["flesch_kincaid_grade", "smog_index", "gunning_fog", "dale_chall_score"]:
-        if (current.average_readability.get(metric, 0) > 0 and 
-            baseline.average_readability.get(metric, 0) > 0):
-            current_readability = current.average_readability[metric]
-            baseline_readability = baseline.average_readability[metric]
-            
-            readability_diff = percentage_diff(current_readability, baseline_readability)
-            details[f"{metric}_diff"] = readability_diff
-            
-            if readability_diff > 0.15:
-                reasons.append(f"{metric.replace('_', ' ').title()} deviation: {readability_diff:.1%}")
-    
     # Determine if anomaly exists
     anomaly_detected = len(reasons) > 0
     
@@ -182,4 +173,4 @@ def detect_anomaly(current: StyleProfile, baseline: StyleProfile) -> Dict[str, A
         "anomaly": anomaly_detected,
         "anomaly_reasons": reasons,
         "details": details
-    } 
\ No newline at end of file
+    }
@@ -0,0 +1,177 @@
+"""
+Dynamic micro-batching for model inference.
+
+Under concurrent load each request would otherwise run its own batch-size-1
+forward pass. A MicroBatcher sits in front of a batched model call: callers
+block on ``submit``, a single worker thread collects the requests that
+arrive within ``max_wait_ms`` of the first one (or until ``max_batch_size``
+items are waiting), runs them as one batch and hands each caller its result.
+
+Queue time and batch size are recorded in histograms for tuning the window.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds
+QUEUE_TIME_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class Histogram:
+    """
+    Cumulative bucket counts of observed values, in the Prometheus style.
+
+    Attributes:
+        bounds: Upper bound of each bucket, ascending
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: Cumulative count per bucket ("le_<bound>" and "le_inf"), count and mean
+        """
+        with self._lock:
+            buckets = {}
+            cumulative = 0
+            for bound, count in zip(self.bounds + (None,), self._counts):
+                cumulative += count
+                buckets["le_inf" if bound is None else f"le_{bound:g}"] = cumulative
+            return {
+                "buckets": buckets,
+                "count": self.count,
+                "mean": round(self.total / self.count, 3) if self.count else 0.0
+            }
+
+
+class _Request:
+    __slots__ = ("item", "future", "enqueued_at")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item calls into batched calls.
+
+    Attributes:
+        process: Called with a list of items; returns one result per item, in order
+        max_batch_size: Most items passed to process at once
+        max_wait_ms: How long the first item of a batch waits for others to join
+        name: Used for the worker thread name and log messages
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher"
+    ):
+        self.process = process
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.name = name
+
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.queue_time_ms = Histogram(QUEUE_TIME_BUCKETS_MS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    def submit(self, item: Any) -> Any:
+        """Processes one item in the next batch and returns its result (blocking)."""
+        return self.submit_many([item])[0]
+
+    def submit_many(self, items: Sequence[Any]) -> List[Any]:
+        """
+        Processes several items, batched with whatever other callers submit.
+
+        Returns:
+            One result per item, in order
+
+        Raises:
+            Whatever process raised for the batch an item was in
+        """
+        self._start()
+        requests = [_Request(item) for item in items]
+        for request in requests:
+            self._queue.put(request)
+        return [request.future.result() for request in requests]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: Settings, pending items and the queue-time and batch-size histograms
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "pending": self._queue.qsize(),
+            "queue_time_ms": self.queue_time_ms.snapshot(),
+            "batch_size": self.batch_size.snapshot()
+        }
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    # Items already waiting are always taken, even once the window has closed
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._process_batch(batch)
+
+    def _process_batch(self, batch: List[_Request]) -> None:
+        started = time.perf_counter()
+        for request in batch:
+            self.queue_time_ms.observe((started - request.enqueued_at) * 1000)
+        self.batch_size.observe(len(batch))
+
+        try:
+            results = self.process([request.item for request in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name} returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(batch)} failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
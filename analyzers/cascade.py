@@ -0,0 +1,160 @@
+"""
+Cascade inference: a cheap analyzer first, the expensive one only when needed.
+
+Several analyzers have a cheap implementation (keyword tone, NLTK grammar and
+passive voice) and an expensive one (the emotion transformer, spaCy). In
+cascade mode the cheap analyzer runs first and its result is served unless
+
+    - its confidence is below the analyzer's threshold,
+    - its bucket is one the cheap analyzer cannot name reliably, or
+    - it disagrees with the student's baseline profile,
+
+in which case the expensive analyzer runs and its result is served instead.
+Each result records the path that served it under ``details.cascade``, and
+the counts per path are kept for monitoring.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Serving paths
+PATH_FAST = "fast"
+PATH_ESCALATED = "escalated"
+
+# Escalation reasons
+REASON_LOW_CONFIDENCE = "low_confidence"
+REASON_BUCKET = "bucket_needs_model"
+REASON_PROFILE = "profile_disagreement"
+
+
+class CascadeAnalyzer:
+    """
+    Runs ``fast`` and, when its result cannot be trusted, ``slow``.
+
+    Called like any registry analyzer, with the artifacts it was registered with:
+    ``light_doc`` (for a fast analyzer that takes ``doc=``), ``lazy_doc`` (a
+    LazyDocument, for a slow analyzer that takes ``doc=``) and ``profile`` (the
+    student's baseline StyleProfile, or None).
+
+    Attributes:
+        name: Analyzer name, for stats
+        fast: Cheap analyzer
+        slow: Expensive analyzer
+        threshold: Minimum fast confidence served without escalating
+        accept_buckets: Fast buckets that may be served (None accepts every bucket)
+        disagrees: Returns True when a fast result contradicts the profile
+        fast_uses_doc: Pass ``light_doc`` to fast as ``doc=``
+        slow_uses_doc: Pass the parsed ``lazy_doc`` to slow as ``doc=``
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fast: Callable[..., Dict[str, Any]],
+        slow: Callable[..., Dict[str, Any]],
+        threshold: float,
+        accept_buckets: Optional[Iterable[str]] = None,
+        disagrees: Optional[Callable[[Dict[str, Any], Any], bool]] = None,
+        fast_uses_doc: bool = False,
+        slow_uses_doc: bool = False
+    ):
+        self.name = name
+        self.fast = fast
+        self.slow = slow
+        self.threshold = threshold
+        self.accept_buckets = set(accept_buckets) if accept_buckets is not None else None
+        self.disagrees = disagrees
+        self.fast_uses_doc = fast_uses_doc
+        self.slow_uses_doc = slow_uses_doc
+
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {PATH_FAST: 0, REASON_LOW_CONFIDENCE: 0, REASON_BUCKET: 0, REASON_PROFILE: 0}
+
+    def __call__(self, text: str, light_doc=None, lazy_doc=None, profile=None) -> Dict[str, Any]:
+        fast_result = self.fast(text, doc=light_doc) if self.fast_uses_doc else self.fast(text)
+        reason = self.escalation_reason(fast_result, profile)
+
+        if reason is None:
+            result, path = fast_result, PATH_FAST
+        elif self.slow_uses_doc:
+            result, path = self.slow(text, doc=lazy_doc.get() if lazy_doc is not None else None), PATH_ESCALATED
+        else:
+            result, path = self.slow(text), PATH_ESCALATED
+
+        with self._lock:
+            self.counts[reason or PATH_FAST] += 1
+
+        return {
+            **result,
+            "details": {
+                **result.get("details", {}),
+                "cascade": {
+                    "path": path,
+                    "reason": reason,
+                    "fast_confidence": fast_result.get("confidence"),
+                    "fast_bucket": fast_result.get("bucket"),
+                    "threshold": self.threshold
+                }
+            }
+        }
+
+    def escalation_reason(self, fast_result: Dict[str, Any], profile=None) -> Optional[str]:
+        """Returns why the fast result must be escalated, or None to serve it."""
+        confidence = fast_result.get("confidence")
+        if confidence is None or confidence < self.threshold:
+            return REASON_LOW_CONFIDENCE
+        if self.accept_buckets is not None and fast_result.get("bucket") not in self.accept_buckets:
+            return REASON_BUCKET
+        if profile is not None and self.disagrees is not None and self.disagrees(fast_result, profile):
+            return REASON_PROFILE
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: Requests served fast, escalations by reason and the fast-path rate
+        """
+        with self._lock:
+            counts = dict(self.counts)
+        total = sum(counts.values())
+        return {
+            "threshold": self.threshold,
+            "fast": counts[PATH_FAST],
+            "escalated": {reason: count for reason, count in counts.items() if reason != PATH_FAST},
+            "fast_rate": round(counts[PATH_FAST] / total, 4) if total else 0.0
+        }
+
+
+def cascade_stats(registry) -> Dict[str, Dict[str, Any]]:
+    """Stats of every cascaded analyzer in a registry."""
+    return {
+        name: spec.func.stats()
+        for name, spec in registry.analyzers.items()
+        if isinstance(spec.func, CascadeAnalyzer)
+    }
+
+
+# --- Profile checks ----------------------------------------------------------
+
+def tone_disagrees(result: Dict[str, Any], profile) -> bool:
+    """The fast tone differs from the student's most frequent tone."""
+    if not profile.tone_distribution:
+        return False
+    usual_tone = max(profile.tone_distribution, key=profile.tone_distribution.get)
+    return result.get("bucket") != usual_tone
+
+
+def passive_voice_disagrees(result: Dict[str, Any], profile, tolerance: float = 0.2) -> bool:
+    """The fast passive ratio is far from the student's average."""
+    if not profile.total_texts:
+        return False
+    return abs((result.get("score") or 0.0) - profile.average_passive_voice_ratio) > tolerance
+
+
+def grammar_disagrees(result: Dict[str, Any], profile) -> bool:
+    """The fast issue count is far from the student's average error count."""
+    if not profile.total_texts:
+        return False
+    average = profile.average_grammar_errors
+    issues = result.get("raw", {}).get("issue_count", 0)
+    return abs(issues - average) > max(2.0, average)
@@ -0,0 +1,105 @@
+"""
+Sentence-boundary windows for models with a fixed input length.
+
+Transformer classifiers such as the RoBERTa emotion model read at most 512
+tokens and their cost grows quadratically with input length. Long texts are
+split on sentence boundaries into windows that fit a token budget, every
+window is classified (in one padded batch), and the per-window label
+distributions are combined, weighted by each window's length.
+"""
+
+import math
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Sentence ends followed by whitespace, and paragraph breaks
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits text into sentences on terminal punctuation and blank lines."""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def token_windows(text: str, count_tokens: TokenCounter, max_tokens: int) -> List[Tuple[str, int]]:
+    """
+    Splits text into windows of whole sentences that fit a token budget.
+
+    A text that already fits is returned unchanged as a single window. A
+    sentence longer than the budget is split on word boundaries.
+
+    Args:
+        text: Text to split
+        count_tokens: Returns the token count of each string in a list
+        max_tokens: Token budget per window, excluding special tokens
+
+    Returns:
+        (window text, token count) pairs in document order
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return [(text, 0)]
+
+    counts = count_tokens(sentences)
+    if sum(counts) <= max_tokens:
+        return [(text, sum(counts))]
+
+    windows: List[Tuple[str, int]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    def flush() -> None:
+        nonlocal current, current_tokens
+        if current:
+            windows.append((" ".join(current), current_tokens))
+        current, current_tokens = [], 0
+
+    for sentence, tokens in zip(sentences, counts):
+        if tokens > max_tokens:
+            flush()
+            pieces = _split_words(sentence, math.ceil(tokens / max_tokens))
+            windows.extend(zip(pieces, count_tokens(pieces)))
+        elif current_tokens + tokens > max_tokens:
+            flush()
+            current, current_tokens = [sentence], tokens
+        else:
+            current.append(sentence)
+            current_tokens += tokens
+    flush()
+    return windows
+
+
+def aggregate_window_scores(window_scores: Sequence[List[Dict]], weights: Sequence[float]) -> List[Dict]:
+    """
+    Combines per-window label distributions into one, weighted by window length.
+
+    Args:
+        window_scores: For each window, a list of {"label", "score"} dicts
+        weights: Weight of each window (its token count)
+
+    Returns:
+        {"label", "score"} dicts for every label, highest score first
+    """
+    if not sum(weights):
+        weights = [1] * len(window_scores)
+    total_weight = sum(weights) or 1
+
+    combined: Dict[str, float] = {}
+    for scores, weight in zip(window_scores, weights):
+        for entry in scores:
+            combined[entry["label"]] = combined.get(entry["label"], 0.0) + entry["score"] * weight
+
+    return sorted(
+        ({"label": label, "score": score / total_weight} for label, score in combined.items()),
+        key=lambda entry: entry["score"],
+        reverse=True
+    )
+
+
+def _split_words(sentence: str, parts: int) -> List[str]:
+    """Splits an over-long sentence into ``parts`` runs of roughly equal word count."""
+    words = sentence.split()
+    size = max(1, math.ceil(len(words) / max(1, parts)))
+    return [" ".join(words[start:start + size]) for start in range(0, len(words), size)]
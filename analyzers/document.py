@@ -0,0 +1,82 @@
+"""
+Shared spaCy document layer for the full analyzer tier.
+
+A submission is parsed once per request and the resulting ``Doc`` is handed
+to every analyzer that needs tokens, sentences or dependency labels
+(complexity, passive voice, grammar and lexical richness). Only this module
+loads ``en_core_web_sm``, through the shared model registry (see
+``analyzers.models``), so a worker holds a single copy of the model and
+loads it on first use or during startup warmup rather than at import.
+"""
+
+import threading
+from typing import List
+
+from .models import models
+
+SPACY_MODEL_NAME = "en_core_web_sm"
+
+# Number of texts spaCy processes together when parsing a batch
+PARSE_BATCH_SIZE = 32
+
+
+def _load_nlp():
+    import spacy
+    return spacy.load(SPACY_MODEL_NAME)
+
+
+models.register("spacy", _load_nlp, warmup=lambda nlp: nlp("The model is warmed up before the first request."))
+
+
+def get_nlp():
+    """Returns the shared spaCy pipeline, loading it on first use."""
+    return models.get("spacy")
+
+
+def parse_document(text: str):
+    """
+    Parses the input text with the shared spaCy pipeline.
+
+    Args:
+        text: The text to parse
+
+    Returns:
+        spaCy Doc that can be passed to any full-tier analyzer via ``doc=``
+    """
+    return get_nlp()(text)
+
+
+def parse_documents(texts: List[str], batch_size: int = PARSE_BATCH_SIZE) -> List:
+    """
+    Parses several texts in one ``nlp.pipe`` pass.
+
+    Args:
+        texts: The texts to parse
+        batch_size: Number of texts spaCy processes together
+
+    Returns:
+        One spaCy Doc per text, in input order
+    """
+    return list(get_nlp().pipe(texts, batch_size=batch_size))
+
+
+class LazyDocument:
+    """
+    A spaCy parse that is only done if an analyzer asks for it.
+
+    Used in cascade mode, where the spaCy analyzers run only for submissions
+    the cheap analyzers cannot handle; every analyzer that escalates shares
+    the one parse.
+    """
+
+    def __init__(self, text: str, doc=None):
+        self.text = text
+        self._doc = doc  # An existing parse of text, e.g. from parse_documents
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns the parsed Doc, parsing on first call."""
+        with self._lock:
+            if self._doc is None:
+                self._doc = parse_document(self.text)
+            return self._doc
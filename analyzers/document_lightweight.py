@@ -0,0 +1,114 @@
+"""
+Shared NLTK document layer for the lightweight analyzer tier.
+
+Sentence splitting, word tokenization and POS tagging are done once per
+request and the resulting arrays are shared by the lightweight grammar,
+passive voice, complexity and lexical richness analyzers. Tokens and tags
+are cached per sentence (see ``analyzers.sentence_cache``), so a revised
+draft only tokenizes and tags the sentences that changed.
+
+POS tagging uses one persistent ``PerceptronTagger`` (loaded once through
+``analyzers.models``; ``nltk.pos_tag`` may build a new one per call) and
+tags every uncached sentence of a request in one ``tag_sents`` pass.
+"""
+
+from functools import cached_property
+from typing import List, Tuple
+
+import nltk
+
+# Download required NLTK data
+try:
+    nltk.data.find('tokenizers/punkt')
+except LookupError:
+    nltk.download('punkt', quiet=True)
+
+try:
+    nltk.data.find('taggers/averaged_perceptron_tagger')
+except LookupError:
+    nltk.download('averaged_perceptron_tagger', quiet=True)
+
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+from .models import models
+from .sentence_cache import sentence_cache
+
+
+def _load_tagger():
+    from nltk.tag.perceptron import PerceptronTagger
+    return PerceptronTagger()
+
+
+models.register("nltk_tagger", _load_tagger, warmup=lambda tagger: tagger.tag(["The", "tagger", "is", "warm", "."]))
+
+
+def tag_sentences(sentence_tokens: List[List[str]]) -> List[List[Tuple[str, str]]]:
+    """
+    POS-tags several tokenized sentences in one pass with the shared tagger.
+
+    Args:
+        sentence_tokens: Word tokens of each sentence
+
+    Returns:
+        ``(word, tag)`` pairs for each sentence, as ``nltk.pos_tag`` returns them
+    """
+    if not sentence_tokens:
+        return []
+    return models.get("nltk_tagger").tag_sents(sentence_tokens)
+
+
+def tag_tokens(tokens: List[str]) -> List[Tuple[str, str]]:
+    """POS-tags one tokenized sentence with the shared tagger."""
+    return tag_sentences([tokens])[0]
+
+
+class LightweightDocument:
+    """
+    Sentence, token and POS arrays for one text, computed once.
+
+    Attributes:
+        text: The original text
+        sentences: Sentence strings from ``sent_tokenize``
+        sentence_tokens: Word tokens for each sentence (original case)
+        sentence_tags: ``(word, tag)`` pairs for each sentence, tagged lazily
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sentences: List[str] = sent_tokenize(text)
+        self.sentence_tokens: List[List[str]] = [
+            sentence_cache.get_or_compute("tokens", sentence, lambda: word_tokenize(sentence))
+            for sentence in self.sentences
+        ]
+
+    @cached_property
+    def sentence_tags(self) -> List[List[Tuple[str, str]]]:
+        """
+        POS tags for each sentence. Only computed when an analyzer asks for
+        them; sentences missing from the cache are tagged in one pass.
+        """
+        return sentence_cache.get_or_compute_many(
+            "tags", self.sentences,
+            lambda missing: tag_sentences([self.sentence_tokens[index] for index in missing])
+        )
+
+    def tag(self) -> "LightweightDocument":
+        """
+        Tags every sentence now instead of on first access.
+
+        Call this before handing the document to concurrent analyzers so they
+        share one tagging pass instead of racing (or, in worker processes,
+        each repeating it).
+        """
+        self.sentence_tags
+        return self
+
+    @property
+    def tokens(self) -> List[str]:
+        """All word tokens in document order."""
+        return [token for tokens in self.sentence_tokens for token in tokens]
+
+    @property
+    def tags(self) -> List[Tuple[str, str]]:
+        """All ``(word, tag)`` pairs in document order."""
+        return [tagged for tags in self.sentence_tags for tagged in tags]
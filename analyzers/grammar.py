@@ -1,17 +1,17 @@
 # analyzers/grammar.py
 
-import spacy
-from analyzers.grammar_rules import run_all_rules
+from analyzers.grammar_rules import RULES, run_all_rules
 from . import create_standard_response
+from .document import parse_document
 
-nlp = spacy.load("en_core_web_sm")
-
-def analyze_grammar(text: str) -> dict:
+def analyze_grammar(text: str, doc=None) -> dict:
     """
     Analyzes grammar in the input text using spaCy and custom grammar rules.
     Returns a standardized response with score, bucket, raw, confidence, and details.
+    Pass a pre-parsed ``doc`` to reuse the request's shared spaCy parse.
     """
-    doc = nlp(text)
+    if doc is None:
+        doc = parse_document(text)
     errors = run_all_rules(doc)
     
     # Calculate grammar score (fewer errors = higher score)
@@ -49,8 +49,7 @@ def analyze_grammar(text: str) -> dict:
     details = {
         "error_types": list(set(error["type"] for error in errors)),
         "error_distribution": {
-            "subject_verb_agreement": len([e for e in errors if e["type"] == "Subject-Verb Agreement"]),
-            "sentence_fragments": len([e for e in errors if e["type"] == "Sentence Fragment"])
+            rule.name: len([e for e in errors if e["rule"] == rule.name]) for rule in RULES
         },
         "grammar_quality": "excellent" if num_errors == 0 else "good" if num_errors <= 2 else "fair" if num_errors <= 5 else "poor"
     }
@@ -18,22 +18,28 @@ try:
 except LookupError:
     nltk.download('averaged_perceptron_tagger', quiet=True)
 
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.tag import pos_tag
+from nltk.tokenize import word_tokenize
+from .document_lightweight import LightweightDocument, tag_tokens
+from .lexicon import NEGATION, CONJUNCTION, lexicon_scanner
+from .sentence_cache import sentence_cache
 
-def analyze_grammar(text: str) -> dict:
+def analyze_grammar(text: str, doc: LightweightDocument = None) -> dict:
     """
     Analyzes grammar patterns using NLTK instead of spaCy.
+    Pass a ``LightweightDocument`` to reuse the request's shared sentence split and POS tags.
+    Issues are cached per sentence, so only changed sentences of a revised draft are checked.
     Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    sentences = sent_tokenize(text)
+    if doc is None:
+        doc = LightweightDocument(text)
+    sentences = doc.sentences
     total_sentences = len(sentences)
     
     grammar_issues = []
     issue_count = 0
     
-    for sentence in sentences:
-        issues = detect_grammar_issues(sentence)
+    for sentence, tagged in zip(sentences, doc.sentence_tags):
+        issues = sentence_cache.get_or_compute("grammar", sentence, lambda: detect_grammar_issues(sentence, tagged))
         if issues:
             grammar_issues.extend(issues)
             issue_count += len(issues)
@@ -84,43 +90,44 @@ def analyze_grammar(text: str) -> dict:
         details=details
     )
 
-def detect_grammar_issues(sentence: str) -> list:
+def detect_grammar_issues(sentence: str, tagged: list = None) -> list:
     """
     Detects common grammar issues in a sentence.
+    ``tagged`` is the sentence's ``(word, tag)`` list; it is computed if not given.
     """
+    if tagged is None:
+        tagged = tag_tokens(word_tokenize(sentence))
     issues = []
     
     # Check for common issues
-    if detect_double_negatives(sentence):
+    if detect_double_negatives(sentence, tagged):
         issues.append({"type": "double_negative", "sentence": sentence.strip()})
     
-    if detect_subject_verb_disagreement(sentence):
+    if detect_subject_verb_disagreement(sentence, tagged):
         issues.append({"type": "subject_verb_disagreement", "sentence": sentence.strip()})
     
-    if detect_run_on_sentence(sentence):
+    if detect_run_on_sentence(sentence, tagged):
         issues.append({"type": "run_on_sentence", "sentence": sentence.strip()})
     
-    if detect_fragment(sentence):
+    if detect_fragment(sentence, tagged):
         issues.append({"type": "sentence_fragment", "sentence": sentence.strip()})
     
     return issues
 
-def detect_double_negatives(sentence: str) -> bool:
+def detect_double_negatives(sentence: str, tagged: list = None) -> bool:
     """
     Detects double negatives in a sentence.
     """
-    negative_words = ['not', 'no', 'never', 'none', 'nothing', 'nowhere', 'nobody', 'neither', 'nor']
-    words = word_tokenize(sentence.lower())
-    
-    negative_count = sum(1 for word in words if word in negative_words)
+    negative_count = lexicon_scanner.count_tokens(_words(sentence, tagged), (NEGATION,))[NEGATION]
     return negative_count > 1
 
-def detect_subject_verb_disagreement(sentence: str) -> bool:
+def detect_subject_verb_disagreement(sentence: str, tagged: list = None) -> bool:
     """
     Detects basic subject-verb disagreement.
     """
-    words = word_tokenize(sentence.lower())
-    pos_tags = pos_tag(words)
+    if tagged is None:
+        tagged = tag_tokens(word_tokenize(sentence))
+    pos_tags = [(word.lower(), pos) for word, pos in tagged]
     
     # Look for simple patterns like "they is" or "he are"
     for i, (word, pos) in enumerate(pos_tags):
@@ -135,25 +142,22 @@ def detect_subject_verb_disagreement(sentence: str) -> bool:
     
     return False
 
-def detect_run_on_sentence(sentence: str) -> bool:
+def detect_run_on_sentence(sentence: str, tagged: list = None) -> bool:
     """
     Detects potential run-on sentences.
     """
     # Count coordinating conjunctions
-    conjunctions = ['and', 'but', 'or', 'so', 'yet', 'for', 'nor']
-    words = word_tokenize(sentence.lower())
-    
-    conjunction_count = sum(1 for word in words if word in conjunctions)
+    conjunction_count = lexicon_scanner.count_tokens(_words(sentence, tagged), (CONJUNCTION,))[CONJUNCTION]
     
     # If there are more than 2 conjunctions in a sentence, it might be a run-on
     return conjunction_count > 2
 
-def detect_fragment(sentence: str) -> bool:
+def detect_fragment(sentence: str, tagged: list = None) -> bool:
     """
     Detects sentence fragments.
     """
-    words = word_tokenize(sentence)
-    pos_tags = pos_tag(words)
+    pos_tags = tagged if tagged is not None else tag_tokens(word_tokenize(sentence))
+    words = [word for word, pos in pos_tags]
     
     # Check if sentence has a verb
     has_verb = any(pos in ['VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ'] for word, pos in pos_tags)
@@ -163,6 +167,14 @@ def detect_fragment(sentence: str) -> bool:
     
     return is_too_short or not has_verb
 
+def _words(sentence: str, tagged: list = None) -> list:
+    """
+    Returns the words of a sentence, reusing its tagged tokens when available.
+    """
+    if tagged is None:
+        return word_tokenize(sentence)
+    return [word for word, pos in tagged]
+
 def categorize_issues(issues: list) -> dict:
     """
     Categorizes grammar issues by type.
@@ -1,82 +1,255 @@
 # analyzers/grammar_rules.py
+"""
+Declarative grammar rules, compiled into spaCy matchers.
+
+Each rule is declared as token patterns (``Matcher``) or dependency patterns
+(``DependencyMatcher``) instead of a hand-written loop over the document.
+All rules are compiled together into one ``Matcher`` and one
+``DependencyMatcher`` the first time a vocabulary is seen (at startup warmup
+for the shared spaCy model), so a document is checked in a single pass of
+each matcher however many rules there are.
+
+Two kinds of rule:
+    - ``MatchRule``: every match is an error (e.g. "They walks")
+    - ``SentenceRule``: a sentence is an error when a required pattern has no
+      match in it or a forbidden one does (e.g. no subject, or starting with
+      "Because")
+
+Errors carry the character offsets of the offending span.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from .document import get_nlp
+from .models import models
+
+SUBORDINATING_CONJUNCTIONS = [
+    "because", "although", "though", "unless", "until", "while",
+    "whereas", "whenever", "wherever", "whether", "if", "since",
+    "as", "before", "after", "when", "where", "why", "how"
+]
+
+
+@dataclass(frozen=True)
+class MatchRule:
+    """
+    A rule whose every match is an error.
+
+    Attributes:
+        name: Rule key, used in error counts
+        type: Error type shown to students
+        message: Error text; ``{node}`` fields are filled with the text of the
+            dependency pattern node of that RIGHT_ID
+        token_patterns: Matcher patterns
+        dependency_patterns: DependencyMatcher patterns
+    """
+    name: str
+    type: str
+    message: str
+    token_patterns: List[list] = field(default_factory=list)
+    dependency_patterns: List[list] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SentenceRule:
+    """
+    A rule that flags whole sentences.
+
+    A sentence is an error when any ``requires`` marker has no match in it or
+    any ``forbids`` marker does.
+
+    Attributes:
+        name: Rule key, used in error counts
+        type: Error type shown to students
+        message: Error text
+        requires: Marker name -> Matcher patterns a sentence must contain
+        forbids: Marker name -> Matcher patterns a sentence must not contain
+    """
+    name: str
+    type: str
+    message: str
+    requires: Dict[str, List[list]] = field(default_factory=dict)
+    forbids: Dict[str, List[list]] = field(default_factory=dict)
+
+
+RULES = [
+    MatchRule(
+        name="subject_verb_agreement",
+        type="Subject-Verb Agreement",
+        message="'{subject}' may not agree with '{verb}'",
+        dependency_patterns=[
+            # Singular pronoun with a non-3rd-person verb: "He go"
+            [
+                {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB", "TAG": "VBP"}},
+                {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject",
+                 "RIGHT_ATTRS": {"DEP": "nsubj", "TAG": "PRP", "LOWER": {"IN": ["he", "she", "it"]}}},
+            ],
+            # Plural noun with a 3rd-person singular verb: "The dogs runs"
+            [
+                {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB", "TAG": "VBZ"}},
+                {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject",
+                 "RIGHT_ATTRS": {"DEP": "nsubj", "TAG": "NNS"}},
+            ],
+            # "They walks"
+            [
+                {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB", "TAG": "VBZ"}},
+                {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject",
+                 "RIGHT_ATTRS": {"DEP": "nsubj", "LOWER": "they"}},
+            ],
+        ],
+    ),
+    SentenceRule(
+        name="sentence_fragments",
+        type="Sentence Fragment",
+        message="This may be a sentence fragment (missing subject or verb, or starts with a subordinating conjunction).",
+        requires={
+            "subject": [[{"DEP": {"IN": ["nsubj", "nsubjpass"]}}]],
+            "main_verb": [[{"DEP": "ROOT", "POS": {"IN": ["VERB", "AUX"]}}]],
+        },
+        forbids={
+            "subordinate_start": [[{"IS_SENT_START": True, "POS": "SCONJ", "LOWER": {"IN": SUBORDINATING_CONJUNCTIONS}}]],
+        },
+    ),
+]
+
+
+class GrammarRuleEngine:
+    """
+    Evaluates a set of rules with one Matcher and one DependencyMatcher pass.
+
+    Matchers are compiled once per vocabulary and reused for every document.
+    """
+
+    def __init__(self, rules: List[Any]):
+        self.rules = list(rules)
+        # Each dependency pattern gets its own key, so a match says which pattern's nodes its tokens are
+        self._dependency_patterns: Dict[str, Tuple[int, list]] = {
+            _key(index, f"dependency{number}"): (index, pattern)
+            for index, rule in enumerate(self.rules) if isinstance(rule, MatchRule)
+            for number, pattern in enumerate(rule.dependency_patterns)
+        }
+        self._compiled: List[Tuple[Any, Any, Any]] = []  # (vocab, matcher, dependency matcher)
+        self._lock = threading.Lock()
+
+    def compile(self, vocab) -> Tuple[Any, Any]:
+        """Returns the (Matcher, DependencyMatcher) for a vocabulary, building them on first use."""
+        with self._lock:
+            for compiled_vocab, matcher, dependency_matcher in self._compiled:
+                if compiled_vocab is vocab:
+                    return matcher, dependency_matcher
+
+            from spacy.matcher import Matcher, DependencyMatcher
+            matcher = Matcher(vocab)
+            dependency_matcher = DependencyMatcher(vocab)
+            for index, rule in enumerate(self.rules):
+                if isinstance(rule, MatchRule):
+                    if rule.token_patterns:
+                        matcher.add(_key(index), rule.token_patterns)
+                else:
+                    for marker, patterns in {**rule.requires, **rule.forbids}.items():
+                        matcher.add(_key(index, marker), patterns)
+            for key, (_, pattern) in self._dependency_patterns.items():
+                dependency_matcher.add(key, [pattern])
+
+            self._compiled.append((vocab, matcher, dependency_matcher))
+            return matcher, dependency_matcher
+
+    def run(self, doc, names: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Checks a parsed document against the rules.
+
+        Args:
+            doc: spaCy Doc with tags and a dependency parse
+            names: Only report these rules (default: all)
+
+        Returns:
+            Errors ordered by rule, then by position, each with type, error,
+            sentence, and start/end character offsets
+        """
+        matcher, dependency_matcher = self.compile(doc.vocab)
+        strings = doc.vocab.strings
+        found: Dict[int, Dict[Tuple[int, ...], Dict[str, Any]]] = {index: {} for index in range(len(self.rules))}
+        markers: Dict[Tuple[int, str], set] = {}  # (rule, marker) -> starts of sentences that match it
+
+        for match_id, start, end in matcher(doc):
+            index, marker = _parse_key(strings[match_id])
+            rule = self.rules[index]
+            if isinstance(rule, MatchRule):
+                span = doc[start:end]
+                found[index].setdefault((start, end), _error(rule, rule.message.format(match=span.text), span.sent, span.start_char, span.end_char))
+            else:
+                markers.setdefault((index, marker), set()).add(doc[start].sent.start)
+
+        if len(dependency_matcher):
+            for match_id, token_ids in dependency_matcher(doc):
+                index, pattern = self._dependency_patterns[strings[match_id]]
+                rule = self.rules[index]
+                nodes = {node["RIGHT_ID"]: doc[token_id] for node, token_id in zip(pattern, token_ids)}
+                tokens = sorted(nodes.values(), key=lambda token: token.i)
+                found[index].setdefault(tuple(sorted(token_ids)), _error(
+                    rule, rule.message.format(**{name: token.text for name, token in nodes.items()}),
+                    tokens[0].sent, tokens[0].idx, tokens[-1].idx + len(tokens[-1].text)
+                ))
+
+        sentence_rules = [(index, rule) for index, rule in enumerate(self.rules) if isinstance(rule, SentenceRule)]
+        if sentence_rules:
+            for sent in doc.sents:
+                for index, rule in sentence_rules:
+                    missing = any(sent.start not in markers.get((index, marker), ()) for marker in rule.requires)
+                    forbidden = any(sent.start in markers.get((index, marker), ()) for marker in rule.forbids)
+                    if missing or forbidden:
+                        found[index][(sent.start, sent.end)] = _error(rule, rule.message, sent, sent.start_char, sent.end_char)
+
+        errors = []
+        for index, rule in enumerate(self.rules):
+            if names is None or rule.name in names:
+                errors.extend(error for _, error in sorted(found[index].items(), key=lambda item: item[1]["start"]))
+        return errors
+
+
+def _key(index: int, marker: str = "") -> str:
+    return f"grammar_rule:{index}:{marker}"
+
+
+def _parse_key(key: str) -> Tuple[int, str]:
+    _, index, marker = key.split(":", 2)
+    return int(index), marker
+
+
+def _error(rule, message: str, sent, start: int, end: int) -> Dict[str, Any]:
+    return {
+        "type": rule.type,
+        "rule": rule.name,
+        "error": message,
+        "sentence": sent.text.strip(),
+        "start": start,
+        "end": end
+    }
+
+
+rule_engine = GrammarRuleEngine(RULES)
+
+# Compiled against the shared spaCy vocabulary during startup warmup
+models.register("grammar_rules", lambda: rule_engine.compile(get_nlp().vocab))
+
 
 def check_subject_verb_agreement(doc):
     """
     Detects mismatches between subject and verb number (e.g., "She run" or "They runs").
     """
-    errors = []
-    for token in doc:
-        if token.dep_ == "nsubj":
-            subject = token
-            verb = subject.head
-
-            # Make sure the head is a verb
-            if verb.pos_ != "VERB":
-                continue
-
-            # Check singular/plural
-            # PRP = personal pronoun (he, she, it = singular; they = plural)
-            # NNS = plural noun
-            subj_plural = subject.tag_ == "NNS" or subject.text.lower() == "they"
-            # VBP = verb, present tense, not 3rd person singular (plural)
-            # VBZ = verb, present tense, 3rd person singular
-            verb_plural = verb.tag_ == "VBP"
-            
-            # For singular subjects (he, she, it), we expect VBZ (3rd person singular)
-            # For plural subjects (they, plural nouns), we expect VBP (plural)
-            # Error cases:
-            # 1. Singular subject (he) + plural verb (VBP) -> should be VBZ
-            # 2. Plural subject (they) + singular verb (VBZ) -> should be VBP
-            is_singular_subject = subject.tag_ == "PRP" and subject.text.lower() in ["he", "she", "it"]
-            is_plural_subject = subj_plural
-            
-            if (is_singular_subject and verb.tag_ == "VBP") or (is_plural_subject and verb.tag_ == "VBZ"):
-                errors.append({
-                    "type": "Subject-Verb Agreement",
-                    "error": f"'{subject.text}' may not agree with '{verb.text}'",
-                    "sentence": subject.sent.text.strip()
-                })
-
-    return errors
+    return rule_engine.run(doc, ["subject_verb_agreement"])
 
 def check_sentence_fragments(doc):
     """
     Detects sentence fragments—clauses that lack a subject or a main verb,
     or start with subordinating conjunctions.
     """
-    errors = []
-    
-    # Common subordinating conjunctions
-    subordinating_conjunctions = {
-        "because", "although", "though", "unless", "until", "while", 
-        "whereas", "whenever", "wherever", "whether", "if", "since",
-        "as", "before", "after", "when", "where", "why", "how"
-    }
-    
-    for sent in doc.sents:
-        has_subject = any(tok.dep_ in ("nsubj", "nsubjpass") for tok in sent)
-        has_main_verb = any(tok.dep_ == "ROOT" and tok.pos_ in ("VERB", "AUX") for tok in sent)
-        
-        # Check if sentence starts with a subordinating conjunction
-        starts_with_subordinator = (
-            sent[0].text.lower() in subordinating_conjunctions and 
-            sent[0].pos_ == "SCONJ"
-        )
-
-        if not has_subject or not has_main_verb or starts_with_subordinator:
-            errors.append({
-                "type": "Sentence Fragment",
-                "error": "This may be a sentence fragment (missing subject or verb, or starts with a subordinating conjunction).",
-                "sentence": sent.text.strip()
-            })
-
-    return errors
+    return rule_engine.run(doc, ["sentence_fragments"])
 
 def run_all_rules(doc):
     """
-    Runs all grammar rules and returns a flat list of detected errors.
+    Runs all grammar rules in one matcher pass and returns a flat list of detected errors.
     """
-    errors = []
-    errors.extend(check_subject_verb_agreement(doc))
-    errors.extend(check_sentence_fragments(doc))
-    return errors
+    return rule_engine.run(doc)
@@ -1,25 +1,19 @@
-import re
+from typing import List
 from . import create_standard_response
+from .lexicon import HEDGING, HEDGING_PHRASES, LexiconHit, scan_lexicons
 
-HEDGING_PHRASES = {
-    "maybe", "perhaps", "sort of", "kind of", "possibly", "likely",
-    "arguably", "could be", "might be", "seems", "I think", "in my opinion",
-    "I feel", "suggests", "indicates", "appears to", "could", "should", "would"
-}
-
-def detect_hedging(text: str) -> dict:
+def detect_hedging(text: str, hits: List[LexiconHit] = None) -> dict:
     """
-    Detects hedging phrases in the input text.
+    Detects hedging phrases in the input text (case-insensitive, whole words).
+    Pass the request's ``scan_lexicons`` hits to reuse its single lexicon pass.
     Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
     """
-    text_lower = text.lower()
-    count = 0
-    found_phrases = []
+    if hits is None:
+        hits = scan_lexicons(text)
 
-    for phrase in HEDGING_PHRASES:
-        if re.search(r'\b' + re.escape(phrase) + r'\b', text_lower):
-            count += 1
-            found_phrases.append(phrase)
+    # Each distinct phrase counts once, in order of first appearance
+    found_phrases = list(dict.fromkeys(hit.phrase for hit in hits if hit.category == HEDGING))
+    count = len(found_phrases)
 
     # Calculate hedging density (hedging phrases per word)
     word_count = len(text.split())
@@ -1,15 +1,142 @@
+import math
 import re
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, Optional
+
 from . import create_standard_response
 
+# Moving-average TTR window, in tokens
+MATTR_WINDOW = 50
+
+# TTR at which an MTLD factor is complete (McCarthy & Jarvis)
+MTLD_THRESHOLD = 0.72
+
+# Random sample size HD-D takes its expected TTR over
+HDD_SAMPLE_SIZE = 42
+
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+class DiversityAccumulator:
+    """
+    Length-robust lexical diversity metrics, updated one token at a time.
+
+    Every ``add`` is O(1):
+        - MATTR: a sliding window of MATTR_WINDOW tokens with a per-type count,
+          so the window's type count changes by at most one per token
+        - MTLD: the type set and length of the current factor; a factor closes
+          when its TTR falls to MTLD_THRESHOLD (forward pass, so the stream is
+          read once)
+        - HD-D: the text's type frequencies, which the TTR needs anyway
+
+    Memory is the window, the current factor and one count per distinct word.
+    """
+
+    def __init__(self, window: int = MATTR_WINDOW, threshold: float = MTLD_THRESHOLD):
+        self.window = window
+        self.threshold = threshold
+        self.frequencies: Counter = Counter()
+        self.total = 0
+        # MATTR
+        self._window_tokens: deque = deque()
+        self._window_counts: Counter = Counter()
+        self._window_ttr_sum = 0.0
+        self._windows = 0
+        # MTLD
+        self._factor_types: set = set()
+        self._factor_length = 0
+        self._factors = 0
+
+    def add(self, token: str) -> None:
+        """Adds the next token of the stream."""
+        self.total += 1
+        self.frequencies[token] += 1
+
+        self._window_tokens.append(token)
+        self._window_counts[token] += 1
+        if len(self._window_tokens) > self.window:
+            dropped = self._window_tokens.popleft()
+            self._window_counts[dropped] -= 1
+            if not self._window_counts[dropped]:
+                del self._window_counts[dropped]
+        if len(self._window_tokens) == self.window:
+            self._window_ttr_sum += len(self._window_counts) / self.window
+            self._windows += 1
+
+        self._factor_types.add(token)
+        self._factor_length += 1
+        if len(self._factor_types) / self._factor_length <= self.threshold:
+            self._factors += 1
+            self._factor_types = set()
+            self._factor_length = 0
+
+    def update(self, tokens: Iterable[str]) -> "DiversityAccumulator":
+        """Adds every token of an iterable; returns self."""
+        for token in tokens:
+            self.add(token)
+        return self
+
+    @property
+    def ttr(self) -> float:
+        """Type-token ratio of the whole stream."""
+        return len(self.frequencies) / self.total if self.total else 0.0
+
+    @property
+    def mattr(self) -> float:
+        """Moving-average TTR (the plain TTR for texts shorter than the window)."""
+        return self._window_ttr_sum / self._windows if self._windows else self.ttr
+
+    @property
+    def mtld(self) -> Optional[float]:
+        """Mean length of a factor; None when no factor of repetition has formed."""
+        factors = self._factors
+        if self._factor_length:
+            # A partial factor counts for how far its TTR has fallen toward the threshold
+            partial_ttr = len(self._factor_types) / self._factor_length
+            factors += (1 - partial_ttr) / (1 - self.threshold)
+        return self.total / factors if factors else None
+
+    def hdd(self, sample_size: int = HDD_SAMPLE_SIZE) -> Optional[float]:
+        """
+        HD-D: expected TTR of a random sample of ``sample_size`` tokens
+        (hypergeometric). None for texts shorter than the sample.
+        """
+        if self.total < sample_size:
+            return None
+        # Types with the same frequency contribute equally, so each frequency is computed once
+        expected_types = 0.0
+        for frequency, types in Counter(self.frequencies.values()).items():
+            # P(the type is absent from the sample) = C(N - f, n) / C(N, n)
+            absent = math.exp(
+                math.lgamma(self.total - frequency + 1) - math.lgamma(self.total - frequency - sample_size + 1)
+                - math.lgamma(self.total + 1) + math.lgamma(self.total - sample_size + 1)
+            ) if self.total - frequency >= sample_size else 0.0
+            expected_types += types * (1 - absent)
+        return expected_types / sample_size
+
+    def metrics(self) -> Dict[str, Any]:
+        """MATTR, MTLD and HD-D, rounded like the diversity ratio."""
+        mtld, hdd = self.mtld, self.hdd()
+        return {
+            "mattr": round(self.mattr, 4),
+            "mtld": round(mtld, 2) if mtld is not None else None,
+            "hdd": round(hdd, 4) if hdd is not None else None,
+            "mattr_window": self.window
+        }
+
+
 def compute_lexical_diversity(text: str) -> dict:
     """
-    Computes lexical diversity as the ratio of unique words to total words.
+    Computes lexical diversity as the ratio of unique words to total words,
+    plus MATTR, MTLD and HD-D, which unlike the ratio do not fall as texts get
+    longer. All are computed in one streaming pass over the words.
     Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
     """
     # Remove punctuation and lowercase all words
-    words = re.findall(r'\b\w+\b', text.lower())
-    total_words = len(words)
-    unique_words = len(set(words))
+    diversity = DiversityAccumulator().update(match.group() for match in _WORD_PATTERN.finditer(text.lower()))
+    total_words = diversity.total
+    unique_words = len(diversity.frequencies)
+    length_robust = diversity.metrics()
 
     diversity_ratio = round(unique_words / total_words, 4) if total_words else 0.0
 
@@ -31,7 +158,8 @@ def compute_lexical_diversity(text: str) -> dict:
     raw_data = {
         "unique_words": unique_words,
         "total_words": total_words,
-        "diversity_ratio": diversity_ratio
+        "diversity_ratio": diversity_ratio,
+        **length_robust
     }
     
     # Create details with additional metrics
@@ -40,7 +168,8 @@ def compute_lexical_diversity(text: str) -> dict:
         "total_words": total_words,
         "unique_words": unique_words,
         "repetition_ratio": 1 - diversity_ratio,
-        "vocabulary_richness": "rich" if diversity_ratio > 0.7 else "moderate" if diversity_ratio > 0.5 else "limited"
+        "vocabulary_richness": "rich" if diversity_ratio > 0.7 else "moderate" if diversity_ratio > 0.5 else "limited",
+        **length_robust
     }
 
     return create_standard_response(
@@ -2,18 +2,16 @@
 This module provides functions to analyze lexical richness using word frequency scores.
 """
 
-import spacy
-from wordfreq import zipf_frequency
 from . import create_standard_response
+from .document import parse_document
+from .zipf_table import RARE_THRESHOLD, summarize_zipf_scores, zipf_frequencies
 
-# Load the English NLP model
-nlp = spacy.load("en_core_web_sm")
-
-def analyze_lexical_richness(text: str) -> dict:
+def analyze_lexical_richness(text: str, doc=None) -> dict:
     """
     Analyzes lexical richness using word frequency scores (Zipf scale).
+    Pass a pre-parsed ``doc`` to reuse the request's shared spaCy parse.
     
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     
     Metrics:
     - avg_zipf_score: Average word frequency; lower = more sophisticated vocabulary
@@ -21,7 +19,8 @@ def analyze_lexical_richness(text: str) -> dict:
     - num_advanced_words: How many rare words were used
     - total_tokens: Vocabulary sample size
     """
-    doc = nlp(text)
+    if doc is None:
+        doc = parse_document(text)
     
     # Extract alpha tokens (words) and convert to lowercase, excluding stop words
     tokens = [token.text.lower() for token in doc if token.is_alpha and not token.is_stop]
@@ -30,7 +29,7 @@ def analyze_lexical_richness(text: str) -> dict:
         return create_standard_response(
             score=0.0,
             bucket="insufficient_data",
-            raw_emotions=[],
+            raw={},
             confidence=0.0,
             details={
                 "avg_zipf_score": 0,
@@ -41,13 +40,14 @@ def analyze_lexical_richness(text: str) -> dict:
             }
         )
 
-    # Get Zipf frequency scores for all tokens
-    zipf_scores = [zipf_frequency(token, 'en') for token in tokens]
+    # Get Zipf frequency scores for all tokens in one table lookup
+    zipf_scores = zipf_frequencies(tokens)
     
-    # Calculate metrics
-    avg_zipf_score = sum(zipf_scores) / len(zipf_scores)
-    rare_threshold = 4.5  # Words with Zipf < 4.5 are considered rare/advanced
-    rare_count = sum(1 for score in zipf_scores if score < rare_threshold)
+    # Calculate metrics: bands, percentiles, mean, min and max in one vectorized pass
+    stats = summarize_zipf_scores(zipf_scores)
+    avg_zipf_score = stats["mean"]
+    rare_threshold = RARE_THRESHOLD  # Words with Zipf < 4.5 are considered rare/advanced
+    rare_count = stats["rare_count"]
     percent_rare_words = rare_count / len(zipf_scores)
     
     # Determine richness bucket based on average Zipf score and percentage of rare words
@@ -81,37 +81,21 @@ def analyze_lexical_richness(text: str) -> dict:
         "num_advanced_words": rare_count,
         "total_tokens": len(tokens),
         "rare_threshold": rare_threshold,
-        "vocabulary_sophistication": {
-            "very_rare_words": sum(1 for score in zipf_scores if score < 3.0),
-            "rare_words": sum(1 for score in zipf_scores if 3.0 <= score < 4.5),
-            "common_words": sum(1 for score in zipf_scores if 4.5 <= score < 6.0),
-            "very_common_words": sum(1 for score in zipf_scores if score >= 6.0)
-        },
+        "vocabulary_sophistication": stats["bands"],
         "zipf_distribution": {
-            "min_score": round(min(zipf_scores), 2),
-            "max_score": round(max(zipf_scores), 2),
-            "median_score": round(sorted(zipf_scores)[len(zipf_scores)//2], 2)
+            "min_score": round(stats["min"], 2),
+            "max_score": round(stats["max"], 2),
+            "median_score": round(stats["median"], 2),
+            "p10_score": round(stats["p10"], 2),
+            "p90_score": round(stats["p90"], 2)
         }
     }
 
     # Create raw output with all analyzer details
     raw = {
-        "avg_zipf_score": round(avg_zipf_score, 2),
-        "percent_rare_words": round(percent_rare_words, 3),
-        "num_advanced_words": rare_count,
-        "total_tokens": len(tokens),
-        "rare_threshold": rare_threshold,
-        "vocabulary_sophistication": {
-            "very_rare_words": sum(1 for score in zipf_scores if score < 3.0),
-            "rare_words": sum(1 for score in zipf_scores if 3.0 <= score < 4.5),
-            "common_words": sum(1 for score in zipf_scores if 4.5 <= score < 6.0),
-            "very_common_words": sum(1 for score in zipf_scores if score >= 6.0)
-        },
-        "zipf_distribution": {
-            "min_score": round(min(zipf_scores), 2),
-            "max_score": round(max(zipf_scores), 2),
-            "median_score": round(sorted(zipf_scores)[len(zipf_scores)//2], 2)
-        }
+        **details,
+        "vocabulary_sophistication": dict(details["vocabulary_sophistication"]),
+        "zipf_distribution": dict(details["zipf_distribution"])
     }
 
     return create_standard_response(
@@ -122,8 +106,8 @@ def analyze_lexical_richness(text: str) -> dict:
         details=details
     )
 
-def compute_lexical_richness(text: str) -> dict:
+def compute_lexical_richness(text: str, doc=None) -> dict:
     """
     Alias for analyze_lexical_richness to maintain consistency with other analyzers.
     """
-    return analyze_lexical_richness(text) 
\ No newline at end of file
+    return analyze_lexical_richness(text, doc=doc) 
\ No newline at end of file
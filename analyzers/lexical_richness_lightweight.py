@@ -1,10 +1,10 @@
 """
 Lightweight lexical richness analyzer without spaCy dependency.
-Uses NLTK and wordfreq for vocabulary analysis.
+Uses NLTK and the wordfreq Zipf table (analyzers.zipf_table) for vocabulary analysis.
 """
 
 import nltk
-from wordfreq import zipf_frequency
+import numpy as np
 from . import create_standard_response
 
 # Download required NLTK data
@@ -18,17 +18,19 @@ try:
 except LookupError:
     nltk.download('stopwords', quiet=True)
 
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
+from .document_lightweight import LightweightDocument
+from .zipf_table import RARE_THRESHOLD, summarize_zipf_scores, zipf_frequencies
 
 # Get English stopwords
 stop_words = set(stopwords.words('english'))
 
-def analyze_lexical_richness(text: str) -> dict:
+def analyze_lexical_richness(text: str, doc: LightweightDocument = None) -> dict:
     """
     Analyzes lexical richness using word frequency scores (Zipf scale) with NLTK.
+    Pass a ``LightweightDocument`` to reuse the request's shared tokenization.
     
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     
     Metrics:
     - avg_zipf_score: Average word frequency; lower = more sophisticated vocabulary
@@ -37,7 +39,9 @@ def analyze_lexical_richness(text: str) -> dict:
     - total_tokens: Vocabulary sample size
     """
     # Tokenize text and filter for alpha tokens, excluding stop words
-    tokens = word_tokenize(text.lower())
+    if doc is None:
+        doc = LightweightDocument(text)
+    tokens = [token.lower() for token in doc.tokens]
     tokens = [token for token in tokens if token.isalpha() and token not in stop_words]
 
     if not tokens:
@@ -55,17 +59,12 @@ def analyze_lexical_richness(text: str) -> dict:
             }
         )
 
-    # Get Zipf frequency scores for all tokens
-    zipf_scores = []
-    for token in tokens:
-        try:
-            score = zipf_frequency(token, 'en')
-            zipf_scores.append(score)
-        except:
-            # If wordfreq fails for a token, skip it
-            continue
+    # Get Zipf frequency scores for all tokens in one table lookup,
+    # skipping any token wordfreq fails to score
+    zipf_scores = zipf_frequencies(tokens)
+    zipf_scores = zipf_scores[~np.isnan(zipf_scores)]
     
-    if not zipf_scores:
+    if not len(zipf_scores):
         return create_standard_response(
             score=0.0,
             bucket="insufficient_data",
@@ -80,10 +79,11 @@ def analyze_lexical_richness(text: str) -> dict:
             }
         )
     
-    # Calculate metrics
-    avg_zipf_score = sum(zipf_scores) / len(zipf_scores)
-    rare_threshold = 4.5  # Words with Zipf < 4.5 are considered rare/advanced
-    rare_count = sum(1 for score in zipf_scores if score < rare_threshold)
+    # Calculate metrics: bands, percentiles, mean, min and max in one vectorized pass
+    stats = summarize_zipf_scores(zipf_scores)
+    avg_zipf_score = stats["mean"]
+    rare_threshold = RARE_THRESHOLD  # Words with Zipf < 4.5 are considered rare/advanced
+    rare_count = stats["rare_count"]
     percent_rare_words = rare_count / len(zipf_scores)
     
     # Determine richness bucket based on average Zipf score and percentage of rare words
@@ -119,37 +119,21 @@ def analyze_lexical_richness(text: str) -> dict:
         "num_advanced_words": rare_count,
         "total_tokens": len(tokens),
         "rare_threshold": rare_threshold,
-        "vocabulary_sophistication": {
-            "very_rare_words": sum(1 for score in zipf_scores if score < 3.0),
-            "rare_words": sum(1 for score in zipf_scores if 3.0 <= score < 4.5),
-            "common_words": sum(1 for score in zipf_scores if 4.5 <= score < 6.0),
-            "very_common_words": sum(1 for score in zipf_scores if score >= 6.0)
-        },
+        "vocabulary_sophistication": stats["bands"],
         "zipf_distribution": {
-            "min_score": round(min(zipf_scores), 2),
-            "max_score": round(max(zipf_scores), 2),
-            "median_score": round(sorted(zipf_scores)[len(zipf_scores)//2], 2)
+            "min_score": round(stats["min"], 2),
+            "max_score": round(stats["max"], 2),
+            "median_score": round(stats["median"], 2),
+            "p10_score": round(stats["p10"], 2),
+            "p90_score": round(stats["p90"], 2)
         }
     }
 
     # Create raw output with all analyzer details
     raw = {
-        "avg_zipf_score": round(avg_zipf_score, 2),
-        "percent_rare_words": round(percent_rare_words, 3),
-        "num_advanced_words": rare_count,
-        "total_tokens": len(tokens),
-        "rare_threshold": rare_threshold,
-        "vocabulary_sophistication": {
-            "very_rare_words": sum(1 for score in zipf_scores if score < 3.0),
-            "rare_words": sum(1 for score in zipf_scores if 3.0 <= score < 4.5),
-            "common_words": sum(1 for score in zipf_scores if 4.5 <= score < 6.0),
-            "very_common_words": sum(1 for score in zipf_scores if score >= 6.0)
-        },
-        "zipf_distribution": {
-            "min_score": round(min(zipf_scores), 2),
-            "max_score": round(max(zipf_scores), 2),
-            "median_score": round(sorted(zipf_scores)[len(zipf_scores)//2], 2)
-        }
+        **details,
+        "vocabulary_sophistication": dict(details["vocabulary_sophistication"]),
+        "zipf_distribution": dict(details["zipf_distribution"])
     }
 
     return create_standard_response(
@@ -160,8 +144,8 @@ def analyze_lexical_richness(text: str) -> dict:
         details=details
     )
 
-def compute_lexical_richness(text: str) -> dict:
+def compute_lexical_richness(text: str, doc: LightweightDocument = None) -> dict:
     """
     Alias for analyze_lexical_richness to maintain consistency with other analyzers.
     """
-    return analyze_lexical_richness(text)
+    return analyze_lexical_richness(text, doc=doc)
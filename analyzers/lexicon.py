@@ -0,0 +1,144 @@
+"""
+Single-pass lexicon scanner shared by the keyword-based analyzers.
+
+Hedging, lightweight tone and lightweight grammar all look words and
+phrases up in fixed lexicons. Instead of one regex or ``str.count`` per
+entry, every lexicon is compiled into one word-level trie: the text is
+tokenized once with a single regex and the trie is walked from each token,
+so a scan is linear in the text no matter how many entries there are.
+Matching is case-insensitive and on whole words ("like" does not match
+inside "likely"), and overlapping entries are all reported ("could be"
+yields both "could be" and "could").
+
+In the lightweight and alt tiers the hits of a request are built once as
+the "lexicon" artifact and passed to hedging and tone; grammar matches the
+tokens it already has for each sentence.
+
+Usage:
+    hits = scan_lexicons(text)
+    tone_hits = [hit for hit in hits if hit.category.startswith("tone.")]
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+HEDGING_PHRASES = {
+    "maybe", "perhaps", "sort of", "kind of", "possibly", "likely",
+    "arguably", "could be", "might be", "seems", "I think", "in my opinion",
+    "I feel", "suggests", "indicates", "appears to", "could", "should", "would"
+}
+
+TONE_KEYWORDS = {
+    "positive": ["good", "great", "excellent", "amazing", "wonderful", "fantastic", "love", "like", "enjoy", "happy", "excited", "proud", "confident", "optimistic"],
+    "negative": ["bad", "terrible", "awful", "hate", "dislike", "angry", "frustrated", "disappointed", "worried", "sad", "confused", "difficult", "hard", "struggle"],
+    "neutral": ["think", "believe", "consider", "analyze", "discuss", "examine", "explore", "investigate", "study", "research", "observe", "note", "find"],
+    "formal": ["therefore", "however", "furthermore", "moreover", "consequently", "nevertheless", "accordingly", "subsequently", "hence", "thus", "indeed"],
+    "informal": ["yeah", "ok", "cool", "awesome", "totally", "definitely", "sure", "maybe", "kinda", "sorta", "gonna", "wanna", "gotta"]
+}
+
+NEGATIVE_WORDS = ['not', 'no', 'never', 'none', 'nothing', 'nowhere', 'nobody', 'neither', 'nor']
+CONJUNCTIONS = ['and', 'but', 'or', 'so', 'yet', 'for', 'nor']
+
+# Categories
+HEDGING = "hedging"
+NEGATION = "negation"
+CONJUNCTION = "conjunction"
+TONE_PREFIX = "tone."
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Trie key marking the end of an entry; never equal to a (word) token
+_END = ""
+
+
+class LexiconHit(NamedTuple):
+    """One lexicon entry found in a text."""
+    category: str
+    phrase: str  # The entry as written in its lexicon
+    start: int  # Character offsets of the match in the scanned text
+    end: int
+
+
+class LexiconScanner:
+    """
+    Matches every entry of several lexicons in one pass over a text.
+
+    Attributes:
+        lexicons: Category -> entries (words or space-separated phrases)
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self.lexicons = {category: tuple(entries) for category, entries in lexicons.items()}
+        self._trie: dict = {}
+        for category, entries in self.lexicons.items():
+            for phrase in entries:
+                node = self._trie
+                for word in phrase.lower().split():
+                    node = node.setdefault(word, {})
+                node.setdefault(_END, []).append((category, phrase))
+
+    def scan(self, text: str) -> List[LexiconHit]:
+        """
+        Returns every lexicon hit in the text, in order of position.
+        The words of a phrase may only be separated by whitespace.
+        """
+        # Tokens are lowercased one by one: lowercasing the whole text can change
+        # its length (e.g. "İ"), and the offsets must index the original text
+        matches = list(_WORD_PATTERN.finditer(text))
+        hits = []
+        for first, last, entries in self._walk([match.group().lower() for match in matches]):
+            if any(not text[matches[i].end():matches[i + 1].start()].isspace() for i in range(first, last)):
+                continue
+            for category, phrase in entries:
+                hits.append(LexiconHit(category, phrase, matches[first].start(), matches[last].end()))
+        return hits
+
+    def count_tokens(self, tokens: Sequence[str], categories: Optional[Iterable[str]] = None) -> Counter:
+        """
+        Counts hits per category in already tokenized text (e.g. a sentence's
+        tagged tokens), without tokenizing it again.
+        """
+        wanted = set(categories) if categories is not None else None
+        counts = Counter()
+        for _, _, entries in self._walk([token.lower() for token in tokens]):
+            for category, _ in entries:
+                if wanted is None or category in wanted:
+                    counts[category] += 1
+        return counts
+
+    def _walk(self, words: List[str]) -> Iterable[Tuple[int, int, list]]:
+        """Yields (first word, last word, entries) for every entry that ends at a word."""
+        trie = self._trie
+        for first in range(len(words)):
+            node = trie.get(words[first])
+            last = first
+            while node is not None:
+                if _END in node:
+                    yield first, last, node[_END]
+                last += 1
+                if last == len(words):
+                    break
+                node = node.get(words[last])
+
+
+# Every lexicon the analyzers use, compiled once
+lexicon_scanner = LexiconScanner({
+    HEDGING: HEDGING_PHRASES,
+    NEGATION: NEGATIVE_WORDS,
+    CONJUNCTION: CONJUNCTIONS,
+    **{TONE_PREFIX + tone: keywords for tone, keywords in TONE_KEYWORDS.items()},
+})
+
+
+def scan_lexicons(text: str) -> List[LexiconHit]:
+    """
+    Scans the text for every shared lexicon in one pass.
+
+    Args:
+        text: The text to scan
+
+    Returns:
+        Hits with category, lexicon entry and character offsets, in text order
+    """
+    return lexicon_scanner.scan(text)
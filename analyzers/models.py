@@ -0,0 +1,170 @@
+"""
+Shared registry of the heavyweight models behind the analyzers.
+
+Modules that need a model (the spaCy pipeline, the emotion classifier)
+register a loader here at import time instead of loading the model there,
+so importing the app is fast and uvicorn binds its port immediately. Each
+model is then loaded exactly once, by whichever comes first:
+
+    - the first analyzer call that needs it (``models.get(name)``), or
+    - the background warmup started when the app starts
+      (``models.start_warmup()``), which also runs one throwaway inference
+      so the first real request does not pay for lazy initialization
+
+Concurrent callers of ``get`` wait for the single load in progress rather
+than loading a second copy. ``models.status()`` reports each model's state
+and timings for ``/health``; ``models.ready`` is True once warmup finished
+without a failed load.
+
+Usage:
+    models.register("spacy", lambda: spacy.load("en_core_web_sm"), warmup=lambda nlp: nlp("Warm up."))
+    nlp = models.get("spacy")
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Set MODEL_WARMUP=0 to skip startup warmup and load every model on first use
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") != "0"
+
+# Model states
+MODEL_NOT_LOADED = "not_loaded"
+MODEL_LOADING = "loading"
+MODEL_READY = "ready"
+MODEL_FAILED = "failed"
+
+
+@dataclass
+class _ModelEntry:
+    """One registered model and its load state."""
+    name: str
+    loader: Callable[[], Any]
+    warmup: Optional[Callable[[Any], Any]] = None
+    state: str = MODEL_NOT_LOADED
+    model: Any = None
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """
+    Loads each registered model once, on first use or during warmup.
+
+    A model whose loader raised is reported as failed; the next ``get``
+    retries the load and raises if it fails again, so an analyzer that needs
+    it fails like any other analyzer error.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_done = threading.Event()
+
+    def register(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        Registers a model loader (idempotent: a name already registered keeps its entry).
+
+        Args:
+            name: Model name, as reported by status()
+            loader: Returns the loaded model; only called once
+            warmup: Optional inference to run on the loaded model during warmup
+        """
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _ModelEntry(name, loader, warmup)
+
+    def get(self, name: str) -> Any:
+        """Returns the named model, loading it first if needed."""
+        entry = self._entries[name]
+        if entry.state == MODEL_READY:
+            return entry.model
+
+        with entry.lock:
+            if entry.state != MODEL_READY:
+                entry.state = MODEL_LOADING
+                start = time.perf_counter()
+                try:
+                    entry.model = entry.loader()
+                except Exception as e:
+                    entry.state = MODEL_FAILED
+                    entry.error = str(e)
+                    raise
+                entry.load_seconds = round(time.perf_counter() - start, 3)
+                entry.error = None
+                entry.state = MODEL_READY
+                logger.info("Loaded model %s in %.2fs", name, entry.load_seconds)
+        return entry.model
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Loads the named models (default: all registered) and runs their warmup inference.
+
+        Failures are logged and reported by status(); they do not stop the
+        other models from warming up.
+        """
+        for name in list(names if names is not None else self._entries):
+            entry = self._entries[name]
+            try:
+                model = self.get(name)
+                if entry.warmup is not None and entry.warmup_seconds is None:
+                    start = time.perf_counter()
+                    entry.warmup(model)
+                    entry.warmup_seconds = round(time.perf_counter() - start, 3)
+            except Exception as e:
+                entry.error = str(e)
+                logger.exception("Warming up model %s failed", name)
+        self._warmup_done.set()
+
+    def start_warmup(self) -> Optional[threading.Thread]:
+        """
+        Starts warmup of every registered model on a daemon thread (once) and
+        returns the thread. With MODEL_WARMUP=0 nothing is loaded and the
+        registry reports ready at once; models then load on first use.
+        """
+        with self._lock:
+            if not MODEL_WARMUP:
+                self._warmup_done.set()
+            elif self._warmup_thread is None:
+                self._warmup_thread = threading.Thread(target=self.warmup, name="model-warmup", daemon=True)
+                self._warmup_thread.start()
+            return self._warmup_thread
+
+    @property
+    def ready(self) -> bool:
+        """True once warmup has finished with no model failing to load."""
+        return self._warmup_done.is_set() and not any(
+            entry.state == MODEL_FAILED for entry in self._entries.values()
+        )
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: Overall readiness and, per model, its state, load and warmup
+            time in seconds and last error
+        """
+        return {
+            "ready": self.ready,
+            "warmup_finished": self._warmup_done.is_set(),
+            "models": {
+                name: {
+                    "state": entry.state,
+                    "load_seconds": entry.load_seconds,
+                    "warmup_seconds": entry.warmup_seconds,
+                    "error": entry.error
+                }
+                for name, entry in self._entries.items()
+            }
+        }
+
+
+# Shared by every analyzer tier in this process
+models = ModelRegistry()
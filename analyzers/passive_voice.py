@@ -1,17 +1,17 @@
 # analyzers/passive_voice.py
 
-import spacy
 from . import create_standard_response
+from .document import parse_document
 
-nlp = spacy.load("en_core_web_sm")
-
-def detect_passive_sentences(text: str) -> dict:
+def detect_passive_sentences(text: str, doc=None) -> dict:
     """
     Detects passive voice sentences in the input text.
     Uses spaCy to parse the text and checks each sentence for passive constructions.
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Pass a pre-parsed ``doc`` to reuse the request's shared spaCy parse.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    doc = nlp(text)  # Process the text with spaCy
+    if doc is None:
+        doc = parse_document(text)  # Process the text with spaCy
     passive_count = 0  # Counter for passive sentences
     total_sentences = 0  # Counter for total sentences
 
@@ -43,11 +43,12 @@ def detect_passive_sentences(text: str) -> dict:
     # Calculate confidence based on number of sentences
     confidence = min(1.0, total_sentences / 10)  # Higher confidence with more sentences
     
-    # Create raw emotions breakdown
-    raw_emotions = [
-        {"label": "passive_sentences", "score": passive_count / max(total_sentences, 1)},
-        {"label": "total_sentences", "score": min(total_sentences / 20, 1.0)}  # Normalize to 0-1 range
-    ]
+    # Create raw output
+    raw = {
+        "passive_count": passive_count,
+        "total_sentences": total_sentences,
+        "passive_ratio": passive_ratio
+    }
     
     # Create details with additional metrics
     details = {
@@ -61,7 +62,7 @@ def detect_passive_sentences(text: str) -> dict:
     return create_standard_response(
         score=score,
         bucket=bucket,
-        raw_emotions=raw_emotions,
+        raw=raw,
         confidence=confidence,
         details=details
     )
@@ -4,6 +4,7 @@
 import re
 import nltk
 from . import create_standard_response
+from .document_lightweight import LightweightDocument
 
 # Download required NLTK data
 try:
@@ -16,13 +17,14 @@ try:
 except LookupError:
     nltk.download('averaged_perceptron_tagger')
 
-def detect_passive_sentences(text: str) -> dict:
+def detect_passive_sentences(text: str, doc: LightweightDocument = None) -> dict:
     """
     Detects passive voice sentences in the input text using NLTK and regex.
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Pass a ``LightweightDocument`` to reuse the request's shared sentence split.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     """
     # Tokenize into sentences
-    sentences = nltk.sent_tokenize(text)
+    sentences = doc.sentences if doc is not None else nltk.sent_tokenize(text)
     passive_count = 0
     total_sentences = len(sentences)
     
@@ -72,11 +74,12 @@ def detect_passive_sentences(text: str) -> dict:
     # Calculate confidence based on number of sentences
     confidence = min(1.0, total_sentences / 10)  # Higher confidence with more sentences
     
-    # Create raw emotions breakdown
-    raw_emotions = [
-        {"label": "passive_sentences", "score": passive_count / max(total_sentences, 1)},
-        {"label": "total_sentences", "score": min(total_sentences / 20, 1.0)}  # Normalize to 0-1 range
-    ]
+    # Create raw output
+    raw = {
+        "passive_count": passive_count,
+        "total_sentences": total_sentences,
+        "passive_ratio": passive_ratio
+    }
     
     # Create details with additional metrics
     details = {
@@ -90,7 +93,7 @@ def detect_passive_sentences(text: str) -> dict:
     return create_standard_response(
         score=score,
         bucket=bucket,
-        raw_emotions=raw_emotions,
+        raw=raw,
         confidence=confidence,
         details=details
     )
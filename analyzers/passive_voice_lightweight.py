@@ -18,20 +18,25 @@ try:
 except LookupError:
     nltk.download('averaged_perceptron_tagger', quiet=True)
 
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.tag import pos_tag
+from nltk.tokenize import word_tokenize
+from .document_lightweight import LightweightDocument, tag_tokens
+from .sentence_cache import sentence_cache
 
-def detect_passive_sentences(text: str) -> dict:
+def detect_passive_sentences(text: str, doc: LightweightDocument = None) -> dict:
     """
     Detects passive voice sentences using NLTK instead of spaCy.
+    Pass a ``LightweightDocument`` to reuse the request's shared sentence split and POS tags.
+    Passive flags are cached per sentence, so only changed sentences of a revised draft are checked.
     Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    sentences = sent_tokenize(text)
+    if doc is None:
+        doc = LightweightDocument(text)
+    sentences = doc.sentences
     passive_sentences = []
     passive_count = 0
     
-    for sentence in sentences:
-        if is_passive_sentence(sentence):
+    for sentence, tagged in zip(sentences, doc.sentence_tags):
+        if sentence_cache.get_or_compute("passive", sentence, lambda: is_passive_sentence(sentence, tagged)):
             passive_sentences.append(sentence.strip())
             passive_count += 1
     
@@ -85,13 +90,15 @@ def detect_passive_sentences(text: str) -> dict:
         details=details
     )
 
-def is_passive_sentence(sentence: str) -> bool:
+def is_passive_sentence(sentence: str, tagged: list = None) -> bool:
     """
     Determines if a sentence is in passive voice using NLTK.
+    ``tagged`` is the sentence's ``(word, tag)`` list; it is computed if not given.
     """
     # Tokenize and tag the sentence
-    words = word_tokenize(sentence.lower())
-    pos_tags = pos_tag(words)
+    if tagged is None:
+        tagged = tag_tokens(word_tokenize(sentence))
+    pos_tags = [(word.lower(), pos) for word, pos in tagged]
     
     # Look for passive voice patterns
     # Pattern 1: "be" + past participle
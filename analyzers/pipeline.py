@@ -0,0 +1,175 @@
+"""
+Analyzer registry with a dependency DAG of shared artifacts.
+
+Each analyzer is declared once with its name, version, cost class and the
+shared artifacts it needs (a parsed document, sentence splits, readability
+statistics). Artifacts may themselves depend on other artifacts. Given a
+selection of analyzers, the registry works out which artifacts are needed,
+builds only those, and produces the calls for the analyzer executor, so a
+request for just sentiment and tone never parses the text.
+
+Each tier declares its own registry (``analyzers.registry``,
+``analyzers.registry_lightweight``, ``analyzers.registry_alt``); the routes
+only talk to the registry.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Cost classes, used to start the slowest analyzers first
+COST_CHEAP = "cheap"
+COST_MODERATE = "moderate"
+COST_EXPENSIVE = "expensive"
+
+COST_ORDER = {COST_EXPENSIVE: 0, COST_MODERATE: 1, COST_CHEAP: 2}
+
+
+@dataclass(frozen=True)
+class ArtifactSpec:
+    """
+    A shared input computed once per text.
+
+    Attributes:
+        name: Artifact name analyzers refer to in ``requires``
+        build: Called as ``build(text, **upstream)`` with each required artifact by name
+        requires: Names of artifacts this one is built from
+        argument: Keyword analyzers receive the artifact as (defaults to name)
+    """
+    name: str
+    build: Callable[..., Any]
+    requires: Tuple[str, ...] = ()
+    argument: Optional[str] = None
+
+    @property
+    def keyword(self) -> str:
+        return self.argument or self.name
+
+
+@dataclass(frozen=True)
+class AnalyzerSpec:
+    """
+    One analyzer and what it needs.
+
+    Attributes:
+        name: Result key, e.g. "tone"
+        func: Called as ``func(text, **artifacts)``; returns a standardized response
+        version: Output version, used for caching and stored with results
+        cost: One of COST_CHEAP, COST_MODERATE, COST_EXPENSIVE
+        requires: Names of the artifacts passed to func
+        process_bound: Pure-Python work that should run on the process pool
+        cacheable: Whether the result depends only on the text and version, so
+            it may be shared through the result cache (not so for results that
+            depend on the student's profile)
+    """
+    name: str
+    func: Callable[..., Dict[str, Any]]
+    version: str
+    cost: str = COST_MODERATE
+    requires: Tuple[str, ...] = ()
+    process_bound: bool = False
+    cacheable: bool = True
+
+
+class AnalyzerRegistry:
+    """
+    The analyzers and artifacts of one tier.
+    """
+
+    def __init__(self, artifacts: Iterable[ArtifactSpec] = (), analyzers: Iterable[AnalyzerSpec] = ()):
+        self.artifacts: Dict[str, ArtifactSpec] = {}
+        self.analyzers: Dict[str, AnalyzerSpec] = {}
+        for artifact in artifacts:
+            self.register_artifact(artifact)
+        for analyzer in analyzers:
+            self.register(analyzer)
+
+    def register_artifact(self, spec: ArtifactSpec) -> ArtifactSpec:
+        """Adds an artifact; its upstream artifacts must already be registered."""
+        unknown = [name for name in spec.requires if name not in self.artifacts]
+        if unknown:
+            raise ValueError(f"Artifact '{spec.name}' requires unknown artifacts: {', '.join(unknown)}")
+        self.artifacts[spec.name] = spec
+        return spec
+
+    def register(self, spec: AnalyzerSpec) -> AnalyzerSpec:
+        """Adds an analyzer; the artifacts it requires must already be registered."""
+        unknown = [name for name in spec.requires if name not in self.artifacts]
+        if unknown:
+            raise ValueError(f"Analyzer '{spec.name}' requires unknown artifacts: {', '.join(unknown)}")
+        if spec.cost not in COST_ORDER:
+            raise ValueError(f"Analyzer '{spec.name}' has unknown cost class '{spec.cost}'")
+        self.analyzers[spec.name] = spec
+        return spec
+
+    @property
+    def names(self) -> List[str]:
+        """Every analyzer name, in registration order."""
+        return list(self.analyzers)
+
+    @property
+    def versions(self) -> Dict[str, str]:
+        """Analyzer name to version, for caching and storage."""
+        return {name: spec.version for name, spec in self.analyzers.items()}
+
+    def cache_versions(self, names: Iterable[str]) -> Dict[str, str]:
+        """Analyzer name to version for the given analyzers whose results may be cached."""
+        return {name: self.analyzers[name].version for name in names if self.analyzers[name].cacheable}
+
+    def select(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Validates an analyzer selection.
+
+        Args:
+            names: Analyzer names, or None for every analyzer
+
+        Returns:
+            The selected names in registration order, without duplicates
+
+        Raises:
+            ValueError: If a name is not registered
+        """
+        if names is None:
+            return self.names
+        names = set(names)
+        unknown = sorted(names - set(self.analyzers))
+        if unknown:
+            raise ValueError(f"Unknown analyzers: {', '.join(unknown)}. Available: {', '.join(self.names)}")
+        return [name for name in self.analyzers if name in names]
+
+    def artifact_plan(self, names: Iterable[str]) -> List[str]:
+        """
+        Returns the artifacts the given analyzers need, upstream artifacts first.
+        """
+        plan: List[str] = []
+
+        def visit(artifact: str) -> None:
+            if artifact in plan:
+                return
+            for upstream in self.artifacts[artifact].requires:
+                visit(upstream)
+            plan.append(artifact)
+
+        for name in names:
+            for artifact in self.analyzers[name].requires:
+                visit(artifact)
+        return plan
+
+    def build_artifact(self, name: str, text: str, artifacts: Dict[str, Any]) -> Any:
+        """Builds one artifact from already built upstream artifacts."""
+        spec = self.artifacts[name]
+        return spec.build(text, **{upstream: artifacts[upstream] for upstream in spec.requires})
+
+    def by_cost(self, names: Iterable[str]) -> List[str]:
+        """Orders analyzer names most expensive first."""
+        return sorted(names, key=lambda name: COST_ORDER[self.analyzers[name].cost])
+
+    def call(self, text: str, name: str, artifacts: Dict[str, Any]) -> Tuple[Callable, tuple, dict]:
+        """
+        Builds the executor call for one analyzer.
+
+        Returns:
+            (func, args, kwargs) with each required artifact passed by keyword
+        """
+        spec = self.analyzers[name]
+        kwargs = {self.artifacts[artifact].keyword: artifacts[artifact] for artifact in spec.requires}
+        return spec.func, (text,), kwargs
@@ -1,15 +1,16 @@
 # analyzers/readability.py
 
-import textstat
 from . import create_standard_response
+from .text_stats import TextStatistics
 
-def analyze_readability(text):
+def analyze_readability(text, stats=None):
     """
     Analyzes text readability using multiple academic scoring methods.
     Returns a standardized response with score, bucket, raw, confidence, and details.
     
     Args:
         text (str): The text to analyze
+        stats (TextStatistics, optional): Shared per-request statistics for ``text``
         
     Returns:
         dict: Standardized response dictionary
@@ -25,14 +26,9 @@ def analyze_readability(text):
     
     try:
         # Get raw readability scores
-        raw_scores = {
-            "flesch_kincaid_grade": round(textstat.flesch_kincaid_grade(text), 2),
-            "smog_index": round(textstat.smog_index(text), 2),
-            "gunning_fog": round(textstat.gunning_fog(text), 2),
-            "dale_chall_score": round(textstat.dale_chall_readability_score(text), 2),
-            "word_count": textstat.lexicon_count(text, removepunct=True),
-            "sentence_count": textstat.sentence_count(text)
-        }
+        if stats is None:
+            stats = TextStatistics(text)
+        raw_scores = dict(stats.readability_scores)
         
         # Use Flesch-Kincaid as primary score
         primary_score = raw_scores["flesch_kincaid_grade"]
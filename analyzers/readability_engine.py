@@ -0,0 +1,149 @@
+"""
+Single-pass readability counts.
+
+textstat computes each readability index separately: every index splits
+the text into sentences again, strips punctuation again and counts every
+word's syllables again through a small per-call cache. This engine produces
+all the counts the indices need in one pass with textstat's exact rules:
+
+    - the text is stripped of punctuation and split into words once
+    - each distinct (lowercased) word is looked up once: first in a
+      syllable dictionary derived from CMUdict (word -> syllable count of
+      its first pronunciation), then with Pyphen's hyphenation rules through
+      a bounded LRU cache for words CMUdict does not know
+    - polysyllable and difficult-word counts come from the same lookup,
+      against the Dale-Chall easy words held as a frozenset
+
+The syllable dictionary is a shared model ("cmudict_syllables"), built once
+per worker on first use or during startup warmup.
+
+Usage:
+    counts = count_readability(text)
+    counts.syllable_count, counts.sentence_count
+"""
+
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from importlib import resources
+from typing import Dict, NamedTuple
+
+from .models import models
+
+# Words of this many syllables or more are polysyllables (SMOG)
+POLYSYLLABLE_THRESHOLD = 3
+
+# Gunning Fog counts words of this many syllables or more as complex (textstat's English default)
+GUNNING_FOG_SYLLABLE_THRESHOLD = 3
+
+# Words outside CMUdict whose rule-based syllable count is remembered per worker
+SYLLABLE_CACHE_SIZE = int(os.getenv("SYLLABLE_CACHE_SIZE", 20000))
+
+# Language of the Pyphen hyphenation rules (textstat's default)
+HYPHENATION_LANGUAGE = "en_US"
+
+# textstat's punctuation removal: every non-word character except apostrophes
+# that start a contraction ending ("don't", "she'll")
+_PUNCTUATION = re.compile(r"'(?!(?:[tsd]|ve|ll|re))|[^\w\s']")
+_SENTENCE = re.compile(r"\b[^.!?]+[.!?]*")
+
+# Sentences of this many words or fewer are not counted (textstat's rule)
+_SHORT_SENTENCE_WORDS = 2
+
+
+def _load_easy_words() -> frozenset:
+    ref = resources.files("textstat").joinpath("resources/en/easy_words.txt")
+    with ref.open() as f:
+        return frozenset(line.strip() for line in f)
+
+
+# Dale-Chall easy words (lowercase), as shipped with textstat
+EASY_WORDS = _load_easy_words()
+
+
+class ReadabilityCounts(NamedTuple):
+    """Every count the readability indices are computed from."""
+    sentence_count: int
+    word_count: int
+    syllable_count: int
+    polysyllable_count: int
+    difficult_word_count: int  # Not an easy word, GUNNING_FOG_SYLLABLE_THRESHOLD+ syllables
+    dale_chall_difficult_word_count: int  # Not an easy word
+
+
+def _load_syllable_dictionary() -> Dict[str, int]:
+    import cmudict
+
+    return {
+        word: sum(1 for phone in pronunciations[0] if phone[-1].isdigit())
+        for word, pronunciations in cmudict.dict().items() if pronunciations
+    }
+
+
+models.register("cmudict_syllables", _load_syllable_dictionary)
+
+
+@lru_cache(maxsize=1)
+def _hyphenator():
+    from pyphen import Pyphen
+    return Pyphen(lang=HYPHENATION_LANGUAGE)
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def _rule_syllables(word: str) -> int:
+    return len(_hyphenator().positions(word)) + 1
+
+
+def count_syllables(word: str) -> int:
+    """Syllables in one word, as textstat counts them."""
+    word = word.lower()
+    count = models.get("cmudict_syllables").get(word)
+    return count if count is not None else _rule_syllables(word)
+
+
+def count_sentences(text: str) -> int:
+    """Number of sentences, ignoring fragments of two words or fewer (0 for empty text)."""
+    if not text:
+        return 0
+    sentences = _SENTENCE.findall(text)
+    ignored = sum(1 for sentence in sentences if len(_PUNCTUATION.sub("", sentence).split()) <= _SHORT_SENTENCE_WORDS)
+    return max(1, len(sentences) - ignored)
+
+
+def count_readability(text: str) -> ReadabilityCounts:
+    """
+    Counts sentences, words, syllables, polysyllables and difficult words in one pass.
+
+    Args:
+        text: The text to count
+
+    Returns:
+        ReadabilityCounts equal to textstat's sentence_count,
+        lexicon_count(removepunct=True), syllable_count, polysyllabcount and
+        difficult_words(unique=False) with thresholds 3 and 0
+    """
+    words = _PUNCTUATION.sub("", text).split()
+    dictionary = models.get("cmudict_syllables")
+
+    syllables = polysyllables = difficult = dale_chall_difficult = 0
+    for word, occurrences in Counter(word.lower() for word in words).items():
+        count = dictionary.get(word)
+        if count is None:
+            count = _rule_syllables(word)
+        syllables += count * occurrences
+        if count >= POLYSYLLABLE_THRESHOLD:
+            polysyllables += occurrences
+        if word not in EASY_WORDS:
+            dale_chall_difficult += occurrences
+            if count >= GUNNING_FOG_SYLLABLE_THRESHOLD:
+                difficult += occurrences
+
+    return ReadabilityCounts(
+        sentence_count=count_sentences(text),
+        word_count=len(words),
+        syllable_count=syllables,
+        polysyllable_count=polysyllables,
+        difficult_word_count=difficult,
+        dale_chall_difficult_word_count=dale_chall_difficult
+    )
@@ -0,0 +1,126 @@
+"""
+Analyzer registry for the full tier (spaCy and transformer models).
+
+With ``ANALYSIS_CASCADE=1`` tone, passive voice and grammar are cascades: the
+lightweight analyzer is served unless it is unsure or disagrees with the
+student's baseline (passed in by the routes as the "profile" artifact), and
+the spaCy parse is only done when an analyzer needs it (see analyzers.cascade).
+"""
+
+from constants import ANALYZER_VERSIONS, TONE_BACKEND, TONE_ONNX_VERSION, CASCADE_ENABLED, CASCADE_THRESHOLDS
+from .pipeline import AnalyzerRegistry, AnalyzerSpec, ArtifactSpec, COST_CHEAP, COST_MODERATE, COST_EXPENSIVE
+from .document import parse_document, LazyDocument
+from .text_stats import TextStatistics
+from .style_metrics import compute_formality, compute_complexity
+from .sentiment import analyze_sentiment
+from .passive_voice import detect_passive_sentences
+from .lexical import compute_lexical_diversity
+from .hedging import detect_hedging
+from .lexicon import scan_lexicons
+from .readability import analyze_readability
+from .grammar import analyze_grammar
+from .lexical_richness import analyze_lexical_richness
+
+# The tone backend module also provides classify_tone_batch and tone_batcher for the routes
+if TONE_BACKEND == "onnx":
+    from . import tone_onnx as tone_backend
+    TONE_VERSION = TONE_ONNX_VERSION
+else:
+    from . import tone as tone_backend
+    TONE_VERSION = ANALYZER_VERSIONS["tone"]
+
+
+def _build_doc(text: str):
+    return parse_document(text)
+
+
+def _build_stats(text: str) -> TextStatistics:
+    return TextStatistics(text)
+
+
+def _build_lazy_doc(text: str) -> LazyDocument:
+    return LazyDocument(text)
+
+
+def _parse_lazy_doc(text: str, lazy_doc: LazyDocument):
+    # Shares one parse with every cascade that escalated
+    return lazy_doc.get()
+
+
+def _build_light_doc(text: str):
+    from .document_lightweight import LightweightDocument
+    return LightweightDocument(text).tag()
+
+
+def _no_profile(text: str):
+    # The routes provide the student's baseline profile when they have one
+    return None
+
+
+def _cascade_specs():
+    """
+    Tone, passive voice and grammar as cheap-first cascades.
+
+    Whether a cascade escalates depends on the student's profile, so its
+    results are not shared through the result cache.
+    """
+    from .cascade import CascadeAnalyzer, tone_disagrees, passive_voice_disagrees, grammar_disagrees
+    from .tone_lightweight import classify_tone_model as classify_tone_fast
+    from .passive_voice_lightweight import detect_passive_sentences as detect_passive_fast
+    from .grammar_lightweight import analyze_grammar as analyze_grammar_fast
+
+    inputs = ("light_doc", "lazy_doc", "profile")
+    return {
+        "tone": AnalyzerSpec("tone", CascadeAnalyzer(
+            "tone", classify_tone_fast, tone_backend.classify_tone_model, CASCADE_THRESHOLDS["tone"],
+            # The keyword classifier only shares these buckets with the emotion model
+            accept_buckets=("neutral", "positive"),
+            disagrees=tone_disagrees
+        ), f"{TONE_VERSION}-cascade", COST_MODERATE, ("profile",), cacheable=False),
+        "passive_voice": AnalyzerSpec("passive_voice", CascadeAnalyzer(
+            "passive_voice", detect_passive_fast, detect_passive_sentences, CASCADE_THRESHOLDS["passive_voice"],
+            disagrees=passive_voice_disagrees, fast_uses_doc=True, slow_uses_doc=True
+        ), f"{ANALYZER_VERSIONS['passive_voice']}-cascade", COST_MODERATE, inputs, cacheable=False),
+        "grammar": AnalyzerSpec("grammar", CascadeAnalyzer(
+            "grammar", analyze_grammar_fast, analyze_grammar, CASCADE_THRESHOLDS["grammar"],
+            disagrees=grammar_disagrees, fast_uses_doc=True, slow_uses_doc=True
+        ), f"{ANALYZER_VERSIONS['grammar']}-cascade", COST_MODERATE, inputs, cacheable=False),
+    }
+
+
+if CASCADE_ENABLED:
+    # "doc" is parsed from the lazy document, so cascades that escalate share it.
+    # complexity and lexical_richness still need "doc", so a full selection
+    # parses every text even when no cascade escalates.
+    artifacts = [
+        ArtifactSpec("lazy_doc", _build_lazy_doc),
+        ArtifactSpec("doc", _parse_lazy_doc, ("lazy_doc",)),
+        ArtifactSpec("light_doc", _build_light_doc),
+        ArtifactSpec("profile", _no_profile),
+        ArtifactSpec("stats", _build_stats),
+        ArtifactSpec("lexicon", scan_lexicons, argument="hits"),
+    ]
+    cascades = _cascade_specs()
+else:
+    artifacts = [
+        ArtifactSpec("doc", _build_doc),
+        ArtifactSpec("stats", _build_stats),
+        ArtifactSpec("lexicon", scan_lexicons, argument="hits"),
+    ]
+    cascades = {}
+
+registry = AnalyzerRegistry(
+    artifacts=artifacts,
+    analyzers=[
+        AnalyzerSpec("formality", compute_formality, ANALYZER_VERSIONS["formality"], COST_CHEAP, ("stats",)),
+        AnalyzerSpec("complexity", compute_complexity, ANALYZER_VERSIONS["complexity"], COST_MODERATE, ("doc", "stats")),
+        cascades.get("tone") or AnalyzerSpec("tone", tone_backend.classify_tone_model, TONE_VERSION, COST_EXPENSIVE),
+        AnalyzerSpec("sentiment", analyze_sentiment, ANALYZER_VERSIONS["sentiment"], COST_MODERATE),
+        cascades.get("passive_voice") or AnalyzerSpec("passive_voice", detect_passive_sentences, ANALYZER_VERSIONS["passive_voice"], COST_MODERATE, ("doc",)),
+        AnalyzerSpec("lexical_diversity", compute_lexical_diversity, ANALYZER_VERSIONS["lexical_diversity"], COST_CHEAP),
+        AnalyzerSpec("hedging", detect_hedging, ANALYZER_VERSIONS["hedging"], COST_CHEAP, ("lexicon",)),
+        AnalyzerSpec("readability", analyze_readability, ANALYZER_VERSIONS["readability"], COST_CHEAP, ("stats",)),
+        cascades.get("grammar") or AnalyzerSpec("grammar", analyze_grammar, ANALYZER_VERSIONS["grammar"], COST_MODERATE, ("doc",)),
+        AnalyzerSpec("lexical_richness", analyze_lexical_richness, ANALYZER_VERSIONS["lexical_richness"], COST_MODERATE, ("doc",)),
+    ],
+)
@@ -0,0 +1,68 @@
+"""
+Analyzer registry for the lightweight tier (NLTK and TextBlob only).
+
+Sentence splitting and tokenization ("sentences") are cheap; POS tagging
+("doc") is only done when a selected analyzer needs the tags.
+
+Grammar and passive voice run in this process rather than on the process
+pool: their per-sentence checks are served from this process's sentence
+cache, which a pool worker would not share.
+"""
+
+from constants import ANALYZER_VERSIONS_LIGHTWEIGHT, TONE_BACKEND, TONE_ONNX_VERSION
+from .pipeline import AnalyzerRegistry, AnalyzerSpec, ArtifactSpec, COST_CHEAP, COST_MODERATE, COST_EXPENSIVE
+from .document_lightweight import LightweightDocument
+from .text_stats import TextStatistics
+from .style_metrics_lightweight import compute_formality, compute_complexity
+from .sentiment import analyze_sentiment
+from .passive_voice_lightweight import detect_passive_sentences
+from .lexical import compute_lexical_diversity
+from .hedging import detect_hedging
+from .lexicon import scan_lexicons
+from .readability import analyze_readability
+from .grammar_lightweight import analyze_grammar
+from .lexical_richness_lightweight import analyze_lexical_richness
+
+# Transformer-quality tone fits in this tier's memory budget on onnxruntime
+if TONE_BACKEND == "onnx":
+    from .tone_onnx import classify_tone_model
+    TONE_VERSION, TONE_COST, TONE_REQUIRES = TONE_ONNX_VERSION, COST_EXPENSIVE, ()
+else:
+    from .tone_lightweight import classify_tone_model
+    TONE_VERSION, TONE_COST, TONE_REQUIRES = ANALYZER_VERSIONS_LIGHTWEIGHT["tone"], COST_MODERATE, ("lexicon",)
+
+
+def _build_sentences(text: str) -> LightweightDocument:
+    return LightweightDocument(text)
+
+
+def _build_tagged(text: str, sentences: LightweightDocument) -> LightweightDocument:
+    # Tag before fanning out so process-pool workers receive the tags
+    return sentences.tag()
+
+
+def _build_stats(text: str) -> TextStatistics:
+    return TextStatistics(text)
+
+
+registry = AnalyzerRegistry(
+    artifacts=[
+        ArtifactSpec("sentences", _build_sentences, argument="doc"),
+        ArtifactSpec("doc", _build_tagged, ("sentences",)),
+        ArtifactSpec("stats", _build_stats),
+        # One lexicon pass shared by hedging and tone
+        ArtifactSpec("lexicon", scan_lexicons, argument="hits"),
+    ],
+    analyzers=[
+        AnalyzerSpec("formality", compute_formality, ANALYZER_VERSIONS_LIGHTWEIGHT["formality"], COST_CHEAP, ("stats",)),
+        AnalyzerSpec("complexity", compute_complexity, ANALYZER_VERSIONS_LIGHTWEIGHT["complexity"], COST_MODERATE, ("doc", "stats")),
+        AnalyzerSpec("tone", classify_tone_model, TONE_VERSION, TONE_COST, TONE_REQUIRES),
+        AnalyzerSpec("sentiment", analyze_sentiment, ANALYZER_VERSIONS_LIGHTWEIGHT["sentiment"], COST_MODERATE),
+        AnalyzerSpec("passive_voice", detect_passive_sentences, ANALYZER_VERSIONS_LIGHTWEIGHT["passive_voice"], COST_MODERATE, ("doc",)),
+        AnalyzerSpec("lexical_diversity", compute_lexical_diversity, ANALYZER_VERSIONS_LIGHTWEIGHT["lexical_diversity"], COST_CHEAP),
+        AnalyzerSpec("hedging", detect_hedging, ANALYZER_VERSIONS_LIGHTWEIGHT["hedging"], COST_CHEAP, ("lexicon",)),
+        AnalyzerSpec("readability", analyze_readability, ANALYZER_VERSIONS_LIGHTWEIGHT["readability"], COST_CHEAP, ("stats",)),
+        AnalyzerSpec("grammar", analyze_grammar, ANALYZER_VERSIONS_LIGHTWEIGHT["grammar"], COST_MODERATE, ("doc",)),
+        AnalyzerSpec("lexical_richness", analyze_lexical_richness, ANALYZER_VERSIONS_LIGHTWEIGHT["lexical_richness"], COST_MODERATE, ("sentences",)),
+    ],
+)
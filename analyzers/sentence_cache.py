@@ -0,0 +1,137 @@
+"""
+Sentence-level cache of intermediate analyzer results.
+
+Students resubmit revisions of the same essay and most sentences survive
+from one draft to the next. Intermediate results that depend on nothing but
+the sentence itself (tokens, POS tags, grammar issues, passive flags, tone
+token counts) are cached under a hash of the sentence text, so re-analyzing
+a revision only tokenizes, tags and checks the sentences that changed; the
+document-level scores are recombined from the cached per-sentence values.
+Emotion scores are cached per tone window (see ``analyzers.tone_base``).
+
+Entries are keyed on ``(kind, text hash)`` and bounded by an LRU. Cached
+values are shared between requests and must be treated as read-only. Each
+uvicorn worker has its own cache; the analyzers that use it run in the
+worker itself, not on the executor's process pool.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+SENTENCE_CACHE_SIZE = int(os.getenv("SENTENCE_CACHE_SIZE", 50000))
+
+
+def hash_sentence(sentence: str) -> bytes:
+    """Returns a compact digest of a sentence's exact text."""
+    return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).digest()
+
+
+class SentenceCache:
+    """
+    Thread-safe LRU of per-sentence intermediate results.
+
+    Attributes:
+        max_entries: Maximum number of (kind, sentence) entries held
+    """
+
+    def __init__(self, max_entries: int = SENTENCE_CACHE_SIZE):
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, kind: str, sentence: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for a sentence, computing and caching it on a miss.
+
+        Args:
+            kind: What is cached, e.g. "tags" or "grammar"
+            sentence: The sentence text
+            compute: Called with no arguments on a miss
+
+        Returns:
+            The cached or freshly computed value
+        """
+        key = (kind, hash_sentence(sentence))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Computed outside the lock; two threads missing the same sentence both compute it
+        value = compute()
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def get_or_compute_many(self, kind: str, sentences: List[str], compute_many: Callable[[List[int]], List[Any]]) -> List[Any]:
+        """
+        Like get_or_compute for several sentences, computing every miss in one call.
+
+        Args:
+            kind: What is cached, e.g. "tags"
+            sentences: The sentence texts
+            compute_many: Called once with the positions of the missed sentences;
+                returns their values in the same order
+
+        Returns:
+            One cached or freshly computed value per sentence
+        """
+        keys = [(kind, hash_sentence(sentence)) for sentence in sentences]
+        values: List[Any] = [None] * len(sentences)
+        missing = []
+        with self._lock:
+            for index, key in enumerate(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    values[index] = self._entries[key]
+                    self.hits += 1
+                else:
+                    missing.append(index)
+            self.misses += len(missing)
+
+        if missing:
+            for index, value in zip(missing, compute_many(missing)):
+                values[index] = value
+            if self.max_entries:
+                with self._lock:
+                    for index in missing:
+                        self._entries[keys[index]] = values[index]
+                        self._entries.move_to_end(keys[index])
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return values
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses, hit rate and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
+
+
+# Shared by the lightweight document layer and analyzers in this process
+sentence_cache = SentenceCache()
@@ -3,7 +3,7 @@ This module provides functions to calculate style-related metrics for a given te
 """
 
 from . import create_standard_response
-from .readability import analyze_readability
+from .text_stats import TextStatistics
 
 def average_sentence_length(text: str) -> float:
     """
@@ -16,16 +16,19 @@ def average_sentence_length(text: str) -> float:
     # Calculate the average number of words per sentence
     return sum(len(sentence.split()) for sentence in sentences) / len(sentences)
 
-import spacy
 import re
+from .document import parse_document
 
-def compute_formality(text: str) -> dict:
+def compute_formality(text: str, stats: TextStatistics = None) -> dict:
     """
-    Analyze formality using readability scores from the centralized readability module.
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Analyze formality using readability scores from the shared text statistics.
+    Pass the request's ``TextStatistics`` to reuse counts already computed for readability.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    # Get readability scores from the centralized readability module
-    readability_scores = analyze_readability(text)
+    # Get readability scores from the shared per-request statistics
+    if stats is None:
+        stats = TextStatistics(text)
+    readability_scores = stats.readability_scores
     
     # Extract Flesch-Kincaid grade for formality classification
     fk_grade = readability_scores.get("flesch_kincaid_grade", 0)
@@ -44,12 +47,12 @@ def compute_formality(text: str) -> dict:
     # Calculate confidence based on text length
     confidence = 0.8  # Base confidence for readability metrics
     
-    # Create raw emotions breakdown using readability scores
-    raw_emotions = [
-        {"label": "flesch_kincaid_grade", "score": readability_scores.get("flesch_kincaid_grade", 0)},
-        {"label": "gunning_fog_index", "score": readability_scores.get("gunning_fog", 0)},
-        {"label": "dale_chall_score", "score": readability_scores.get("dale_chall_score", 0)}
-    ]
+    # Create raw breakdown using readability scores
+    raw_data = {
+        "flesch_kincaid_grade": readability_scores.get("flesch_kincaid_grade", 0),
+        "gunning_fog_index": readability_scores.get("gunning_fog", 0),
+        "dale_chall_score": readability_scores.get("dale_chall_score", 0)
+    }
     
     # Create details with additional metrics
     details = {
@@ -63,20 +66,19 @@ def compute_formality(text: str) -> dict:
     return create_standard_response(
         score=score,
         bucket=bucket,
-        raw_emotions=raw_emotions,
+        raw=raw_data,
         confidence=confidence,
         details=details
     )
 
-# Load the English NLP model
-nlp = spacy.load("en_core_web_sm")
-
-def compute_complexity(text: str) -> dict:
+def compute_complexity(text: str, doc=None, stats: TextStatistics = None) -> dict:
     """
     Computes writing complexity metrics.
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Pass a pre-parsed ``doc`` and the request's ``TextStatistics`` to reuse shared work.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    doc = nlp(text)
+    if doc is None:
+        doc = parse_document(text)
 
     # Use the same word counting approach as lexical.py for consistency
     words = re.findall(r'\b\w+\b', text.lower())
@@ -90,10 +92,11 @@ def compute_complexity(text: str) -> dict:
 
     lexical_density = round(content_words / total_words, 3) if total_words > 0 else 0
 
-    # Get sentence and word counts from readability module
-    readability_scores = analyze_readability(text)
-    sentence_count = readability_scores.get("sentence_count", 0)
-    word_count = readability_scores.get("word_count", 0)
+    # Get sentence and word counts from the shared per-request statistics
+    if stats is None:
+        stats = TextStatistics(text)
+    sentence_count = stats.sentence_count
+    word_count = stats.word_count
     avg_sentence_length = round(word_count / sentence_count, 2) if sentence_count > 0 else 0
 
     # Determine complexity bucket based on lexical density and sentence length
@@ -110,11 +113,13 @@ def compute_complexity(text: str) -> dict:
     # Calculate confidence based on text length - use same threshold as lexical.py
     confidence = min(1.0, total_words / 30)  # Higher confidence with more text
     
-    # Create raw emotions breakdown
-    raw_emotions = [
-        {"label": "lexical_density", "score": lexical_density},
-        {"label": "avg_sentence_length", "score": avg_sentence_length / 30}  # Normalize to 0-1 range
-    ]
+    # Create raw breakdown
+    raw = {
+        "lexical_density": lexical_density,
+        "avg_sentence_length": avg_sentence_length,
+        "total_words": total_words,
+        "content_words": content_words
+    }
     
     # Create details with additional metrics
     details = {
@@ -132,7 +137,7 @@ def compute_complexity(text: str) -> dict:
     return create_standard_response(
         score=score,
         bucket=bucket,
-        raw_emotions=raw_emotions,
+        raw=raw,
         confidence=confidence,
         details=details
     )
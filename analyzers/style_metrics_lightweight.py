@@ -7,7 +7,7 @@ import re
 import nltk
 from textstat import flesch_kincaid_grade, gunning_fog
 from . import create_standard_response
-from .readability import analyze_readability
+from .text_stats import TextStatistics
 
 # Handle dale_chall_score import compatibility
 try:
@@ -34,8 +34,8 @@ except LookupError:
     nltk.download('stopwords', quiet=True)
 
 from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.tag import pos_tag
 from nltk.corpus import stopwords
+from .document_lightweight import LightweightDocument
 
 def average_sentence_length(text: str) -> float:
     """
@@ -47,13 +47,16 @@ def average_sentence_length(text: str) -> float:
     words = word_tokenize(text)
     return len(words) / len(sentences)
 
-def compute_formality(text: str) -> dict:
+def compute_formality(text: str, stats: TextStatistics = None) -> dict:
     """
-    Analyze formality using readability scores from the centralized readability module.
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Analyze formality using readability scores from the shared text statistics.
+    Pass the request's ``TextStatistics`` to reuse counts already computed for readability.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    # Get readability scores from the centralized readability module
-    readability_scores = analyze_readability(text)
+    # Get readability scores from the shared per-request statistics
+    if stats is None:
+        stats = TextStatistics(text)
+    readability_scores = stats.readability_scores
     
     # Extract Flesch-Kincaid grade for formality classification
     fk_grade = readability_scores.get("flesch_kincaid_grade", 0)
@@ -96,14 +99,17 @@ def compute_formality(text: str) -> dict:
         details=details
     )
 
-def compute_complexity(text: str) -> dict:
+def compute_complexity(text: str, doc: LightweightDocument = None, stats: TextStatistics = None) -> dict:
     """
     Computes writing complexity metrics using NLTK instead of spaCy.
-    Returns a standardized response with score, bucket, raw_emotions, confidence, and details.
+    Pass a ``LightweightDocument`` and the request's ``TextStatistics`` to reuse shared work.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
     """
     # Tokenize and tag words
-    words = word_tokenize(text.lower())
-    pos_tags = pos_tag(words)
+    if doc is None:
+        doc = LightweightDocument(text)
+    pos_tags = doc.tags
+    words = [word for word, pos in pos_tags]
     
     # Count content words (nouns, verbs, adjectives, adverbs)
     content_words = 0
@@ -117,10 +123,11 @@ def compute_complexity(text: str) -> dict:
     total_words = len(words)
     lexical_density = round(content_words / total_words, 3) if total_words > 0 else 0
 
-    # Get sentence and word counts from readability module
-    readability_scores = analyze_readability(text)
-    sentence_count = readability_scores.get("sentence_count", 0)
-    word_count = readability_scores.get("word_count", 0)
+    # Get sentence and word counts from the shared per-request statistics
+    if stats is None:
+        stats = TextStatistics(text)
+    sentence_count = stats.sentence_count
+    word_count = stats.word_count
     avg_sentence_length = round(word_count / sentence_count, 2) if sentence_count > 0 else 0
 
     # Determine complexity bucket based on lexical density and sentence length
@@ -0,0 +1,124 @@
+"""
+Request-scoped text statistics shared by the readability, formality and
+complexity analyzers.
+
+``TextStatistics`` memoizes the sentence, word, syllable, polysyllable and
+difficult-word counts for one text, all produced by a single pass of the
+readability engine. The four readability indices are derived from those
+counts with textstat's formulas, so a request that builds one
+``TextStatistics`` and passes it to every analyzer counts each quantity once
+instead of once per index and once per analyzer.
+"""
+
+from functools import cached_property
+from typing import Dict, Any
+
+from .readability_engine import ReadabilityCounts, count_readability
+
+
+class TextStatistics:
+    """
+    Memoized readability counts and indices for one text.
+
+    Every property is computed on first access and cached on the instance,
+    so the object should be created once per request and shared.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    # --- Counts -------------------------------------------------------------
+
+    @cached_property
+    def counts(self) -> ReadabilityCounts:
+        """Every count below, from one pass over the text."""
+        return count_readability(self.text)
+
+    @property
+    def sentence_count(self) -> int:
+        """Number of sentences (fragments of two words or fewer are ignored)."""
+        return self.counts.sentence_count
+
+    @property
+    def word_count(self) -> int:
+        """Number of words with punctuation removed."""
+        return self.counts.word_count
+
+    @property
+    def syllable_count(self) -> int:
+        """Total number of syllables."""
+        return self.counts.syllable_count
+
+    @property
+    def polysyllable_count(self) -> int:
+        """Number of words with three or more syllables."""
+        return self.counts.polysyllable_count
+
+    @property
+    def difficult_word_count(self) -> int:
+        """Words outside the Dale-Chall easy list with enough syllables to count as complex for Gunning Fog."""
+        return self.counts.difficult_word_count
+
+    @property
+    def dale_chall_difficult_word_count(self) -> int:
+        """Words outside the Dale-Chall easy list, regardless of syllable count."""
+        return self.counts.dale_chall_difficult_word_count
+
+    # --- Ratios -------------------------------------------------------------
+
+    @property
+    def words_per_sentence(self) -> float:
+        """Average sentence length in words."""
+        return self.word_count / self.sentence_count if self.sentence_count else 0.0
+
+    @property
+    def syllables_per_word(self) -> float:
+        """Average number of syllables per word."""
+        return self.syllable_count / self.word_count if self.word_count else 0.0
+
+    # --- Readability indices ------------------------------------------------
+
+    @cached_property
+    def flesch_kincaid_grade(self) -> float:
+        """Flesch-Kincaid Grade Level."""
+        if self.words_per_sentence == 0 or self.syllables_per_word == 0:
+            return 0.0
+        return (0.39 * self.words_per_sentence) + (11.8 * self.syllables_per_word) - 15.59
+
+    @cached_property
+    def smog_index(self) -> float:
+        """SMOG index."""
+        if not self.sentence_count:
+            return 0.0
+        return (1.043 * (30 * (self.polysyllable_count / self.sentence_count)) ** 0.5) + 3.1291
+
+    @cached_property
+    def gunning_fog(self) -> float:
+        """Gunning Fog index."""
+        if not self.word_count:
+            return 0.0
+        percent_difficult = 100 * self.difficult_word_count / self.word_count
+        return 0.4 * (self.words_per_sentence + percent_difficult)
+
+    @cached_property
+    def dale_chall_score(self) -> float:
+        """Dale-Chall readability score (textstat's approximation)."""
+        if not self.word_count:
+            return 0.0
+        percent_difficult = 100 * self.dale_chall_difficult_word_count / self.word_count
+        score = (0.1579 * percent_difficult) + (0.0496 * self.words_per_sentence)
+        if percent_difficult > 5:
+            score += 3.6365
+        return score
+
+    @cached_property
+    def readability_scores(self) -> Dict[str, Any]:
+        """The raw score dictionary reported by the readability analyzer."""
+        return {
+            "flesch_kincaid_grade": round(self.flesch_kincaid_grade, 2),
+            "smog_index": round(self.smog_index, 2),
+            "gunning_fog": round(self.gunning_fog, 2),
+            "dale_chall_score": round(self.dale_chall_score, 2),
+            "word_count": self.word_count,
+            "sentence_count": self.sentence_count
+        }
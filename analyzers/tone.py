@@ -1,73 +1,68 @@
-from transformers import pipeline
-from constants import EMOTION_TO_TONE  # Import the centralized mapping
-from . import create_standard_response
+from typing import List, Optional
+from .batching import MicroBatcher
+from .models import models
+from .tone_base import (
+    TONE_MODEL_NAME, TONE_BATCH_SIZE, TONE_MAX_TOKENS,
+    TONE_MICROBATCH_MAX_WAIT_MS, TONE_MICROBATCH_MAX_SIZE,
+    map_emotion_to_tone, classify_texts, cached_per_unit
+)
 
-emotion_classifier = pipeline("text-classification", model="SamLowe/roberta-base-go_emotions", top_k=None)
+def _load_classifier():
+    # transformers (and torch) are imported on first load, not when the app starts
+    from transformers import pipeline
+    return pipeline("text-classification", model=TONE_MODEL_NAME, top_k=None)
 
-def map_emotion_to_tone(label: str) -> str:
-    """
-    Maps a fine-grained emotion label to a broader tone category using the EMOTION_TO_TONE mapping.
-    """
-    return EMOTION_TO_TONE.get(label, "neutral")  # Use the constant for mapping
+def _load_counter():
+    # A tokenizer of its own: the pipeline's switches truncation on and off
+    # around each call from the batcher thread, which races with counting in
+    # request threads. This one is never reconfigured after loading.
+    from transformers import AutoTokenizer
+    counter = AutoTokenizer.from_pretrained(TONE_MODEL_NAME).backend_tokenizer
+    counter.no_padding()
+    counter.no_truncation()
+    return counter
+
+models.register("tone", _load_classifier, warmup=lambda classifier: classifier(["Warming up the tone model."], truncation=True))
+models.register("tone_counter", _load_counter)
 
-def classify_tone_model(text: str, threshold: float = 0.4, score_diff: float = 0.05) -> dict:
+def classify_tone_model(text: str, threshold: float = 0.4, score_diff: float = 0.05, max_tokens: Optional[int] = TONE_MAX_TOKENS) -> dict:
     """
     Classifies the tone of the given text based on emotion scores.
+    Texts longer than ``max_tokens`` are split on sentence boundaries into windows
+    that are classified in one padded batch and combined weighted by length, so the
+    whole essay is read (pass ``max_tokens=None`` to truncate instead).
+    Concurrent calls are micro-batched into shared forward passes by ``tone_batcher``.
     Returns a standardized response with score, bucket, raw, confidence, and details.
     """
-    raw_scores = emotion_classifier(text)[0]
-    emotions = [
-        {"label": e["label"], "score": round(e["score"], 3)}
-        for e in raw_scores if e["score"] >= threshold
-    ]
+    return classify_texts([text], _classify_cached, _count_cached, threshold, score_diff, max_tokens)[0]
 
-    # Sort emotions by score in descending order
-    sorted_emotions = sorted(emotions, key=lambda x: x["score"], reverse=True)
-
-    # Get the top emotion
-    top_emotion = sorted_emotions[0]
-    top_label = top_emotion["label"]
-    mapped_tone = map_emotion_to_tone(top_label)
-    
-    # Calculate confidence based on top emotion score
-    confidence = top_emotion["score"]
-    
-    # Determine if there's a close second emotion
-    has_secondary_tone = False
-    secondary_tone = None
-    if len(sorted_emotions) > 1:
-        second_emotion = sorted_emotions[1]
-        if abs(top_emotion["score"] - second_emotion["score"]) <= score_diff:
-            has_secondary_tone = True
-            secondary_tone = map_emotion_to_tone(second_emotion["label"])
-    
-    # Create final bucket
-    if has_secondary_tone:
-        bucket = f"{mapped_tone} / {secondary_tone}"
-    else:
-        bucket = mapped_tone
-    
-    # Create raw output with all analyzer details
-    raw = {
-        "emotion_scores": raw_scores,
-        "filtered_emotions": emotions,
-        "threshold": threshold,
-        "score_diff_threshold": score_diff
-    }
-    
-    # Create details with additional information
-    details = {
-        "top_emotion": top_label,
-        "top_emotion_score": top_emotion["score"],
-        "has_secondary_tone": has_secondary_tone,
-        "secondary_tone": secondary_tone
-    }
-    
-    return create_standard_response(
-        score=top_emotion["score"],
-        bucket=bucket,
-        raw=raw,
-        confidence=confidence,
-        details=details
+def classify_tone_batch(texts: list, threshold: float = 0.4, score_diff: float = 0.05, batch_size: int = TONE_BATCH_SIZE, max_tokens: Optional[int] = TONE_MAX_TOKENS) -> list:
+    """
+    Classifies the tone of several texts, running the emotion model in batched forward passes.
+    The windows of long texts are batched together with the other texts.
+    Returns one standardized response per text, identical to classify_tone_model's.
+    """
+    return classify_texts(
+        list(texts), cached_per_unit("emotions_torch", lambda windows: _classify_windows(windows, batch_size)), _count_cached,
+        threshold, score_diff, max_tokens
     )
 
+def _classify_windows(windows: List[str], batch_size: int = TONE_BATCH_SIZE) -> List[list]:
+    """Runs the emotion model on a list of windows in padded batches; one score list per window."""
+    return models.get("tone")(windows, batch_size=batch_size, truncation=True)
+
+def _count_tokens(sentences: List[str]) -> List[int]:
+    """Token count of each sentence under the emotion model's tokenizer, without special tokens."""
+    return [len(encoding.ids) for encoding in models.get("tone_counter").encode_batch(sentences, add_special_tokens=False)]
+
+# Collects concurrent classify_tone_model calls into shared forward passes
+tone_batcher = MicroBatcher(
+    lambda windows: _classify_windows(windows, batch_size=TONE_MICROBATCH_MAX_SIZE),
+    max_batch_size=TONE_MICROBATCH_MAX_SIZE,
+    max_wait_ms=TONE_MICROBATCH_MAX_WAIT_MS,
+    name="tone"
+)
+
+# Sentences and windows seen before (e.g. in an earlier draft) are not tokenized or classified again
+_classify_cached = cached_per_unit("emotions_torch", tone_batcher.submit_many)
+_count_cached = cached_per_unit("tone_tokens", _count_tokens)
@@ -0,0 +1,171 @@
+"""
+Settings and response building shared by the transformer tone backends.
+
+``analyzers.tone`` runs the go_emotions model on torch and
+``analyzers.tone_onnx`` runs it on onnxruntime; both use these settings and
+build the same standardized response from the same scores. Imports no model
+framework.
+"""
+
+import os
+from typing import Any, Callable, List, Optional, Tuple
+from constants import EMOTION_TO_TONE  # Import the centralized mapping
+from . import create_standard_response
+from .chunking import aggregate_window_scores, token_windows
+from .sentence_cache import sentence_cache
+
+# Hugging Face model both backends serve
+TONE_MODEL_NAME = "SamLowe/roberta-base-go_emotions"
+
+# Number of texts (or windows of long texts) per forward pass when classifying a batch
+TONE_BATCH_SIZE = 16
+
+# Token budget per window: RoBERTa's 512 minus the special tokens and a margin,
+# since sentences re-joined into a window tokenize slightly differently
+TONE_MAX_TOKENS = 500
+
+# Micro-batching of concurrent single-text calls: the first window waits up to
+# this long for others to join, and at most this many windows share a forward pass
+TONE_MICROBATCH_MAX_WAIT_MS = float(os.getenv("TONE_MICROBATCH_MAX_WAIT_MS", 5))
+TONE_MICROBATCH_MAX_SIZE = int(os.getenv("TONE_MICROBATCH_MAX_SIZE", TONE_BATCH_SIZE))
+
+def map_emotion_to_tone(label: str) -> str:
+    """
+    Maps a fine-grained emotion label to a broader tone category using the EMOTION_TO_TONE mapping.
+    """
+    return EMOTION_TO_TONE.get(label, "neutral")  # Use the constant for mapping
+
+def cached_per_unit(kind: str, compute_many: Callable[[List[str]], List[Any]]) -> Callable[[List[str]], List[Any]]:
+    """
+    Wraps a backend call that returns one value per string (token counts per
+    sentence, emotion scores per window) so strings seen before, e.g. in an
+    earlier draft, are served from the sentence cache and only the rest are
+    sent to the backend.
+    
+    Emotion scores are cached per window, the unit the model reads: windows
+    before the first edited sentence are reused, later ones when the window
+    boundaries line up again. Scoring sentences on their own would change
+    what the model sees.
+    """
+    def cached(units: List[str]) -> List[Any]:
+        return sentence_cache.get_or_compute_many(kind, units, lambda missing: compute_many([units[index] for index in missing]))
+    return cached
+
+def classify_texts(
+    texts: List[str],
+    classify_windows: Callable[[List[str]], List[list]],
+    count_tokens: Callable[[List[str]], List[int]],
+    threshold: float,
+    score_diff: float,
+    max_tokens: Optional[int] = TONE_MAX_TOKENS
+) -> List[dict]:
+    """
+    Classifies the tone of several texts with one backend.
+    
+    Long texts are split into sentence windows and the windows of every text
+    go to ``classify_windows`` in a single call.
+    
+    Args:
+        texts: Texts to classify
+        classify_windows: The backend's model call; one score list per window
+        count_tokens: The backend's tokenizer; token count of each sentence
+        threshold: Minimum emotion score to report
+        score_diff: Maximum gap between the top two emotions for a secondary tone
+        max_tokens: Token budget per window, or None to send each text whole
+    
+    Returns:
+        One standardized tone response per text
+    """
+    if not texts:
+        return []
+    
+    windows = [
+        [(text, 1)] if max_tokens is None else token_windows(text, count_tokens, max_tokens)
+        for text in texts
+    ]
+    window_scores = classify_windows([window for text_windows in windows for window, _ in text_windows])
+    
+    responses = []
+    start = 0
+    for text_windows in windows:
+        responses.append(tone_from_windows(
+            text_windows, window_scores[start:start + len(text_windows)], threshold, score_diff
+        ))
+        start += len(text_windows)
+    return responses
+
+def tone_from_windows(text_windows: List[Tuple[str, int]], window_scores: List[list], threshold: float, score_diff: float) -> dict:
+    """Combines one text's window scores into its standardized tone response."""
+    if len(text_windows) == 1:
+        raw_scores = window_scores[0]
+    else:
+        raw_scores = aggregate_window_scores(window_scores, [tokens for _, tokens in text_windows])
+    
+    response = tone_from_scores(raw_scores, threshold, score_diff)
+    response["raw"]["windows"] = len(text_windows)
+    return response
+
+def tone_from_scores(raw_scores: list, threshold: float, score_diff: float) -> dict:
+    """
+    Builds the standardized tone response from one text's emotion scores.
+    """
+    emotions = [
+        {"label": e["label"], "score": round(e["score"], 3)}
+        for e in raw_scores if e["score"] >= threshold
+    ]
+    
+    # Averaged window scores can leave no emotion above the threshold; fall back to the strongest
+    if not emotions:
+        strongest = max(raw_scores, key=lambda e: e["score"])
+        emotions = [{"label": strongest["label"], "score": round(strongest["score"], 3)}]
+
+    # Sort emotions by score in descending order
+    sorted_emotions = sorted(emotions, key=lambda x: x["score"], reverse=True)
+
+    # Get the top emotion
+    top_emotion = sorted_emotions[0]
+    top_label = top_emotion["label"]
+    mapped_tone = map_emotion_to_tone(top_label)
+    
+    # Calculate confidence based on top emotion score
+    confidence = top_emotion["score"]
+    
+    # Determine if there's a close second emotion
+    has_secondary_tone = False
+    secondary_tone = None
+    if len(sorted_emotions) > 1:
+        second_emotion = sorted_emotions[1]
+        if abs(top_emotion["score"] - second_emotion["score"]) <= score_diff:
+            has_secondary_tone = True
+            secondary_tone = map_emotion_to_tone(second_emotion["label"])
+    
+    # Create final bucket
+    if has_secondary_tone:
+        bucket = f"{mapped_tone} / {secondary_tone}"
+    else:
+        bucket = mapped_tone
+    
+    # Create raw output with all analyzer details
+    raw = {
+        "emotion_scores": raw_scores,
+        "filtered_emotions": emotions,
+        "threshold": threshold,
+        "score_diff_threshold": score_diff
+    }
+    
+    # Create details with additional information
+    details = {
+        "top_emotion": top_label,
+        "top_emotion_score": top_emotion["score"],
+        "has_secondary_tone": has_secondary_tone,
+        "secondary_tone": secondary_tone
+    }
+    
+    return create_standard_response(
+        score=top_emotion["score"],
+        bucket=bucket,
+        raw=raw,
+        confidence=confidence,
+        details=details
+    )
+
@@ -3,13 +3,17 @@ Lightweight tone analyzer without transformers dependency.
 Uses TextBlob and rule-based analysis for tone classification.
 """
 
+from typing import List
 from textblob import TextBlob
 from constants import EMOTION_TO_TONE
 from . import create_standard_response
+from .lexicon import TONE_KEYWORDS, TONE_PREFIX, LexiconHit, scan_lexicons
 
-def classify_tone_model(text: str, threshold: float = 0.4, score_diff: float = 0.05) -> dict:
+def classify_tone_model(text: str, threshold: float = 0.4, score_diff: float = 0.05, hits: List[LexiconHit] = None) -> dict:
     """
     Classifies the tone of the given text using lightweight rule-based analysis.
+    Tone keywords are counted as whole words from one lexicon scan; pass the
+    request's ``scan_lexicons`` hits to reuse it.
     Returns a standardized response with score, bucket, raw, confidence, and details.
     """
     blob = TextBlob(text)
@@ -18,22 +22,14 @@ def classify_tone_model(text: str, threshold: float = 0.4, score_diff: float = 0
     polarity = blob.sentiment.polarity
     subjectivity = blob.sentiment.subjectivity
     
-    # Define tone keywords and their weights
-    tone_keywords = {
-        "positive": ["good", "great", "excellent", "amazing", "wonderful", "fantastic", "love", "like", "enjoy", "happy", "excited", "proud", "confident", "optimistic"],
-        "negative": ["bad", "terrible", "awful", "hate", "dislike", "angry", "frustrated", "disappointed", "worried", "sad", "confused", "difficult", "hard", "struggle"],
-        "neutral": ["think", "believe", "consider", "analyze", "discuss", "examine", "explore", "investigate", "study", "research", "observe", "note", "find"],
-        "formal": ["therefore", "however", "furthermore", "moreover", "consequently", "nevertheless", "accordingly", "subsequently", "hence", "thus", "indeed"],
-        "informal": ["yeah", "ok", "cool", "awesome", "totally", "definitely", "sure", "maybe", "kinda", "sorta", "gonna", "wanna", "gotta"]
-    }
-    
+    if hits is None:
+        hits = scan_lexicons(text)
+
     # Count keyword occurrences
-    text_lower = text.lower()
-    tone_scores = {}
-    
-    for tone, keywords in tone_keywords.items():
-        score = sum(text_lower.count(keyword) for keyword in keywords)
-        tone_scores[tone] = score
+    tone_scores = {tone: 0 for tone in TONE_KEYWORDS}
+    for hit in hits:
+        if hit.category.startswith(TONE_PREFIX):
+            tone_scores[hit.category[len(TONE_PREFIX):]] += 1
     
     # Normalize scores
     total_words = len(text.split())
@@ -0,0 +1,133 @@
+"""
+Transformer tone analyzer on ONNX Runtime.
+
+Runs the same go_emotions RoBERTa model as ``analyzers.tone``, exported to
+ONNX and dynamically quantized to int8, on onnxruntime's CPU provider. It
+needs neither torch nor transformers (only ``onnxruntime``, ``tokenizers``
+and numpy), so transformer-quality tone fits on the 512MB instances.
+
+Responses have the same contract as ``analyzers.tone``. Create the model
+files once with:
+
+    python export_tone_onnx.py
+
+Select this backend with ``TONE_BACKEND=onnx``. The session and tokenizers
+are loaded through the shared model registry (``analyzers.models``).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+from .batching import MicroBatcher
+from .models import models
+from .tone_base import (
+    TONE_BATCH_SIZE, TONE_MAX_TOKENS,
+    TONE_MICROBATCH_MAX_WAIT_MS, TONE_MICROBATCH_MAX_SIZE,
+    classify_texts, cached_per_unit
+)
+
+# Written by export_tone_onnx.py: model.onnx, model.int8.onnx, tokenizer.json, config.json
+TONE_ONNX_DIR = Path(os.getenv("TONE_ONNX_DIR", Path(__file__).resolve().parent.parent / "models" / "go_emotions_onnx"))
+TONE_ONNX_FILE = os.getenv("TONE_ONNX_FILE", "model.int8.onnx")
+
+# Intra-op threads per inference (0 lets onnxruntime use every core)
+TONE_ONNX_THREADS = int(os.getenv("TONE_ONNX_THREADS", 0))
+
+# RoBERTa's maximum input length, including special tokens
+MODEL_MAX_LENGTH = 512
+
+
+class _OnnxToneModel:
+    """The inference session, labels and tokenizers written by export_tone_onnx.py."""
+
+    def __init__(self, model_dir: Path = TONE_ONNX_DIR, model_file: str = TONE_ONNX_FILE):
+        with open(model_dir / "config.json") as config_file:
+            config = json.load(config_file)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if TONE_ONNX_THREADS:
+            options.intra_op_num_threads = TONE_ONNX_THREADS
+        self.session = ort.InferenceSession(str(model_dir / model_file), options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        # Label of each logit, in model order
+        self.labels: List[str] = [config["id2label"][str(index)] for index in range(len(config["id2label"]))]
+
+        # One tokenizer counts sentence tokens, the other pads and truncates model inputs
+        self.counter = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.counter.no_padding()
+        self.counter.no_truncation()
+
+        self.encoder = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        pad_id = config.get("pad_token_id", 1)
+        self.encoder.enable_truncation(max_length=MODEL_MAX_LENGTH)
+        self.encoder.enable_padding(pad_id=pad_id, pad_token=self.encoder.id_to_token(pad_id))
+
+
+models.register("tone_onnx", _OnnxToneModel, warmup=lambda model: _classify_windows(["Warming up the tone model."]))
+
+def classify_tone_model(text: str, threshold: float = 0.4, score_diff: float = 0.05, max_tokens: Optional[int] = TONE_MAX_TOKENS) -> dict:
+    """
+    Classifies the tone of the given text based on emotion scores, like
+    ``analyzers.tone.classify_tone_model`` but on ONNX Runtime.
+    Concurrent calls are micro-batched into shared forward passes by ``tone_batcher``.
+    Returns a standardized response with score, bucket, raw, confidence, and details.
+    """
+    return classify_texts([text], _classify_cached, _count_cached, threshold, score_diff, max_tokens)[0]
+
+def classify_tone_batch(texts: list, threshold: float = 0.4, score_diff: float = 0.05, batch_size: int = TONE_BATCH_SIZE, max_tokens: Optional[int] = TONE_MAX_TOKENS) -> list:
+    """
+    Classifies the tone of several texts in batched forward passes.
+    Returns one standardized response per text, identical to classify_tone_model's.
+    """
+    return classify_texts(
+        list(texts), cached_per_unit("emotions_onnx", lambda windows: _classify_windows(windows, batch_size)), _count_cached,
+        threshold, score_diff, max_tokens
+    )
+
+def _classify_windows(windows: List[str], batch_size: int = TONE_BATCH_SIZE) -> List[list]:
+    """
+    Runs the model on a list of windows in padded batches.
+    Returns, per window, every label's sigmoid score, highest first (as the transformers pipeline does).
+    """
+    model = models.get("tone_onnx")
+    scores = []
+    for start in range(0, len(windows), batch_size):
+        encodings = model.encoder.encode_batch(windows[start:start + batch_size])
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        }
+        logits = model.session.run(None, {name: value for name, value in inputs.items() if name in model.input_names})[0]
+        # go_emotions is multi-label, so each label gets an independent sigmoid
+        probabilities = 1.0 / (1.0 + np.exp(-logits))
+        for row in probabilities:
+            scores.append(sorted(
+                ({"label": label, "score": float(score)} for label, score in zip(model.labels, row)),
+                key=lambda entry: entry["score"],
+                reverse=True
+            ))
+    return scores
+
+def _count_tokens(sentences: List[str]) -> List[int]:
+    """Token count of each sentence, without special tokens."""
+    return [len(encoding.ids) for encoding in models.get("tone_onnx").counter.encode_batch(sentences, add_special_tokens=False)]
+
+# Collects concurrent classify_tone_model calls into shared forward passes
+tone_batcher = MicroBatcher(
+    lambda windows: _classify_windows(windows, batch_size=TONE_MICROBATCH_MAX_SIZE),
+    max_batch_size=TONE_MICROBATCH_MAX_SIZE,
+    max_wait_ms=TONE_MICROBATCH_MAX_WAIT_MS,
+    name="tone-onnx"
+)
+
+# Sentences and windows seen before (e.g. in an earlier draft) are not tokenized or classified again
+_classify_cached = cached_per_unit("emotions_onnx", tone_batcher.submit_many)
+_count_cached = cached_per_unit("tone_tokens_onnx", _count_tokens)
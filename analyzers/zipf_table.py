@@ -0,0 +1,182 @@
+"""
+Memory-mapped English Zipf frequency table.
+
+``wordfreq.zipf_frequency`` tokenizes and normalizes its input and looks it
+up in a dictionary it loads into every worker. Lexical richness only ever
+asks about single lowercase words, so the English list is precomputed once
+into two numpy arrays:
+
+    vocab.npy   every word, UTF-8 encoded, sorted (fixed-width bytes)
+    zipf.npy    the word's Zipf frequency (float32), in the same order
+
+Both are opened with ``mmap_mode="r"``, so the OS shares their pages between
+every worker process, and a whole token list is looked up at once with
+``np.searchsorted``. Tokens that are not in the table fall back to
+``wordfreq`` through a bounded LRU cache, as does everything when the table
+has not been built. Build it with:
+
+    python build_zipf_table.py
+"""
+
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from wordfreq import zipf_frequency
+
+from .models import models
+
+logger = logging.getLogger(__name__)
+
+ZIPF_TABLE_DIR = Path(os.getenv("ZIPF_TABLE_DIR", Path(__file__).resolve().parent.parent / "models" / "zipf_en"))
+
+# Out-of-vocabulary words remembered per worker
+ZIPF_OOV_CACHE_SIZE = int(os.getenv("ZIPF_OOV_CACHE_SIZE", 20000))
+
+VOCAB_FILE = "vocab.npy"
+ZIPF_FILE = "zipf.npy"
+
+# Words with a Zipf score below this are rare/advanced
+RARE_THRESHOLD = 4.5
+
+# Vocabulary sophistication bands: [lower, upper) Zipf score ranges
+SOPHISTICATION_BANDS = ("very_rare_words", "rare_words", "common_words", "very_common_words")
+SOPHISTICATION_EDGES = np.array([-np.inf, 3.0, RARE_THRESHOLD, 6.0, np.inf])
+
+# Percentiles reported in the Zipf distribution (the median is p50)
+ZIPF_PERCENTILES = (10, 50, 90)
+
+
+class ZipfTable:
+    """
+    Sorted vocabulary and Zipf frequencies, usually memory-mapped.
+
+    Attributes:
+        vocab: Sorted UTF-8 words (numpy ``S`` array)
+        zipf: Zipf frequency of each word (float32)
+    """
+
+    def __init__(self, vocab: np.ndarray, zipf: np.ndarray):
+        self.vocab = vocab
+        self.zipf = zipf
+        self.width = vocab.dtype.itemsize
+
+    @classmethod
+    def load(cls, directory: Path = ZIPF_TABLE_DIR) -> "ZipfTable":
+        """Memory-maps a table written by write_zipf_table."""
+        return cls(
+            np.load(directory / VOCAB_FILE, mmap_mode="r"),
+            np.load(directory / ZIPF_FILE, mmap_mode="r")
+        )
+
+    def lookup(self, tokens: List[str]) -> np.ndarray:
+        """
+        Looks up every token at once.
+
+        Returns:
+            Zipf frequency of each token (float64), NaN where it is not in the table
+        """
+        scores = np.full(len(tokens), np.nan)
+        if not tokens or not len(self.vocab):
+            return scores
+
+        encoded = [token.encode("utf-8") for token in tokens]
+        # Longer tokens would be truncated to a different word, so they are never looked up
+        fits = np.fromiter((len(token) <= self.width for token in encoded), dtype=bool, count=len(encoded))
+        keys = np.array(encoded, dtype=self.vocab.dtype)
+
+        positions = np.minimum(np.searchsorted(self.vocab, keys), len(self.vocab) - 1)
+        found = fits & (self.vocab[positions] == keys)
+        # float32 storage; wordfreq reports two decimals, so rounding restores its exact values
+        scores[found] = np.round(self.zipf[positions[found]].astype(np.float64), 2)
+        return scores
+
+
+def write_zipf_table(directory: Path = ZIPF_TABLE_DIR, words: Optional[Iterable[str]] = None) -> int:
+    """
+    Computes and writes the table.
+
+    Args:
+        directory: Output directory
+        words: Vocabulary (default: wordfreq's whole English list)
+
+    Returns:
+        Number of words written
+    """
+    from wordfreq import iter_wordlist
+
+    words = sorted({word.encode("utf-8") for word in (words if words is not None else iter_wordlist("en"))})
+    vocab = np.array(words, dtype=f"S{max((len(word) for word in words), default=1)}")
+    zipf = np.array([zipf_frequency(word.decode("utf-8"), "en") for word in words], dtype=np.float32)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / VOCAB_FILE, vocab)
+    np.save(directory / ZIPF_FILE, zipf)
+    return len(words)
+
+
+def _load_table() -> Optional[ZipfTable]:
+    if not (ZIPF_TABLE_DIR / VOCAB_FILE).exists():
+        logger.warning("No Zipf table in %s; looking words up with wordfreq (run build_zipf_table.py)", ZIPF_TABLE_DIR)
+        return None
+    return ZipfTable.load(ZIPF_TABLE_DIR)
+
+
+models.register("zipf_table", _load_table)
+
+
+@lru_cache(maxsize=ZIPF_OOV_CACHE_SIZE)
+def _zipf_fallback(token: str) -> float:
+    try:
+        return zipf_frequency(token, "en")
+    except Exception:
+        return float("nan")
+
+
+def zipf_frequencies(tokens: List[str]) -> np.ndarray:
+    """
+    Zipf frequency of each token, as ``wordfreq.zipf_frequency(token, "en")``.
+
+    Args:
+        tokens: Lowercase word tokens
+
+    Returns:
+        float64 array, one score per token; NaN where wordfreq could not score it
+    """
+    table = models.get("zipf_table")
+    scores = table.lookup(tokens) if table is not None else np.full(len(tokens), np.nan)
+    for index in np.flatnonzero(np.isnan(scores)):
+        scores[index] = _zipf_fallback(tokens[index])
+    return scores
+
+
+def summarize_zipf_scores(scores: np.ndarray) -> Dict[str, Any]:
+    """
+    Summarizes token Zipf scores in one vectorized pass.
+
+    Percentiles are observed scores (the one at or above each rank), so the
+    median is the upper median of an even number of scores.
+
+    Args:
+        scores: Non-empty array of Zipf scores, one per token
+
+    Returns:
+        dict: mean, min, max, p10/median/p90, rare_count (below RARE_THRESHOLD)
+        and the number of scores in each sophistication band
+    """
+    bands, _ = np.histogram(scores, bins=SOPHISTICATION_EDGES)
+    p10, median, p90 = np.percentile(scores, ZIPF_PERCENTILES, method="higher")
+    return {
+        "mean": float(scores.mean()),
+        "min": float(scores.min()),
+        "max": float(scores.max()),
+        "p10": float(p10),
+        "median": float(median),
+        "p90": float(p90),
+        # Both bands below RARE_THRESHOLD
+        "rare_count": int(bands[0] + bands[1]),
+        "bands": dict(zip(SOPHISTICATION_BANDS, bands.tolist())),
+    }
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
+from analyzers.models import models
 from routes.analyze import router as analyze_router
 from routes import profile
+from services.analysis_executor import shutdown_executor
 
 app = FastAPI()
 
@@ -19,5 +22,25 @@ app.add_middleware(
 def read_root():
     return {"message": "You are now using tonetrace API"}
 
+@app.get("/health")
+def health_check():
+    model_status = models.status()
+    return {"status": "healthy" if model_status["ready"] else "starting", **model_status}
+
+@app.get("/ready")
+def readiness_check():
+    # 503 until spaCy and the tone model are loaded and warmed up
+    model_status = models.status()
+    return JSONResponse(model_status, status_code=200 if model_status["ready"] else 503)
+
+@app.on_event("startup")
+def warm_up_models():
+    # Runs in the background so the port binds immediately
+    models.start_warmup()
+
+@app.on_event("shutdown")
+def shutdown_analyzer_pools():
+    shutdown_executor()
+
 app.include_router(analyze_router, prefix="/api", tags=["analysis"])
 app.include_router(profile.router, prefix="/api", tags=["profile"])
\ No newline at end of file
@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
+from analyzers.models import models
 from routes.analyze_lightweight import router as analyze_router
+from services.analysis_executor import shutdown_executor
 # from routes import profile  # Disabled for lightweight version
 
 app = FastAPI(title="ToneTrace API - Lightweight Version", version="1.0.0")
@@ -26,11 +29,28 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    model_status = models.status()
     return {
-        "status": "healthy",
+        "status": "healthy" if model_status["ready"] else "starting",
         "version": "lightweight",
-        "memory_optimized": True
+        "memory_optimized": True,
+        **model_status
     }
 
+@app.get("/ready")
+def readiness_check():
+    # 503 until every model is loaded and warmed up, so traffic waits for warmup
+    model_status = models.status()
+    return JSONResponse(model_status, status_code=200 if model_status["ready"] else 503)
+
+@app.on_event("startup")
+def warm_up_models():
+    # Runs in the background so the port binds immediately
+    models.start_warmup()
+
+@app.on_event("shutdown")
+def shutdown_analyzer_pools():
+    shutdown_executor()
+
 app.include_router(analyze_router, prefix="/api", tags=["analysis"])
 # app.include_router(profile.router, prefix="/api", tags=["profile"])  # Disabled for lightweight version
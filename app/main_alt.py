@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
+from analyzers.models import models
 from routes import analyze_alt
+from services.analysis_executor import shutdown_executor
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,6 +23,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def warm_up_models():
+    # Runs in the background so the port binds immediately
+    models.start_warmup()
+
+@app.on_event("shutdown")
+def shutdown_analyzer_pools():
+    shutdown_executor()
+
 # Include routers
 app.include_router(analyze_alt.router, prefix="/api/v1", tags=["analysis"])
 
@@ -34,7 +46,17 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "Alternative ToneTrace API is running"}
+    model_status = models.status()
+    return {
+        "status": "healthy" if model_status["ready"] else "starting",
+        "message": "Alternative ToneTrace API is running",
+        **model_status
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    model_status = models.status()
+    return JSONResponse(model_status, status_code=200 if model_status["ready"] else 503)
 
 if __name__ == "__main__":
     import uvicorn
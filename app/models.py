@@ -33,8 +33,15 @@ class Submission(Base):
         index=True,
     )
     text: Mapped[str] = mapped_column(Text, nullable=False)
+    text_hash: Mapped[str | None] = mapped_column(String(64), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Job mode only (NULL for submissions analyzed in the request): the
+    # analyzers the job was asked to run, its status and why it failed
+    requested_analyzers: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    job_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    job_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     student: Mapped["Student"] = relationship("Student", back_populates="submissions")
     results: Mapped[list["AnalysisResult"]] = relationship(
         "AnalysisResult",
@@ -81,3 +88,15 @@ class SubmissionSummary(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     submission: Mapped["Submission"] = relationship("Submission")
+
+class StyleProfileRecord(Base):
+    """A student's style profile (the anomaly baseline) with its running statistics."""
+    __tablename__ = "style_profiles"
+
+    # The caller's student identifier, as sent with each submission
+    student_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    profile: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    total_texts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Incremented on every write; writers that read an older version must reload and retry
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
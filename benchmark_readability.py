@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare the single-pass readability engine with textstat on 1k-50k word
+essays: time to produce every readability count, and whether they agree.
+
+textstat is timed the way the analyzers used it before the engine: one call
+per count (sentences, words, syllables, polysyllables, and difficult words
+at both thresholds). Both sides load their dictionaries before timing.
+
+Usage:
+    python benchmark_readability.py [--runs 5] [--sizes 1000 5000 20000 50000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+SENTENCES = [
+    "The experiment was repeated several times to confirm the findings.",
+    "Each trial produced slightly different numbers, which worried the team at first.",
+    "Notwithstanding considerable methodological heterogeneity, the investigators persisted.",
+    "I think it's fine, but we shouldn't rush.",
+    "Interdisciplinary collaboration substantially improves educational outcomes!",
+    "Why did the results change between Tuesday and Wednesday?",
+]
+
+
+def make_essay(words: int, seed: int = 0) -> str:
+    """Builds an essay of about the given number of words from the sample sentences"""
+    rng = random.Random(seed)
+    parts, count = [], 0
+    while count < words:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        count += len(sentence.split())
+    return " ".join(parts)
+
+
+def textstat_counts(text: str) -> tuple:
+    import textstat
+    return (
+        textstat.sentence_count(text),
+        textstat.lexicon_count(text, removepunct=True),
+        textstat.syllable_count(text),
+        textstat.polysyllabcount(text),
+        textstat.difficult_words(text, syllable_threshold=3, unique=False),
+        textstat.difficult_words(text, syllable_threshold=0, unique=False),
+    )
+
+
+def _median_ms(function, text: str, runs: int) -> float:
+    timings = []
+    for run in range(runs):
+        # Trailing spaces change nothing but make every run a new text, so textstat's per-text caches never hit
+        variant = text + " " * run
+        start = time.perf_counter()
+        function(variant)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per essay size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000], help="Essay sizes in words")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from analyzers.readability_engine import count_readability
+
+    # Load both syllable dictionaries outside the timings
+    count_readability("Warm up.")
+    textstat_counts("Warm up.")
+
+    print(f"{'words':>8}{'textstat_ms':>14}{'engine_ms':>12}{'speedup':>10}{'same':>7}")
+    for size in args.sizes:
+        text = make_essay(size, seed=size)
+        textstat_ms = _median_ms(textstat_counts, text, args.runs)
+        engine_ms = _median_ms(count_readability, text, args.runs)
+        same = tuple(count_readability(text)) == textstat_counts(text)
+        print(f"{size:>8}{textstat_ms:>14.1f}{engine_ms:>12.1f}{textstat_ms / engine_ms:>9.1f}x{'yes' if same else 'NO':>7}")
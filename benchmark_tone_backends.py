@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compare the torch and ONNX Runtime tone backends: load time, memory,
+latency and agreement.
+
+Each backend runs in its own process so peak RSS reflects that backend
+alone. Requires the full requirements for the torch backend and
+``python export_tone_onnx.py`` for the ONNX one.
+
+Usage:
+    python benchmark_tone_backends.py [--runs 50] [--backends torch onnx]
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+BACKENDS = {
+    "torch": "analyzers.tone",
+    "onnx": "analyzers.tone_onnx",
+}
+
+# Name each backend's model is registered under in analyzers.models
+MODEL_NAMES = {
+    "torch": "tone",
+    "onnx": "tone_onnx",
+}
+
+SAMPLE_TEXTS = [
+    "I am thrilled with how this project turned out and proud of the team.",
+    "This is frustrating. Nothing works and I keep running into the same errors.",
+    "The results indicate a moderate correlation between the two variables.",
+    "I'm not sure this is right, but maybe we could try another approach?",
+    # A long essay, so the sentence-window path is measured too
+    " ".join(
+        "The experiment was repeated several times to confirm the findings. "
+        "Each trial produced slightly different numbers, which worried the team at first."
+        for _ in range(60)
+    ),
+]
+
+def run_backend(name: str, runs: int) -> dict:
+    """Loads one backend in this process and measures it"""
+    sys.path.insert(0, str(ROOT))
+    start = time.perf_counter()
+    module = __import__(BACKENDS[name], fromlist=["classify_tone_model"])
+    from analyzers.models import models
+    models.get(MODEL_NAMES[name])  # models load lazily, so load it here to time it
+    load_seconds = time.perf_counter() - start
+
+    module.classify_tone_model(SAMPLE_TEXTS[0])  # warm up
+
+    latencies = {index: [] for index in range(len(SAMPLE_TEXTS))}
+    for _ in range(runs):
+        for index, text in enumerate(SAMPLE_TEXTS):
+            start = time.perf_counter()
+            module.classify_tone_model(text)
+            latencies[index].append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    module.classify_tone_batch(SAMPLE_TEXTS[:4] * 8)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    results = [module.classify_tone_model(text) for text in SAMPLE_TEXTS]
+    return {
+        "backend": name,
+        "load_seconds": round(load_seconds, 2),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "short_p50_ms": round(statistics.median([ms for index in range(4) for ms in latencies[index]]), 2),
+        "short_p95_ms": round(_percentile([ms for index in range(4) for ms in latencies[index]], 95), 2),
+        "long_p50_ms": round(statistics.median(latencies[4]), 2),
+        "batch_32_ms": round(batch_ms, 2),
+        "buckets": [result["bucket"] for result in results],
+        "scores": [
+            {entry["label"]: entry["score"] for entry in result["raw"]["emotion_scores"]}
+            for result in results
+        ],
+    }
+
+def _percentile(values: list, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+def compare(backends: list, runs: int) -> None:
+    """Runs every backend in a subprocess and prints a comparison"""
+    reports = {}
+    for name in backends:
+        print(f"⏱️  Benchmarking {name}...")
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", name, "--runs", str(runs)],
+            capture_output=True, text=True, cwd=ROOT
+        )
+        if completed.returncode != 0:
+            print(f"⚠️  {name} failed:\n{completed.stderr.strip()[-2000:]}")
+            continue
+        reports[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    columns = ["load_seconds", "peak_rss_mb", "short_p50_ms", "short_p95_ms", "long_p50_ms", "batch_32_ms"]
+    print(f"\n{'metric':<14}" + "".join(f"{name:>12}" for name in reports))
+    for column in columns:
+        print(f"{column:<14}" + "".join(f"{reports[name][column]:>12}" for name in reports))
+
+    if {"torch", "onnx"} <= set(reports):
+        torch_report, onnx_report = reports["torch"], reports["onnx"]
+        same_bucket = sum(a == b for a, b in zip(torch_report["buckets"], onnx_report["buckets"]))
+        max_diff = max(
+            abs(torch_scores[label] - onnx_scores.get(label, 0.0))
+            for torch_scores, onnx_scores in zip(torch_report["scores"], onnx_report["scores"])
+            for label in torch_scores
+        )
+        print(f"\n🔍 Same bucket on {same_bucket}/{len(SAMPLE_TEXTS)} texts; largest emotion score difference {max_diff:.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50, help="Timed runs per sample text")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--child", choices=list(BACKENDS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, args.runs)))
+    else:
+        compare(args.backends, args.runs)
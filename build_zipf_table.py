@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Build the memory-mapped English Zipf table used by lexical richness.
+
+Writes every word of wordfreq's English list with its Zipf frequency to
+models/zipf_en/ (vocab.npy and zipf.npy, about 12MB); analyzers/zipf_table.py
+memory-maps them at runtime. Run it once as part of the build:
+
+    python build_zipf_table.py [--output DIR]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="Directory for the table (default: ZIPF_TABLE_DIR or models/zipf_en)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from analyzers.zipf_table import ZIPF_TABLE_DIR, write_zipf_table
+
+    output = args.output or ZIPF_TABLE_DIR
+    print(f"📚 Computing Zipf frequencies into {output}...")
+    start = time.perf_counter()
+    count = write_zipf_table(output)
+    print(f"✅ Wrote {count} words in {time.perf_counter() - start:.1f}s")
@@ -1,3 +1,5 @@
+import os
+
 EMOTION_TO_TONE = {
     "remorse": "apologetic",
     "apology": "apologetic",
@@ -28,4 +30,55 @@ EMOTION_TO_TONE = {
     "confusion": "reflective",
     "realization": "reflective",
     "neutral": "neutral",
-}
\ No newline at end of file
+}
+
+# Version of each analyzer's output. Bump an analyzer's version whenever its
+# results change; cached and stored results for older versions are ignored.
+ANALYZER_VERSIONS = {
+    "formality": "v2",  # v2: reads the real Flesch-Kincaid grade instead of always 0
+    "complexity": "v1",
+    "tone": "v2",  # v2: texts past 512 tokens are classified in sentence windows
+    "sentiment": "v1",
+    "passive_voice": "v1",
+    "lexical_diversity": "v2",  # v2: adds MATTR, MTLD and HD-D
+    "hedging": "v2",  # v2: case-insensitive, so "I think" and "I feel" are found
+    "readability": "v1",
+    "grammar": "v2",  # v2: errors carry the rule name and character offsets
+    "lexical_richness": "v2",  # v2: zipf_distribution adds p10 and p90 scores
+}
+
+# The lightweight and alt tiers swap in their own implementations of some
+# analyzers, so their results are versioned separately from the full tier's.
+ANALYZER_VERSIONS_LIGHTWEIGHT = {
+    **ANALYZER_VERSIONS,
+    **{
+        name: f"{ANALYZER_VERSIONS[name]}-lightweight"
+        for name in ("formality", "complexity", "tone", "passive_voice", "grammar", "lexical_richness")
+    },
+    # r2: tone keywords match whole words ("like" no longer counts inside "likely")
+    "tone": f"{ANALYZER_VERSIONS['tone']}-lightweight-r2",
+}
+
+# Tone inference backend. "onnx" serves the int8-quantized go_emotions model on
+# onnxruntime in every tier (see analyzers/tone_onnx.py); any other value keeps
+# each tier's default (torch in the full tier, keyword rules in the others).
+TONE_BACKEND = os.getenv("TONE_BACKEND", "default")
+TONE_ONNX_VERSION = f"{ANALYZER_VERSIONS['tone']}-onnx-int8"
+
+ANALYZER_VERSIONS_ALT = {
+    **ANALYZER_VERSIONS_LIGHTWEIGHT,
+    **{
+        name: f"{ANALYZER_VERSIONS[name]}-alt"
+        for name in ("formality", "complexity", "passive_voice")
+    },
+}
+
+# Cascade mode for the full tier: serve the lightweight tone, passive voice and
+# grammar analyzers unless their confidence is below these thresholds (or they
+# disagree with the student's profile), and only then run the expensive model.
+CASCADE_ENABLED = os.getenv("ANALYSIS_CASCADE", "0") == "1"
+CASCADE_THRESHOLDS = {
+    "tone": float(os.getenv("CASCADE_THRESHOLD_TONE", 0.1)),
+    "passive_voice": float(os.getenv("CASCADE_THRESHOLD_PASSIVE_VOICE", 0.5)),
+    "grammar": float(os.getenv("CASCADE_THRESHOLD_GRAMMAR", 0.6)),
+}
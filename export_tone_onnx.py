@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Export the go_emotions tone model to ONNX and quantize it to int8.
+
+Run once on a machine with the full requirements (torch, transformers) plus
+onnxruntime; the files it writes are all analyzers/tone_onnx.py needs at
+runtime:
+
+    models/go_emotions_onnx/model.onnx        fp32 export
+    models/go_emotions_onnx/model.int8.onnx   dynamically quantized weights
+    models/go_emotions_onnx/tokenizer.json    fast tokenizer
+    models/go_emotions_onnx/config.json       labels and pad token
+
+Usage:
+    python export_tone_onnx.py [--output DIR] [--opset 14]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "models" / "go_emotions_onnx"
+
+def export(output: Path, opset: int) -> None:
+    """Exports the model, tokenizer and config, then writes the int8 model"""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from analyzers.tone_base import TONE_MODEL_NAME
+
+    output.mkdir(parents=True, exist_ok=True)
+
+    print(f"📥 Loading {TONE_MODEL_NAME}...")
+    tokenizer = AutoTokenizer.from_pretrained(TONE_MODEL_NAME)
+    model = AutoModelForSequenceClassification.from_pretrained(TONE_MODEL_NAME)
+    model.eval()
+
+    tokenizer.save_pretrained(output)
+    model.config.to_json_file(output / "config.json")
+
+    fp32_path = output / "model.onnx"
+    int8_path = output / "model.int8.onnx"
+
+    print("📦 Exporting to ONNX...")
+    sample = tokenizer(["An example sentence.", "Another one."], padding=True, return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=opset
+        )
+
+    print("🗜️  Quantizing weights to int8...")
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+
+    for path in (fp32_path, int8_path):
+        print(f"✅ {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Directory for the model files")
+    parser.add_argument("--opset", type=int, default=14, help="ONNX opset version")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    export(args.output, args.opset)
@@ -1,64 +1,342 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import asyncio
 import time
-from analyzers.style_metrics import compute_formality, compute_complexity
-from analyzers.tone import classify_tone_model
-from analyzers.sentiment import analyze_sentiment
-from analyzers.passive_voice import detect_passive_sentences
-from analyzers.lexical import compute_lexical_diversity
-from analyzers.lexical_richness import analyze_lexical_richness
-from analyzers.hedging import detect_hedging
+from analyzers import result_status
 from analyzers.anomaly import detect_anomaly
 from analyzers.grammar import analyze_grammar
+from analyzers.lexical_richness import analyze_lexical_richness
 from analyzers.readability import analyze_readability, get_readability_interpretation
+from analyzers.document import parse_documents, LazyDocument
+from analyzers.registry import registry, tone_backend
+from analyzers.cascade import CascadeAnalyzer, cascade_stats
+from services.analysis_executor import get_executor
 from style_profile_module import StyleProfile
-from services.database import get_student_profile, save_student_profile, create_default_profile
-from services.analysis_storage import store_analysis_results
+from services.database import get_student_profile, update_student_profile, create_default_profile
+from services.analysis_storage import (
+    store_analysis_results, store_batch_analysis_results,
+    create_submission, store_analysis_result, get_stored_job, set_job_status
+)
+from services.job_queue import AnalysisJob, AnalysisJobQueue, QueueFullError, JOB_COMPLETED, JOB_QUEUED
+from services.result_cache import ResultCache, hash_text
+from services.streaming import stream_analysis_events, streaming_response
 
 router = APIRouter()
 
+# Results are reused from memory first, then from stored analyses of the same text
+result_cache = ResultCache()
+
+# Seconds clients are asked to wait before resubmitting to a full job queue
+JOB_RETRY_AFTER_SECONDS = 5
+
 class AnalyzeRequest(BaseModel):
     text: str
     student_id: str = "default"  # Default student ID for now
+    analyzers: Optional[List[str]] = None  # Subset of analyzers to run (default: all)
+
+class BatchAnalyzeRequest(BaseModel):
+    submissions: List[AnalyzeRequest]
+    analyzers: Optional[List[str]] = None  # Subset of analyzers to run for every submission
 
 @router.post("/analyze")
-async def analyze_text(payload: AnalyzeRequest):
+async def analyze_text(
+    payload: AnalyzeRequest,
+    mode: str = Query("sync", pattern="^(sync|job)$")
+):
+    """
+    Analyze a submission.
+    
+    With ?mode=job the submission is stored and queued for the background
+    workers, and the response (202) only carries the job ID; poll
+    GET /analyze/jobs/{job_id} for status and partial results. A full queue
+    answers 503.
+    """
     text = payload.text
     student_id = payload.student_id
+    analyzers = _select_analyzers(payload.analyzers)
+    
+    if mode == "job":
+        return await _submit_job(text, student_id, analyzers)
 
     # Run all analyses with timing
     start_time = time.time()
     
-    formality_result = compute_formality(text)
-    complexity_result = compute_complexity(text)
-    tone_result = classify_tone_model(text)
-    sentiment_result = analyze_sentiment(text)
-    passive_analysis = detect_passive_sentences(text)
-    lexical_diversity = compute_lexical_diversity(text)
-    hedging_analysis = detect_hedging(text)
-    readability_analysis = analyze_readability(text)
-    grammar_analysis = analyze_grammar(text)
-    lexical_richness_analysis = analyze_lexical_richness(text)
+    # Only the shared inputs the selected analyzers need are built (no spaCy parse for tone + sentiment)
+    results = await get_executor().run_pipeline(
+        registry, text, analyzers, cache=result_cache, provided=await _provided_artifacts(student_id)
+    )
     
     # Add timing information to results
     total_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
     
-    # Prepare all analysis results for storage
-    all_results = {
-        "formality": formality_result,
-        "complexity": complexity_result,
-        "tone": tone_result,
-        "sentiment": sentiment_result,
-        "passive_voice": passive_analysis,
-        "lexical_diversity": lexical_diversity,
-        "hedging": hedging_analysis,
-        "readability": readability_analysis,
-        "grammar": grammar_analysis,
-        "lexical_richness": lexical_richness_analysis
+    # Store all analysis results in the database
+    submission_id = await store_analysis_results(text, student_id, results, versions=registry.versions)
+    
+    anomaly_result = await _update_profile_and_detect_anomaly(student_id, results)
+    
+    return _build_response(submission_id, total_time, results, anomaly_result)
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    payload: AnalyzeRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$")
+):
+    """
+    Streams each analyzer's standardized response as soon as it completes
+    (NDJSON by default, or Server-Sent Events with ?format=sse).
+    
+    Sentiment, hedging and lexical diversity arrive while spaCy and the tone
+    model are still running; the final summary event carries the submission
+    ID, total time and anomaly result once everything is stored.
+    """
+    analyzers = _select_analyzers(payload.analyzers)
+    
+    async def finalize(results: Dict[str, Any], total_time: int) -> Dict[str, Any]:
+        submission_id = await store_analysis_results(payload.text, payload.student_id, results, versions=registry.versions)
+        anomaly_result = await _update_profile_and_detect_anomaly(payload.student_id, results)
+        return _build_response(submission_id, total_time, {}, anomaly_result)
+    
+    results = get_executor().stream_pipeline(
+        registry, payload.text, analyzers, cache=result_cache, provided=await _provided_artifacts(payload.student_id)
+    )
+    return streaming_response(stream_analysis_events(results, finalize, stream_format), stream_format)
+
+@router.post("/analyze/batch")
+async def analyze_batch(payload: BatchAnalyzeRequest):
+    """
+    Analyze a whole class's submissions in one request.
+    
+    spaCy parses every text in one ``nlp.pipe`` pass and the emotion model
+    classifies tone in batched forward passes; the remaining analyzers run
+    concurrently per submission. Texts whose results are already cached skip
+    parsing and inference. All submissions are stored in one transaction.
+    
+    Returns:
+        dict: One result per submission, in the same format as /analyze
+    """
+    start_time = time.time()
+    analyzers = _select_analyzers(payload.analyzers)
+    # Cascade results depend on the student's profile and are never cached
+    versions = registry.cache_versions(analyzers)
+    texts = [submission.text for submission in payload.submissions]
+    
+    cached = await asyncio.gather(*(
+        result_cache.get_many(hash_text(text), versions) for text in texts
+    ))
+    
+    # Only parse texts with uncached Doc-based analyzers, and only classify texts with uncached tone
+    parse_indices = [
+        index for index, results in enumerate(cached)
+        if "doc" in registry.artifact_plan(name for name in analyzers if name not in results)
+    ]
+    # A tone cascade decides per text whether the model runs, so it is not batch-classified
+    batch_tone = "tone" in analyzers and not isinstance(registry.analyzers["tone"].func, CascadeAnalyzer)
+    tone_indices = [index for index, results in enumerate(cached) if batch_tone and "tone" not in results]
+    
+    # Batched NLP inference across the remaining submissions
+    executor = get_executor()
+    parsed, classified = await asyncio.gather(
+        executor.run("parse", parse_documents, [texts[index] for index in parse_indices]),
+        executor.run("tone", tone_backend.classify_tone_batch, [texts[index] for index in tone_indices])
+    )
+    docs = dict(zip(parse_indices, parsed))
+    tone_results = dict(zip(tone_indices, classified))
+    provided = await asyncio.gather(*(
+        _provided_artifacts(payload.submissions[index].student_id, _parsed_artifacts(text, docs.get(index)))
+        for index, text in enumerate(texts)
+    ))
+    
+    all_results = await asyncio.gather(*(
+        executor.run_pipeline(
+            registry, text, analyzers,
+            cache=result_cache,
+            cached=cached[index],
+            provided=provided[index],
+            precomputed={"tone": tone_results[index]} if index in tone_results else None
+        )
+        for index, text in enumerate(texts)
+    ))
+    
+    total_time = int((time.time() - start_time) * 1000)
+    
+    # Store every submission in a single transaction
+    submission_ids = await store_batch_analysis_results([
+        (submission.text, submission.student_id, results)
+        for submission, results in zip(payload.submissions, all_results)
+    ], versions=registry.versions)
+    
+    # Profiles are updated in submission order so baselines evolve as with single requests
+    responses = []
+    for submission, submission_id, results in zip(payload.submissions, submission_ids, all_results):
+        anomaly_result = await _update_profile_and_detect_anomaly(submission.student_id, results)
+        responses.append(_build_response(submission_id, total_time, results, anomaly_result))
+    
+    return {
+        "total_analysis_time_ms": total_time,
+        "count": len(responses),
+        "results": responses
     }
+
+@router.get("/analyze/jobs")
+def job_queue_stats():
+    """
+    Returns the analysis job queue depth and counters.
+    """
+    return job_queue.stats()
+
+@router.get("/analyze/jobs/{job_id}")
+async def get_job(job_id: int):
+    """
+    Report an analysis job's status and the results completed so far.
     
-    # Store all analysis results in the database
-    submission_id = await store_analysis_results(text, student_id, all_results)
+    Jobs finished or queued on another worker are looked up in the database
+    (the job ID is the submission ID), which records the analyzers each job
+    was asked to run and its last status.
+    """
+    job = job_queue.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    
+    stored = await get_stored_job(job_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    response = {
+        "job_id": job_id,
+        # Submissions analyzed within the request carry no job status; their results were stored complete
+        "status": stored["status"] or JOB_COMPLETED,
+        "analyzers": stored["analyzers"],
+        "completed_analyzers": list(stored["results"]),
+        "results": {name: row["result"] for name, row in stored["results"].items()}
+    }
+    if stored["error"]:
+        response["error"] = stored["error"]
+    return response
+
+@router.get("/analyze/batching")
+def batching_stats():
+    """
+    Returns the tone micro-batcher's settings and its queue-time and
+    batch-size histograms.
+    """
+    return tone_backend.tone_batcher.stats()
+
+@router.get("/analyze/cascade")
+def cascade_stats_endpoint():
+    """
+    Returns how often each cascaded analyzer was served by the cheap
+    analyzer and why the others escalated (empty unless ANALYSIS_CASCADE=1).
+    """
+    return cascade_stats(registry)
+
+@router.get("/analyze/cache")
+def cache_stats():
+    """
+    Returns analysis result cache hit and miss counters.
+    """
+    return result_cache.stats()
+
+def _parsed_artifacts(text: str, doc) -> Optional[Dict[str, Any]]:
+    """A batch-parsed doc as artifacts, shared with cascades that escalate."""
+    if doc is None:
+        return None
+    if "lazy_doc" in registry.artifacts:
+        return {"doc": doc, "lazy_doc": LazyDocument(text, doc)}
+    return {"doc": doc}
+
+async def _provided_artifacts(student_id: str, provided: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Adds the student's baseline profile for cascade mode, where the cheap
+    analyzers escalate when they disagree with it.
+    """
+    if "profile" not in registry.artifacts:
+        return provided
+    return {**(provided or {}), "profile": await get_student_profile(student_id)}
+
+def _select_analyzers(names: Optional[List[str]]) -> List[str]:
+    """Validates an analyzer selection, rejecting unknown names with a 400."""
+    try:
+        return registry.select(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _submit_job(text: str, student_id: str, analyzers: Optional[List[str]]) -> JSONResponse:
+    """Stores the submission and queues it; the submission ID is the job ID."""
+    # Checked before storing so a saturated service does not accumulate orphan submissions
+    if job_queue.full():
+        _raise_queue_full()
+    
+    submission_id = await create_submission(text, student_id, registry.select(analyzers), JOB_QUEUED)
+    if submission_id is None:
+        raise HTTPException(status_code=503, detail="Could not store submission")
+    
+    try:
+        job = job_queue.submit(AnalysisJob(submission_id, text, student_id, analyzers))
+    except QueueFullError:
+        _raise_queue_full()
+    
+    return JSONResponse(status_code=202, content={
+        "job_id": job.job_id,
+        "submission_id": submission_id,
+        "status": job.status,
+        "queue_depth": job_queue.depth
+    })
+
+def _raise_queue_full():
+    raise HTTPException(
+        status_code=503,
+        detail={"error": "Analysis queue is full", **job_queue.stats()},
+        headers={"Retry-After": str(JOB_RETRY_AFTER_SECONDS)}
+    )
+
+async def _run_job(job: AnalysisJob) -> None:
+    """
+    Runs one queued analysis, storing each analyzer's result as soon as it
+    completes, then updates the student's profile.
+    """
+    start_time = time.time()
+    results = get_executor().stream_pipeline(
+        registry, job.text, job.analyzers, cache=result_cache, provided=await _provided_artifacts(job.student_id)
+    )
+    async for name, result in results:
+        job.results[name] = result
+        await store_analysis_result(job.job_id, name, result, registry.versions[name])
+    
+    total_time = int((time.time() - start_time) * 1000)
+    anomaly_result = await _update_profile_and_detect_anomaly(job.student_id, job.results)
+    job.summary = _build_response(job.job_id, total_time, {}, anomaly_result)
+
+async def _record_job_status(job: AnalysisJob) -> None:
+    """Records a job's status with its submission, so any worker can report it."""
+    await set_job_status(job.job_id, job.status, job.error)
+
+# Background workers for ?mode=job; the queue is bounded for backpressure
+job_queue = AnalysisJobQueue(_run_job, on_status=_record_job_status)
+
+async def _update_profile_and_detect_anomaly(student_id: str, results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Builds the style profile for one submission, scores it against the
+    student's baseline and adds it to the baseline's running statistics.
+    
+    Returns:
+        Anomaly detection result, or None when only some analyzers ran or
+        one timed out (a partial profile would corrupt the baseline)
+    """
+    if set(results) != set(registry.names) or any(result_status(r) != "ok" for r in results.values()):
+        return None
+    
+    formality_result = results["formality"]
+    complexity_result = results["complexity"]
+    tone_result = results["tone"]
+    sentiment_result = results["sentiment"]
+    passive_analysis = results["passive_voice"]
+    lexical_diversity = results["lexical_diversity"]
+    hedging_analysis = results["hedging"]
+    readability_analysis = results["readability"]
+    grammar_analysis = results["grammar"]
+    lexical_richness_analysis = results["lexical_richness"]
     
     # Create current style profile from analysis results
     current_profile = StyleProfile()
@@ -72,56 +350,50 @@ async def analyze_text(payload: AnalyzeRequest):
             "sentence_length": complexity_result.get("details", {}).get("average_sentence_length", 0),
             "lexical_density": complexity_result.get("details", {}).get("lexical_density", 0)
         },
-        "passive_voice": {"passive_sentence_ratio": passive_analysis.get("score", 0)},
-        "lexical_diversity": lexical_diversity.get("score", 0),
-        "hedging_count": hedging_analysis.get("score", 0),
+        "passive_voice": {"score": passive_analysis.get("score", 0)},
+        "lexical_diversity": {"score": lexical_diversity.get("score", 0)},
+        "hedging": {"score": hedging_analysis.get("score", 0)},
         "readability": {
-            "flesch_kincaid_grade": readability_analysis.get("flesch_kincaid_grade", 0),
-            "smog_index": readability_analysis.get("smog_index", 0),
-            "gunning_fog": readability_analysis.get("gunning_fog", 0),
-            "dale_chall_score": readability_analysis.get("dale_chall_score", 0)
+            metric: readability_analysis.get("raw", {}).get(metric, 0)
+            for metric in ("flesch_kincaid_grade", "smog_index", "gunning_fog", "dale_chall_score")
         },
         "grammar": {
-            "num_errors": grammar_analysis.get("raw", {}).get("num_errors", 0),
+            # A cascade served by the lightweight grammar analyzer reports issue_count
+            "num_errors": grammar_analysis.get("raw", {}).get("num_errors", grammar_analysis.get("raw", {}).get("issue_count", 0)),
             "error": grammar_analysis.get("raw", {}).get("errors", [])
         },
-        "lexical_richness": lexical_richness_analysis.get("score", 0)
+        "lexical_richness": {"score": lexical_richness_analysis.get("score", 0)}
     }
     
     # Update the current profile with this analysis
     from style_profile_module.update import update_style_profile
     current_profile = update_style_profile(current_profile, analysis_data)
     
-    # Get baseline profile from database
-    baseline_profile = get_student_profile(student_id)
-    if not baseline_profile:
-        # Create default profile if none exists
-        baseline_profile = create_default_profile()
-        save_student_profile(student_id, baseline_profile)
-    
-    # Run anomaly detection
-    anomaly_result = detect_anomaly(current_profile, baseline_profile)
-    
-    # Save updated profile to database
-    save_student_profile(student_id, current_profile)
+    # Add this submission to the baseline's running statistics in one versioned upsert
+    # (the baseline is read from the profile cache, or the database on a miss)
+    update = await update_student_profile(
+        student_id, lambda baseline: update_style_profile(baseline or create_default_profile(), analysis_data)
+    )
+    if update is None:
+        return None
     
-    return {
+    # Score the submission against the baseline as it was before it (default for a new student)
+    return detect_anomaly(current_profile, update.previous or create_default_profile())
+
+def _build_response(submission_id, total_time: int, results: Dict[str, Any], anomaly_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds the /analyze response for one submission (only the analyzers that ran)."""
+    response = {
         "submission_id": submission_id,
         "total_analysis_time_ms": total_time,
-        "formality": formality_result,
-        "complexity": complexity_result,
-        "tone": tone_result,
-        "sentiment": sentiment_result,
-        "passive_voice": passive_analysis,
-        "lexical_diversity": lexical_diversity,
-        "hedging": hedging_analysis,
-        "readability": readability_analysis,
-        "grammar": grammar_analysis,
-        "lexical_richness": lexical_richness_analysis,
-        "anomaly": anomaly_result["anomaly"],
-        "anomaly_reasons": anomaly_result["anomaly_reasons"],
-        "anomaly_details": anomaly_result["details"]
+        **results
     }
+    if anomaly_result is not None:
+        response.update({
+            "anomaly": anomaly_result["anomaly"],
+            "anomaly_reasons": anomaly_result["anomaly_reasons"],
+            "anomaly_details": anomaly_result["details"]
+        })
+    return response
 
 
 class GrammarInput(BaseModel):
@@ -1,90 +1,152 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import asyncio
 import time
-from analyzers.style_metrics_lightweight import compute_formality, compute_complexity
-from analyzers.tone_lightweight import classify_tone_model
-from analyzers.sentiment import analyze_sentiment
-from analyzers.passive_voice_lightweight import detect_passive_sentences
-from analyzers.lexical import compute_lexical_diversity
-from analyzers.lexical_richness_lightweight import analyze_lexical_richness
-from analyzers.hedging import detect_hedging
-from analyzers.grammar_lightweight import analyze_grammar
-from analyzers.readability import analyze_readability
+from analyzers.registry_lightweight import registry
+from analyzers.sentence_cache import sentence_cache
+from services.analysis_executor import get_executor
+from services.result_cache import ResultCache
+from services.streaming import stream_analysis_events, streaming_response
 
 router = APIRouter()
 
+# The lightweight tier runs without a database, so only the in-memory tier is used
+result_cache = ResultCache(use_database=False)
+
 class AnalysisRequest(BaseModel):
     text: str
     student_id: str = None
+    analyzers: Optional[List[str]] = None  # Subset of analyzers to run (default: all)
+
+class BatchAnalysisRequest(BaseModel):
+    submissions: List[AnalysisRequest]
+    analyzers: Optional[List[str]] = None  # Subset of analyzers to run for every submission
 
 @router.post("/analyze")
-def analyze_text(request: AnalysisRequest):
+async def analyze_text(request: AnalysisRequest):
     """
     Analyzes student writing using lightweight analyzers optimized for Render free tier.
     Returns the same format as the regular analyze endpoint for frontend compatibility.
     """
     start_time = time.time()
+    analyzers = _select_analyzers(request.analyzers)
     
     try:
-        # Run all analyzers
-        formality_result = compute_formality(request.text)
-        complexity_result = compute_complexity(request.text)
-        tone_result = classify_tone_model(request.text)
-        sentiment_result = analyze_sentiment(request.text)
-        passive_analysis = detect_passive_sentences(request.text)
-        lexical_diversity = compute_lexical_diversity(request.text)
-        lexical_richness_analysis = analyze_lexical_richness(request.text)
-        hedging_analysis = detect_hedging(request.text)
-        grammar_analysis = analyze_grammar(request.text)
-        readability_analysis = analyze_readability(request.text)
-        
-        # Create a simple anomaly detection (lightweight version)
-        # For now, return no anomaly to avoid numpy dependency
-        anomaly_result = {
-            "anomaly": 0.0,
-            "anomaly_reasons": [],
-            "details": {"message": "Anomaly detection disabled in lightweight mode"}
-        }
+        results = await _run_analyzers(request.text, analyzers)
         
         # Add timing information to results
         total_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
         
         # Return the same format as the regular analyze endpoint
-        return {
-            "submission_id": f"manual_{int(time.time())}",  # Simple ID for manual analysis
-            "total_analysis_time_ms": total_time,
-            "formality": formality_result,
-            "complexity": complexity_result,
-            "tone": tone_result,
-            "sentiment": sentiment_result,
-            "passive_voice": passive_analysis,
-            "lexical_diversity": lexical_diversity,
-            "hedging": hedging_analysis,
-            "readability": readability_analysis,
-            "grammar": grammar_analysis,
-            "lexical_richness": lexical_richness_analysis,
-            "anomaly": anomaly_result["anomaly"],
-            "anomaly_reasons": anomaly_result["anomaly_reasons"],
-            "anomaly_details": anomaly_result["details"]
-        }
+        return _build_response(f"manual_{int(time.time())}", total_time, results)  # Simple ID for manual analysis
         
     except Exception as e:
         # Return error in the same format
-        return {
-            "error": str(e),
-            "submission_id": f"error_{int(time.time())}",
-            "total_analysis_time_ms": int((time.time() - start_time) * 1000),
-            "formality": {"score": 0, "bucket": "error", "error": str(e)},
-            "complexity": {"score": 0, "bucket": "error", "error": str(e)},
-            "tone": {"score": 0, "bucket": "error", "error": str(e)},
-            "sentiment": {"score": 0, "bucket": "error", "error": str(e)},
-            "passive_voice": {"score": 0, "bucket": "error", "error": str(e)},
-            "lexical_diversity": {"score": 0, "bucket": "error", "error": str(e)},
-            "hedging": {"score": 0, "bucket": "error", "error": str(e)},
-            "readability": {"score": 0, "bucket": "error", "error": str(e)},
-            "grammar": {"score": 0, "bucket": "error", "error": str(e)},
-            "lexical_richness": {"score": 0, "bucket": "error", "error": str(e)},
-            "anomaly": 0.0,
-            "anomaly_reasons": [f"Analysis failed: {str(e)}"],
-            "anomaly_details": {"error": str(e)}
-        }
+        return _error_response(e, int((time.time() - start_time) * 1000))
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    request: AnalysisRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$")
+):
+    """
+    Streams each analyzer's standardized response as soon as it completes
+    (NDJSON by default, or Server-Sent Events with ?format=sse), followed by a
+    summary event with the anomaly result and total time.
+    """
+    analyzers = _select_analyzers(request.analyzers)
+    
+    async def finalize(results: Dict[str, Any], total_time: int) -> Dict[str, Any]:
+        return _build_response(f"manual_{int(time.time())}", total_time, {})
+    
+    results = get_executor().stream_pipeline(registry, request.text, analyzers, cache=result_cache)
+    return streaming_response(stream_analysis_events(results, finalize, stream_format), stream_format)
+
+@router.post("/analyze/batch")
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    Analyzes a whole class's submissions in one request.
+    Submissions are analyzed concurrently; a failure in one submission is
+    reported in that submission's result without failing the batch.
+    """
+    start_time = time.time()
+    analyzers = _select_analyzers(request.analyzers)
+    
+    all_results = await asyncio.gather(
+        *(_run_analyzers(submission.text, analyzers) for submission in request.submissions),
+        return_exceptions=True
+    )
+    
+    total_time = int((time.time() - start_time) * 1000)
+    
+    responses = []
+    for index, results in enumerate(all_results):
+        if isinstance(results, Exception):
+            responses.append(_error_response(results, total_time))
+        else:
+            responses.append(_build_response(f"manual_{int(time.time())}_{index}", total_time, results))
+    
+    return {
+        "total_analysis_time_ms": total_time,
+        "count": len(responses),
+        "results": responses
+    }
+
+@router.get("/analyze/cache")
+def cache_stats():
+    """
+    Returns analysis result cache hit and miss counters, including the
+    per-sentence cache used for revised drafts (this process only).
+    """
+    return {**result_cache.stats(), "sentences": sentence_cache.stats()}
+
+def _select_analyzers(names: Optional[List[str]]) -> List[str]:
+    """Validates an analyzer selection, rejecting unknown names with a 400."""
+    try:
+        return registry.select(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _run_analyzers(text: str, analyzers: List[str]) -> Dict[str, Any]:
+    """
+    Runs the selected lightweight analyzers on one text, reusing cached results.
+    Only the shared inputs (sentences, POS tags, text statistics) the selection
+    needs are computed; the rule-based grammar and passive voice heuristics hold
+    the GIL, so they go to the process pool.
+    
+    Returns:
+        Mapping of analyzer name to standardized result
+    """
+    return await get_executor().run_pipeline(registry, text, analyzers, cache=result_cache)
+
+def _build_response(submission_id: str, total_time: int, results: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds the /analyze response for one text (only the analyzers that ran)."""
+    # Create a simple anomaly detection (lightweight version)
+    # For now, return no anomaly to avoid numpy dependency
+    anomaly_result = {
+        "anomaly": 0.0,
+        "anomaly_reasons": [],
+        "details": {"message": "Anomaly detection disabled in lightweight mode"}
+    }
+    
+    return {
+        "submission_id": submission_id,
+        "total_analysis_time_ms": total_time,
+        **results,
+        "anomaly": anomaly_result["anomaly"],
+        "anomaly_reasons": anomaly_result["anomaly_reasons"],
+        "anomaly_details": anomaly_result["details"]
+    }
+
+def _error_response(e: Exception, total_time: int) -> Dict[str, Any]:
+    """Builds the /analyze error response, in the same format as a successful one."""
+    return {
+        "error": str(e),
+        "submission_id": f"error_{int(time.time())}",
+        "total_analysis_time_ms": total_time,
+        **{name: {"score": 0, "bucket": "error", "error": str(e)} for name in registry.names},
+        "anomaly": 0.0,
+        "anomaly_reasons": [f"Analysis failed: {str(e)}"],
+        "anomaly_details": {"error": str(e)}
+    }
@@ -1,64 +1,102 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
 import time
-from analyzers.style_metrics_alt import compute_formality, compute_complexity
-from analyzers.tone_lightweight import classify_tone_model
-from analyzers.sentiment import analyze_sentiment
-from analyzers.passive_voice_alt import detect_passive_sentences
-from analyzers.lexical import compute_lexical_diversity
-from analyzers.lexical_richness_lightweight import analyze_lexical_richness
-from analyzers.hedging import detect_hedging
+from analyzers import result_status
 from analyzers.anomaly import detect_anomaly
-from analyzers.grammar_lightweight import analyze_grammar
-from analyzers.readability import analyze_readability, get_readability_interpretation
+from analyzers.readability import get_readability_interpretation
+from analyzers.registry_alt import registry
+from services.analysis_executor import get_executor
 from style_profile_module import StyleProfile
 from services.database import get_student_profile, save_student_profile, create_default_profile
 from services.analysis_storage import store_analysis_results
+from services.result_cache import ResultCache
+from services.streaming import stream_analysis_events, streaming_response
 
 router = APIRouter()
 
+# Results are reused from memory first, then from stored analyses of the same text
+result_cache = ResultCache()
+
 class AnalyzeRequest(BaseModel):
     text: str
     student_id: str = "default"  # Default student ID for now
+    analyzers: Optional[List[str]] = None  # Subset of analyzers to run (default: all)
 
 @router.post("/analyze")
 async def analyze_text(payload: AnalyzeRequest):
     text = payload.text
     student_id = payload.student_id
+    analyzers = _select_analyzers(payload.analyzers)
 
     # Run all analyses with timing
     start_time = time.time()
     
-    formality_result = compute_formality(text)
-    complexity_result = compute_complexity(text)
-    tone_result = classify_tone_model(text)
-    sentiment_result = analyze_sentiment(text)
-    passive_analysis = detect_passive_sentences(text)
-    lexical_diversity = compute_lexical_diversity(text)
-    hedging_analysis = detect_hedging(text)
-    readability_analysis = analyze_readability(text)
-    grammar_analysis = analyze_grammar(text)
-    lexical_richness_analysis = analyze_lexical_richness(text)
+    # Run the selected analyzers, reusing cached results and building only the
+    # shared inputs they need; the rule-based grammar and passive voice
+    # heuristics go to the process pool
+    all_results = await get_executor().run_pipeline(registry, text, analyzers, cache=result_cache)
     
     # Add timing information to results
     total_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
     
-    # Prepare all analysis results for storage
-    all_results = {
-        "formality": formality_result,
-        "complexity": complexity_result,
-        "tone": tone_result,
-        "sentiment": sentiment_result,
-        "passive_voice": passive_analysis,
-        "lexical_diversity": lexical_diversity,
-        "hedging": hedging_analysis,
-        "readability": readability_analysis,
-        "grammar": grammar_analysis,
-        "lexical_richness": lexical_richness_analysis
-    }
+    return await _store_and_build_response(text, student_id, all_results, total_time)
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    payload: AnalyzeRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$")
+):
+    """
+    Streams each analyzer's standardized response as soon as it completes
+    (NDJSON by default, or Server-Sent Events with ?format=sse), followed by a
+    summary event with the submission ID, total time and anomaly result.
+    """
+    analyzers = _select_analyzers(payload.analyzers)
     
+    async def finalize(results: Dict[str, Any], total_time: int) -> Dict[str, Any]:
+        response = await _store_and_build_response(payload.text, payload.student_id, results, total_time)
+        return {key: value for key, value in response.items() if key not in results}
+    
+    results = get_executor().stream_pipeline(registry, payload.text, analyzers, cache=result_cache)
+    return streaming_response(stream_analysis_events(results, finalize, stream_format), stream_format)
+
+def _select_analyzers(names: Optional[List[str]]) -> List[str]:
+    """Validates an analyzer selection, rejecting unknown names with a 400."""
+    try:
+        return registry.select(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _store_and_build_response(text: str, student_id: str, all_results: Dict[str, Any], total_time: int) -> Dict[str, Any]:
+    """
+    Stores the results, updates the student's profile and builds the /analyze response.
+    """
     # Store all analysis results in the database
-    submission_id = await store_analysis_results(text, student_id, all_results)
+    submission_id = await store_analysis_results(text, student_id, all_results, versions=registry.versions)
+    
+    # Prepare final response
+    response = {
+        "submission_id": submission_id,
+        "analysis_time_ms": total_time,
+        **all_results
+    }
+    
+    # A partial selection or a timed-out analyzer would corrupt the student's baseline,
+    # so only complete runs update it
+    if set(all_results) != set(registry.names) or any(result_status(r) != "ok" for r in all_results.values()):
+        return response
+    
+    formality_result = all_results["formality"]
+    complexity_result = all_results["complexity"]
+    tone_result = all_results["tone"]
+    sentiment_result = all_results["sentiment"]
+    passive_analysis = all_results["passive_voice"]
+    lexical_diversity = all_results["lexical_diversity"]
+    hedging_analysis = all_results["hedging"]
+    readability_analysis = all_results["readability"]
+    grammar_analysis = all_results["grammar"]
+    lexical_richness_analysis = all_results["lexical_richness"]
     
     # Create current style profile from analysis results
     current_profile = StyleProfile()
@@ -91,27 +129,21 @@ async def analyze_text(payload: AnalyzeRequest):
     # Detect anomalies
     anomaly_result = detect_anomaly(student_profile, current_profile)
     
-    # Prepare final response
-    response = {
-        "submission_id": submission_id,
-        "analysis_time_ms": total_time,
-        "formality": formality_result,
-        "complexity": complexity_result,
-        "tone": tone_result,
-        "sentiment": sentiment_result,
-        "passive_voice": passive_analysis,
-        "lexical_diversity": lexical_diversity,
-        "hedging": hedging_analysis,
-        "readability": readability_analysis,
-        "grammar": grammar_analysis,
-        "lexical_richness": lexical_richness_analysis,
+    response.update({
         "anomaly": anomaly_result.get("is_anomaly", False),
         "anomaly_reasons": anomaly_result.get("reasons", []),
         "anomaly_details": anomaly_result.get("details", {})
-    }
+    })
     
     return response
 
+@router.get("/analyze/cache")
+def cache_stats():
+    """
+    Returns analysis result cache hit and miss counters.
+    """
+    return result_cache.stats()
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "message": "Alternative analyzer service is running"}
@@ -18,8 +18,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _profile_payload(profile: StyleProfile) -> Dict[str, Any]:
+    """The profile as the API reports it: counts and the averages derived from its feature vector."""
+    stored = profile.to_dict()
+    stored.pop("features")
+    return {**stored, **profile.averages()}
+
 @router.get("/profile/{student_id}")
-def get_student_style_profile(student_id: str) -> Dict[str, Any]:
+async def get_student_style_profile(student_id: str) -> Dict[str, Any]:
     """
     Get a student's style profile by their student ID.
     
@@ -33,7 +39,7 @@ def get_student_style_profile(student_id: str) -> Dict[str, Any]:
     
     try:
         # Try to get the student's profile from the database
-        profile = get_student_profile(student_id)
+        profile = await get_student_profile(student_id)
         
         if profile is None:
             # Create a default profile if none exists
@@ -42,7 +48,7 @@ def get_student_style_profile(student_id: str) -> Dict[str, Any]:
             
             return {
                 "student_id": student_id,
-                "profile": profile.to_dict(),
+                "profile": _profile_payload(profile),
                 "message": "Default profile created - no existing profile found",
                 "is_default": True
             }
@@ -51,7 +57,7 @@ def get_student_style_profile(student_id: str) -> Dict[str, Any]:
         logger.info(f"Returning existing profile for student {student_id}")
         return {
             "student_id": student_id,
-            "profile": profile.to_dict(),
+            "profile": _profile_payload(profile),
             "message": "Profile retrieved successfully",
             "is_default": False
         }
@@ -1,3 +1,3 @@
-from .database import get_student_profile, save_student_profile, create_default_profile, profile_exists
+from .database import get_student_profile, save_student_profile, update_student_profile, create_default_profile, profile_exists
 
-__all__ = ['get_student_profile', 'save_student_profile', 'create_default_profile', 'profile_exists'] 
\ No newline at end of file
+__all__ = ['get_student_profile', 'save_student_profile', 'update_student_profile', 'create_default_profile', 'profile_exists'] 
\ No newline at end of file
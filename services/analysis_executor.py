@@ -0,0 +1,422 @@
+"""
+Concurrent execution of independent analyzers for a single request.
+
+Analyzers that spend their time inside native code that releases the GIL
+(spaCy, torch inference, textstat's cached counts) run on a shared thread
+pool. Pure-Python heuristics that hold the GIL (the lightweight grammar and
+passive voice rules) can be sent to a process pool instead, so they do not
+serialize behind each other. The pool is off by default: each worker process
+re-imports NLTK, numpy and the lexicons and loads its own models, which the
+512MB instances cannot afford; set ANALYZER_PROCESS_WORKERS on larger ones.
+
+Tone calls mostly block on the tone micro-batcher while one forward pass
+serves many of them, so they run on a pool of their own with enough threads
+to fill a batch, and never hold the threads the other analyzers need.
+
+Three limits keep one slow model from starving the rest:
+    - a per-analyzer semaphore caps how many calls of the same analyzer run
+      at once across all requests
+    - a global pending limit bounds how many analyzer calls may be queued
+      on the pools; callers beyond it wait instead of growing the queue
+    - a per-analyzer deadline, counted from when the call is handed to a
+      pool: an analyzer that has not finished in time (e.g. grammar on a
+      50k-character paste with no punctuation) yields a standardized
+      ``status: "timeout"`` result and the rest of the response completes
+      without it. Artifacts have deadlines too, under their own names.
+
+With these in place a request's latency is roughly the cost of its slowest
+analyzer instead of the sum of all of them. A timed-out call cannot be
+interrupted inside its worker thread; it finishes in the background, its
+result is discarded, and it holds its concurrency and pending slots until
+then, so abandoned calls cannot pile up on the pools.
+
+Usage:
+    executor = get_executor()
+    results = await executor.run_pipeline(registry, text, names=["tone", "grammar"], cache=result_cache)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+from analyzers import create_timeout_response
+from analyzers.tone_base import TONE_MICROBATCH_MAX_SIZE
+from services.result_cache import hash_text
+
+logger = logging.getLogger(__name__)
+
+# Pool sizes and limits, overridable per deployment (Render free tier wants them small)
+THREAD_WORKERS = int(os.getenv("ANALYZER_THREAD_WORKERS", min(8, (os.cpu_count() or 1) + 4)))
+# Off unless configured: every worker process holds its own copy of the analyzers' models
+PROCESS_WORKERS = int(os.getenv("ANALYZER_PROCESS_WORKERS", 0))
+MAX_PENDING = int(os.getenv("ANALYZER_MAX_PENDING", THREAD_WORKERS * 4))
+
+
+
+def _parse_per_analyzer(value: str) -> Dict[str, float]:
+    """Parses "tone=15,grammar=5" into per-analyzer settings."""
+    settings = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, setting = item.split("=", 1)
+            settings[name.strip()] = float(setting)
+    return settings
+
+
+# Analyzers whose calls mostly wait on a model micro-batcher. They run on a thread
+# pool of their own, sized to their concurrency limit.
+BATCHED_ANALYZERS = ("tone",)
+
+# Analyzers backed by a single heavyweight model get a tighter limit than the default;
+# tone may run enough calls to fill a micro-batch. ANALYZER_CONCURRENCY_LIMITS
+# ("tone=32,sentiment=2") overrides them.
+DEFAULT_CONCURRENCY_LIMITS = {
+    "tone": TONE_MICROBATCH_MAX_SIZE,
+    "sentiment": 4,
+    **{name: int(limit) for name, limit in _parse_per_analyzer(os.getenv("ANALYZER_CONCURRENCY_LIMITS", "")).items()}
+}
+
+# Seconds an analyzer or artifact may run once submitted to a pool (0 disables)
+DEFAULT_DEADLINE = float(os.getenv("ANALYZER_DEADLINE_SECONDS", 20))
+DEFAULT_DEADLINES = _parse_per_analyzer(os.getenv("ANALYZER_DEADLINES", ""))
+
+AnalyzerCall = Tuple[Callable[..., Any], tuple, dict]
+
+
+class AnalysisExecutor:
+    """
+    Runs analyzer calls on thread and process pools with bounded concurrency.
+
+    Attributes:
+        thread_workers: Size of the thread pool
+        process_workers: Size of the process pool (0 runs process-bound calls on threads)
+        max_pending: Maximum analyzer calls submitted to the shared pools at once
+        concurrency_limits: Per-analyzer limits; analyzers not listed may use every thread
+        batched: Analyzers run on their own pool, one thread per call their limit allows
+        default_deadline: Seconds each analyzer or artifact may run in a pipeline (0 disables)
+        deadlines: Per-analyzer (or artifact) deadlines overriding the default
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = THREAD_WORKERS,
+        process_workers: int = PROCESS_WORKERS,
+        max_pending: int = MAX_PENDING,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        default_deadline: float = DEFAULT_DEADLINE,
+        deadlines: Optional[Dict[str, float]] = None,
+        batched: Iterable[str] = BATCHED_ANALYZERS
+    ):
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.max_pending = max(1, max_pending)
+        self.concurrency_limits = dict(DEFAULT_CONCURRENCY_LIMITS if concurrency_limits is None else concurrency_limits)
+        self.default_deadline = max(0.0, default_deadline)
+        self.deadlines = dict(DEFAULT_DEADLINES if deadlines is None else deadlines)
+        self.batched = frozenset(batched)
+
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._batched_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Optional[asyncio.Semaphore] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    # --- Pools --------------------------------------------------------------
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="analyzer")
+        return self._thread_pool
+
+    def _get_batched_pool(self) -> ThreadPoolExecutor:
+        if self._batched_pool is None:
+            workers = sum(max(1, self.concurrency_limits.get(name, self.thread_workers)) for name in self.batched)
+            self._batched_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyzer-batched")
+        return self._batched_pool
+
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.process_workers == 0:
+            return None
+        if self._process_pool is None:
+            # spawn avoids forking a process that already has analyzer threads running
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    # --- Limits -------------------------------------------------------------
+
+    def _bind_loop(self) -> None:
+        """Semaphores belong to one event loop, so recreate them if the loop changed."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = asyncio.Semaphore(self.max_pending)
+            self._limits = {}
+
+    def _limit_for(self, name: str) -> asyncio.Semaphore:
+        if name not in self._limits:
+            limit = self.concurrency_limits.get(name, self.thread_workers)
+            self._limits[name] = asyncio.Semaphore(max(1, limit))
+        return self._limits[name]
+
+    def deadline_for(self, name: str) -> Optional[float]:
+        """Seconds the named analyzer or artifact may run, or None for no deadline."""
+        deadline = self.deadlines.get(name, self.default_deadline)
+        return deadline if deadline > 0 else None
+
+    # --- Execution ----------------------------------------------------------
+
+    async def run(self, name: str, func: Callable[..., Any], *args, process_bound: bool = False, **kwargs) -> Any:
+        """
+        Runs one analyzer call off the event loop.
+
+        Args:
+            name: Analyzer name, used for its concurrency limit
+            func: The analyzer function (must be picklable when process_bound)
+            *args: Positional arguments for func
+            process_bound: Run on the process pool instead of the thread pool
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns; exceptions raised by func propagate
+        """
+        return await (await self._submit(name, partial(func, *args, **kwargs), process_bound))
+
+    async def _submit(self, name: str, call: Callable[[], Any], process_bound: bool = False) -> asyncio.Future:
+        """
+        Submits a call to its pool once its limits let it in.
+
+        The call's slots are released when it finishes on its worker, not when
+        its caller stops waiting for it.
+
+        Returns:
+            Future of the call's result; cancelling it only stops a call that has not started
+        """
+        self._bind_loop()
+        loop = asyncio.get_running_loop()
+        if name in self.batched:
+            # The batched pool has a thread for every call the limit lets in, so nothing queues on it
+            slots = [self._limit_for(name)]
+            pool = self._get_batched_pool()
+        else:
+            slots = [self._limit_for(name), self._pending]
+            pool = (self._get_process_pool() if process_bound else None) or self._get_thread_pool()
+
+        acquired = []
+        try:
+            for slot in slots:
+                await slot.acquire()
+                acquired.append(slot)
+            future = pool.submit(call)
+        except BaseException:
+            for slot in acquired:
+                slot.release()
+            raise
+
+        def release() -> None:
+            for slot in slots:
+                slot.release()
+
+        def on_done(_) -> None:
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                pass  # The loop has closed, and its semaphores with it
+
+        future.add_done_callback(on_done)
+        return asyncio.wrap_future(future, loop=loop)
+
+    async def _run_with_deadline(self, name: str, call: Callable[[], Any], process_bound: bool = False) -> Any:
+        """
+        Runs a call, raising asyncio.TimeoutError if it runs past its deadline.
+
+        The clock starts once the call is submitted, so time spent waiting for
+        a free slot does not count against it.
+        """
+        future = await self._submit(name, call, process_bound)
+        return await asyncio.wait_for(future, self.deadline_for(name))
+
+    async def run_all(self, calls: Dict[str, AnalyzerCall], process_bound: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Runs independent analyzer calls concurrently.
+
+        Args:
+            calls: Mapping of analyzer name to (func, args, kwargs)
+            process_bound: Names of the calls that should run on the process pool
+
+        Returns:
+            Mapping of analyzer name to result, in the same order as calls
+        """
+        process_bound = set(process_bound)
+        names = list(calls)
+        results = await asyncio.gather(*(
+            self.run(name, func, *args, process_bound=name in process_bound, **kwargs)
+            for name, (func, args, kwargs) in calls.items()
+        ))
+        return dict(zip(names, results))
+
+    async def run_pipeline(
+        self,
+        registry,
+        text: str,
+        names: Optional[Iterable[str]] = None,
+        cache=None,
+        cached: Optional[Dict[str, Any]] = None,
+        provided: Optional[Dict[str, Any]] = None,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Runs a selection of a tier's analyzers, building only the artifacts they need.
+
+        Takes the same arguments as stream_pipeline.
+
+        Returns:
+            Mapping of analyzer name to result, in registration order
+
+        Raises:
+            ValueError: If names contains an unregistered analyzer
+        """
+        names = registry.select(names)
+        results = {}
+        async for name, result in self.stream_pipeline(registry, text, names, cache, cached, provided, precomputed):
+            results[name] = result
+        return {name: results[name] for name in names}
+
+    async def stream_pipeline(
+        self,
+        registry,
+        text: str,
+        names: Optional[Iterable[str]] = None,
+        cache=None,
+        cached: Optional[Dict[str, Any]] = None,
+        provided: Optional[Dict[str, Any]] = None,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Runs a selection of a tier's analyzers and yields each result as soon as it is ready.
+
+        Cached and precomputed results are yielded first. Every other analyzer
+        starts as soon as the artifacts it needs are built, so analyzers that
+        need no artifacts (sentiment, hedging) finish while the text is still
+        being parsed for the others. An analyzer that misses its deadline
+        yields a timeout result (see analyzers.create_timeout_response).
+
+        Args:
+            registry: The tier's AnalyzerRegistry
+            text: Text to analyze
+            names: Analyzer names to run, or None for all
+            cache: Optional ResultCache; cached analyzers are not run (only
+                analyzers marked cacheable are looked up and stored)
+            cached: Results the caller already looked up in cache (skips the lookup)
+            provided: Artifacts already built by the caller (e.g. batch-parsed docs)
+            precomputed: Results already computed by the caller (e.g. batched tone)
+
+        Yields:
+            (analyzer name, result) in completion order
+
+        Raises:
+            ValueError: If names contains an unregistered analyzer
+        """
+        names = registry.select(names)
+        versions = registry.cache_versions(names)
+
+        text_hash = hash_text(text) if cache is not None else None
+        if cached is not None:
+            ready = {name: result for name, result in cached.items() if name in versions}
+        elif cache is not None:
+            ready = await cache.get_many(text_hash, versions)
+        else:
+            ready = {}
+
+        computed = {name: result for name, result in (precomputed or {}).items() if name in names and name not in ready}
+        if cache is not None and computed:
+            cache.put_many(text_hash, versions, computed)
+        ready.update(computed)
+
+        for name in names:
+            if name in ready:
+                yield name, ready[name]
+
+        missing = [name for name in names if name not in ready]
+        if not missing:
+            return
+
+        # Each artifact is built once, after its upstream artifacts, and shared by every analyzer that needs it
+        artifact_tasks: Dict[str, asyncio.Future] = {}
+
+        def artifact(name: str) -> asyncio.Future:
+            if name not in artifact_tasks:
+                artifact_tasks[name] = asyncio.ensure_future(build_artifact(name))
+            return artifact_tasks[name]
+
+        async def build_artifact(name: str) -> Any:
+            if provided and name in provided:
+                return provided[name]
+            upstream = {upstream: await artifact(upstream) for upstream in registry.artifacts[name].requires}
+            return await self._run_with_deadline(name, partial(registry.build_artifact, name, text, upstream))
+
+        async def run_analyzer(name: str) -> Tuple[str, Any]:
+            spec = registry.analyzers[name]
+            try:
+                # Shielded so one analyzer failing does not cancel an artifact others share
+                artifacts = {required: await asyncio.shield(artifact(required)) for required in spec.requires}
+                func, args, kwargs = registry.call(text, name, artifacts)
+                return name, await self._run_with_deadline(name, partial(func, *args, **kwargs), spec.process_bound)
+            except asyncio.TimeoutError:
+                # Also raised when an artifact the analyzer needs missed its own deadline
+                deadline = self.deadline_for(name) or self.default_deadline
+                logger.warning(f"Analyzer '{name}' did not finish within {deadline:g}s")
+                return name, create_timeout_response(deadline)
+
+        # Most expensive analyzers are started first so they get pool slots first
+        tasks = [asyncio.ensure_future(run_analyzer(name)) for name in registry.by_cost(missing)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                name, result = await next_result
+                if cache is not None:
+                    cache.put_many(text_hash, versions, {name: result})
+                yield name, result
+        finally:
+            for task in tasks + list(artifact_tasks.values()):
+                task.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the pools. They are recreated on the next call."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+        if self._batched_pool is not None:
+            self._batched_pool.shutdown(wait=wait)
+            self._batched_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+
+
+_executor: Optional[AnalysisExecutor] = None
+
+
+def get_executor() -> AnalysisExecutor:
+    """
+    Returns the process-wide analyzer executor, creating it on first use.
+
+    Returns:
+        Shared AnalysisExecutor instance
+    """
+    global _executor
+    if _executor is None:
+        _executor = AnalysisExecutor()
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shuts down the shared executor's pools (called on application shutdown)."""
+    if _executor is not None:
+        _executor.shutdown(wait=False)
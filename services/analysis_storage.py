@@ -1,16 +1,21 @@
 import logging
-from typing import Dict, Any, Optional
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.models import Submission, AnalysisResult, Student
+from sqlalchemy.dialects.postgresql import insert
+from analyzers import result_status
+from app.models import Submission, AnalysisResult, Student, StyleProfileRecord
 from app.database import AsyncSessionLocal
+from services.result_cache import hash_text
 
 logger = logging.getLogger(__name__)
 
 async def store_analysis_results(
     text: str,
     student_id: str,
-    analysis_results: Dict[str, Any]
+    analysis_results: Dict[str, Any],
+    versions: Optional[Dict[str, str]] = None
 ) -> Optional[int]:
     """
     Store text submission and all analysis results in the database.
@@ -19,40 +24,14 @@ async def store_analysis_results(
         text: The input text that was analyzed
         student_id: The student identifier
         analysis_results: Dictionary of analyzer results
+        versions: Analyzer name to version mapping (defaults to "v1")
         
     Returns:
         Submission ID if successful, None otherwise
     """
     try:
         async with AsyncSessionLocal() as session:
-            # Get or create student
-            student = await get_or_create_student(session, student_id)
-            
-            # Create submission
-            submission = Submission(
-                student_id=student.id,
-                text=text
-            )
-            session.add(submission)
-            await session.flush()  # Get the ID
-            
-            # Store each analyzer result
-            for analyzer_name, result in analysis_results.items():
-                if result is None:
-                    continue
-                    
-                # Convert result to JSON-serializable format
-                result_json = _prepare_result_json(result)
-                
-                analysis_result = AnalysisResult(
-                    submission_id=submission.id,
-                    analyzer_name=analyzer_name,
-                    analyzer_version="v1",
-                    status="ok",
-                    result_json=result_json,
-                    duration_ms=result.get("duration_ms") if isinstance(result, dict) else None
-                )
-                session.add(analysis_result)
+            submission = await _add_submission(session, text, student_id, analysis_results, versions)
             
             await session.commit()
             logger.info(f"Stored analysis results for submission {submission.id}")
@@ -62,6 +41,243 @@ async def store_analysis_results(
         logger.error(f"Failed to store analysis results: {e}")
         return None
 
+async def store_batch_analysis_results(
+    items: List[Tuple[str, str, Dict[str, Any]]],
+    versions: Optional[Dict[str, str]] = None
+) -> List[Optional[int]]:
+    """
+    Store several submissions and their analysis results in one transaction.
+    
+    Args:
+        items: (text, student_id, analysis_results) for each submission
+        versions: Analyzer name to version mapping (defaults to "v1")
+        
+    Returns:
+        Submission IDs in input order if successful, a list of None otherwise
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            submissions = [
+                await _add_submission(session, text, student_id, analysis_results, versions)
+                for text, student_id, analysis_results in items
+            ]
+            
+            await session.commit()
+            logger.info(f"Stored analysis results for {len(submissions)} submissions")
+            return [submission.id for submission in submissions]
+            
+    except Exception as e:
+        logger.error(f"Failed to store batch analysis results: {e}")
+        return [None] * len(items)
+
+async def create_submission(
+    text: str,
+    student_id: str,
+    analyzers: Optional[List[str]] = None,
+    job_status: Optional[str] = None
+) -> Optional[int]:
+    """
+    Store a submission without results, so analysis can run later (job mode).
+    
+    Args:
+        text: The submitted text
+        student_id: The student identifier
+        analyzers: Analyzer names the job will run
+        job_status: The job's initial status
+        
+    Returns:
+        Submission ID if successful, None otherwise
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            submission = await _add_submission(session, text, student_id, {})
+            submission.requested_analyzers = analyzers
+            submission.job_status = job_status
+            await session.commit()
+            return submission.id
+            
+    except Exception as e:
+        logger.error(f"Failed to store submission: {e}")
+        return None
+
+async def store_analysis_result(
+    submission_id: int,
+    analyzer_name: str,
+    result: Dict[str, Any],
+    analyzer_version: str = "v1",
+    status: Optional[str] = None,
+    error_message: Optional[str] = None,
+    duration_ms: Optional[int] = None
+) -> bool:
+    """
+    Store one analyzer result for an existing submission.
+    
+    Args:
+        submission_id: ID of the submission
+        analyzer_name: Name of the analyzer
+        result: Analyzer result
+        analyzer_version: Version of the analyzer
+        status: Analysis status ("ok", "error", "timeout"); taken from the result if not given
+        error_message: Error message if status is not "ok"; taken from the result if not given
+        duration_ms: Duration of analysis in milliseconds
+        
+    Returns:
+        True if stored, False otherwise
+    """
+    if status is None:
+        status, error_message = _result_status(result)
+    try:
+        async with AsyncSessionLocal() as session:
+            session.add(AnalysisResult(
+                submission_id=submission_id,
+                analyzer_name=analyzer_name,
+                analyzer_version=analyzer_version,
+                status=status,
+                error_message=error_message[:500] if error_message else None,
+                duration_ms=duration_ms,
+                result_json=_prepare_result_json(result)
+            ))
+            await session.commit()
+            return True
+            
+    except Exception as e:
+        logger.error(f"Failed to store {analyzer_name} result for submission {submission_id}: {e}")
+        return False
+
+async def set_job_status(submission_id: int, status: str, error: Optional[str] = None) -> bool:
+    """
+    Record a job-mode submission's status (and why it failed).
+    
+    Returns:
+        True if recorded, False otherwise
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            submission = await session.get(Submission, submission_id)
+            if not submission:
+                return False
+            submission.job_status = status
+            submission.job_error = error[:500] if error else None
+            await session.commit()
+            return True
+            
+    except Exception as e:
+        logger.error(f"Failed to record status of job {submission_id}: {e}")
+        return False
+
+async def get_stored_job(submission_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve a job-mode submission's recorded status with its stored results.
+    
+    Returns:
+        {"status", "analyzers", "error", "results"} (status and analyzers are
+        None for submissions analyzed in the request), or None if the
+        submission does not exist
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            submission = await session.get(Submission, submission_id)
+            if not submission:
+                return None
+            
+            await session.refresh(submission, attribute_names=['results'])
+            return {
+                "status": submission.job_status,
+                "analyzers": submission.requested_analyzers,
+                "error": submission.job_error,
+                "results": _results_by_analyzer(submission)
+            }
+            
+    except Exception as e:
+        logger.error(f"Failed to retrieve job {submission_id}: {e}")
+        return None
+
+async def get_submission_results(submission_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve the analyzer results stored so far for one submission.
+    
+    Args:
+        submission_id: ID of the submission
+        
+    Returns:
+        Analyzer name to {"status", "result", "duration_ms"}, or None if the submission does not exist
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            submission = await session.get(Submission, submission_id)
+            if not submission:
+                return None
+            
+            await session.refresh(submission, attribute_names=['results'])
+            return _results_by_analyzer(submission)
+            
+    except Exception as e:
+        logger.error(f"Failed to retrieve results for submission {submission_id}: {e}")
+        return None
+
+def _results_by_analyzer(submission: Submission) -> Dict[str, Any]:
+    """A loaded submission's results: analyzer name to {"status", "result", "duration_ms"}."""
+    return {
+        analysis_result.analyzer_name: {
+            "status": analysis_result.status,
+            "result": analysis_result.result_json,
+            "duration_ms": analysis_result.duration_ms
+        }
+        for analysis_result in submission.results
+    }
+
+async def _add_submission(
+    session: AsyncSession,
+    text: str,
+    student_id: str,
+    analysis_results: Dict[str, Any],
+    versions: Optional[Dict[str, str]] = None
+) -> Submission:
+    """Add a submission and its analyzer results to the session without committing."""
+    versions = versions or {}
+    
+    # Get or create student
+    student = await get_or_create_student(session, student_id)
+    
+    # Create submission; the text hash lets later submissions of the same text reuse these results
+    submission = Submission(
+        student_id=student.id,
+        text=text,
+        text_hash=hash_text(text)
+    )
+    session.add(submission)
+    await session.flush()  # Get the ID
+    
+    # Store each analyzer result
+    for analyzer_name, result in analysis_results.items():
+        if result is None:
+            continue
+            
+        # Convert result to JSON-serializable format
+        result_json = _prepare_result_json(result)
+        
+        status, error_message = _result_status(result)
+        
+        analysis_result = AnalysisResult(
+            submission_id=submission.id,
+            analyzer_name=analyzer_name,
+            analyzer_version=versions.get(analyzer_name, "v1"),
+            status=status,
+            error_message=error_message,
+            result_json=result_json,
+            duration_ms=result.get("duration_ms") if isinstance(result, dict) else None
+        )
+        session.add(analysis_result)
+    
+    return submission
+
+def _result_status(result: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Status and error message of an analyzer result (timed-out results carry their own)."""
+    status = result_status(result)
+    if status == "ok":
+        return status, None
+    return status, str(result.get("raw", {}).get("error", status))[:500]
+
 async def get_or_create_student(session: AsyncSession, student_id: str) -> Student:
     """Get existing student or create a new one."""
     # For now, create a simple student with email as student_id
@@ -77,6 +293,49 @@ async def get_or_create_student(session: AsyncSession, student_id: str) -> Stude
     
     return student
 
+async def get_stored_results(
+    text_hash: str,
+    versions: Dict[str, str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Find the most recent stored result of each analyzer for a text.
+    
+    Args:
+        text_hash: Hash of the normalized text (see services.result_cache.hash_text)
+        versions: Analyzer name to the version whose results may be reused
+        
+    Returns:
+        Analyzer name to result JSON for every analyzer with a matching row
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            stmt = (
+                select(
+                    AnalysisResult.analyzer_name,
+                    AnalysisResult.analyzer_version,
+                    AnalysisResult.result_json
+                )
+                .join(Submission)
+                .where(
+                    Submission.text_hash == text_hash,
+                    AnalysisResult.analyzer_name.in_(list(versions)),
+                    AnalysisResult.status == "ok"
+                )
+                .order_by(AnalysisResult.created_at.desc())
+            )
+            result = await session.execute(stmt)
+            
+            stored = {}
+            for analyzer_name, analyzer_version, result_json in result.all():
+                if analyzer_name not in stored and analyzer_version == versions[analyzer_name]:
+                    stored[analyzer_name] = result_json
+            
+            return stored
+            
+    except Exception as e:
+        logger.error(f"Failed to look up stored analysis results: {e}")
+        return {}
+
 def _prepare_result_json(result: Any) -> Dict[str, Any]:
     """Convert analyzer result to JSON-serializable format."""
     if isinstance(result, dict):
@@ -142,4 +401,65 @@ async def get_analysis_history(student_id: str, limit: int = 10) -> list[Dict[st
             
     except Exception as e:
         logger.error(f"Failed to retrieve analysis history: {e}")
-        return [] 
\ No newline at end of file
+        return [] 
+
+async def load_profile_row(student_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """
+    Read a student's stored style profile.
+    
+    Args:
+        student_id: The student identifier
+        
+    Returns:
+        (version, profile dict), or None if the student has no profile
+    """
+    async with AsyncSessionLocal() as session:
+        stmt = select(StyleProfileRecord.version, StyleProfileRecord.profile).where(
+            StyleProfileRecord.student_id == student_id
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        return (row.version, row.profile) if row is not None else None
+
+async def upsert_profile_row(
+    student_id: str,
+    profile: Dict[str, Any],
+    expected_version: Optional[int] = None
+) -> Optional[int]:
+    """
+    Insert or replace a student's style profile in one atomic statement.
+    
+    Args:
+        student_id: The student identifier
+        profile: The profile as a dict (StyleProfile.to_dict)
+        expected_version: Only write if the stored row is at this version
+            (0: only if there is no row); None writes unconditionally
+        
+    Returns:
+        The row's new version, or None if the stored version did not match
+    """
+    async with AsyncSessionLocal() as session:
+        stmt = insert(StyleProfileRecord).values(
+            student_id=student_id,
+            profile=profile,
+            total_texts=profile.get("total_texts", 0),
+            version=1,
+            updated_at=datetime.utcnow()
+        )
+        if expected_version == 0:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[StyleProfileRecord.student_id])
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[StyleProfileRecord.student_id],
+                set_={
+                    "profile": stmt.excluded.profile,
+                    "total_texts": stmt.excluded.total_texts,
+                    "version": StyleProfileRecord.version + 1,
+                    "updated_at": stmt.excluded.updated_at
+                },
+                where=StyleProfileRecord.version == expected_version if expected_version is not None else None
+            )
+        
+        # A row at another version is left untouched and nothing is returned
+        version = (await session.execute(stmt.returning(StyleProfileRecord.version))).scalar_one_or_none()
+        await session.commit()
+        return version
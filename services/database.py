@@ -1,15 +1,13 @@
 import logging
-from typing import Optional
+from typing import Callable, Optional
 from style_profile_module.style_profile import StyleProfile
+from services.profile_store import ProfileUpdate, profile_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory storage for style profiles (replace with database in production)
-_profiles = {}
-
-def get_student_profile(student_id: str) -> Optional[StyleProfile]:
+async def get_student_profile(student_id: str) -> Optional[StyleProfile]:
     """
     Retrieve a student's StyleProfile from the database.
     
@@ -22,7 +20,7 @@ def get_student_profile(student_id: str) -> Optional[StyleProfile]:
     logger.info(f"Fetching profile for student: {student_id}")
     
     try:
-        profile = _profiles.get(student_id)
+        profile = await profile_store.get(student_id)
         if profile:
             logger.info(f"Profile found for student {student_id} with {profile.total_texts} texts analyzed")
             return profile
@@ -33,7 +31,7 @@ def get_student_profile(student_id: str) -> Optional[StyleProfile]:
         logger.error(f"Error retrieving profile for student {student_id}: {e}")
         return None
 
-def save_student_profile(student_id: str, profile: StyleProfile) -> bool:
+async def save_student_profile(student_id: str, profile: StyleProfile) -> bool:
     """
     Save a student's StyleProfile to the database.
     
@@ -47,13 +45,34 @@ def save_student_profile(student_id: str, profile: StyleProfile) -> bool:
     logger.info(f"Saving profile for student: {student_id}")
     
     try:
-        _profiles[student_id] = profile
+        await profile_store.save(student_id, profile)
         logger.info(f"Profile saved successfully for student {student_id}")
         return True
     except Exception as e:
         logger.error(f"Failed to save profile for student {student_id}: {e}")
         return False
 
+async def update_student_profile(
+    student_id: str,
+    change: Callable[[Optional[StyleProfile]], StyleProfile]
+) -> Optional[ProfileUpdate]:
+    """
+    Apply a change to a student's StyleProfile with one atomic, versioned write.
+    
+    Args:
+        student_id: The unique identifier for the student
+        change: Returns the new profile given the stored one (None if the
+            student has none); re-applied if another worker saved first
+        
+    Returns:
+        ProfileUpdate with the previous and the saved profile, None on failure
+    """
+    try:
+        return await profile_store.update(student_id, change)
+    except Exception as e:
+        logger.error(f"Failed to update profile for student {student_id}: {e}")
+        return None
+
 def create_default_profile() -> StyleProfile:
     """
     Create a default StyleProfile for new students.
@@ -63,7 +82,7 @@ def create_default_profile() -> StyleProfile:
     """
     return StyleProfile()
 
-def profile_exists(student_id: str) -> bool:
+async def profile_exists(student_id: str) -> bool:
     """
     Check if a profile exists for the given student.
     
@@ -73,4 +92,4 @@ def profile_exists(student_id: str) -> bool:
     Returns:
         bool: True if profile exists, False otherwise
     """
-    return student_id in _profiles 
\ No newline at end of file
+    return await profile_store.get(student_id) is not None 
\ No newline at end of file
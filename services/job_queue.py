@@ -0,0 +1,251 @@
+"""
+In-process queue for asynchronous analysis jobs.
+
+Long essays under the full tier can take several seconds to analyze. In job
+mode the route stores the submission, queues a job and returns at once; a
+fixed pool of worker tasks drains the queue and runs the analyzers (on the
+shared AnalysisExecutor), recording each result on the job as it completes
+so partial results can be polled.
+
+The queue is bounded. When it is full, ``submit`` raises QueueFullError and
+the route answers 503 so clients back off instead of piling up work the
+service cannot finish. ``stats`` exposes the depth for monitoring.
+
+Job state lives in memory (finished jobs are kept up to ``max_finished``);
+the routes use the submission ID as the job ID so a job whose state is gone
+(another worker, a restart) can still be looked up in the database.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAX_DEPTH = int(os.getenv("ANALYSIS_QUEUE_DEPTH", 100))
+QUEUE_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", 2))
+QUEUE_MAX_FINISHED = int(os.getenv("ANALYSIS_JOBS_RETAINED", 1000))
+
+# Job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a full queue."""
+
+
+@dataclass
+class AnalysisJob:
+    """
+    One queued analysis.
+
+    Attributes:
+        job_id: Job identifier (the submission ID when the submission is stored)
+        text: Text to analyze
+        student_id: Student the submission belongs to
+        analyzers: Analyzer names to run, or None for all
+        status: One of JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+        results: Analyzer results recorded so far
+        summary: Extra fields set by the handler when the job completes
+        error: Error message if the job failed
+    """
+    job_id: Any
+    text: str
+    student_id: Optional[str] = None
+    analyzers: Optional[List[str]] = None
+    status: str = JOB_QUEUED
+    results: Dict[str, Any] = field(default_factory=dict)
+    summary: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the job's status and the results recorded so far.
+        """
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "analyzers": self.analyzers,
+            "completed_analyzers": list(self.results),
+            "results": self.results,
+            "queued_ms": int(((self.started_at or time.time()) - self.created_at) * 1000),
+            "elapsed_ms": int(((self.finished_at or time.time()) - self.started_at) * 1000) if self.started_at else 0,
+        }
+        if self.error:
+            data["error"] = self.error
+        data.update(self.summary)
+        return data
+
+
+JobHandler = Callable[[AnalysisJob], Awaitable[None]]
+JobListener = Callable[[AnalysisJob], Awaitable[None]]
+
+
+class AnalysisJobQueue:
+    """
+    Bounded job queue drained by a fixed number of worker tasks.
+
+    Workers are started on the first submit, in the running event loop, and
+    restarted if the loop changes.
+
+    Attributes:
+        handler: Coroutine function that runs one job; it should record
+            results on ``job.results`` as they complete
+        max_depth: Maximum number of jobs waiting in the queue
+        workers: Number of jobs run at once
+        max_finished: Number of finished jobs kept for status lookups
+        on_status: Optional coroutine function called when a job starts
+            running and when it finishes (completed or failed), e.g. to
+            record the status where other workers can see it
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        max_depth: int = QUEUE_MAX_DEPTH,
+        workers: int = QUEUE_WORKERS,
+        max_finished: int = QUEUE_MAX_FINISHED,
+        on_status: Optional[JobListener] = None
+    ):
+        self.handler = handler
+        self.on_status = on_status
+        self.max_depth = max(1, max_depth)
+        self.workers = max(1, workers)
+        self.max_finished = max(0, max_finished)
+
+        self._jobs: "OrderedDict[Any, AnalysisJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting to start."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == JOB_RUNNING)
+
+    def full(self) -> bool:
+        return self.depth >= self.max_depth
+
+    def submit(self, job: AnalysisJob) -> AnalysisJob:
+        """
+        Queues a job without waiting.
+
+        Args:
+            job: The job to run
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If max_depth jobs are already waiting
+        """
+        self._start()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"Analysis queue is full ({self.max_depth} jobs waiting)")
+        self._jobs[job.job_id] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: Any) -> Optional[AnalysisJob]:
+        """Returns a job known to this process, or None."""
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the queue counters.
+
+        Returns:
+            dict: Queue depth and capacity, running jobs and totals
+        """
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "workers": self.workers,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+    async def shutdown(self) -> None:
+        """Cancels the workers; queued jobs are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    def _start(self) -> None:
+        """Creates the queue and workers in the running loop (once per loop)."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            await self._notify(job)
+            try:
+                await self.handler(job)
+                job.status = JOB_COMPLETED
+                self.completed += 1
+            except asyncio.CancelledError:
+                job.status = JOB_FAILED
+                job.error = "Job cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Analysis job {job.job_id} failed: {e}")
+                job.status = JOB_FAILED
+                job.error = str(e)
+                self.failed += 1
+            finally:
+                job.finished_at = time.time()
+                await self._notify(job)
+                self._queue.task_done()
+                self._prune()
+
+    async def _notify(self, job: AnalysisJob) -> None:
+        """Reports a status change to on_status; its failures are logged, not raised."""
+        if self.on_status is None:
+            return
+        try:
+            await self.on_status(job)
+        except Exception as e:
+            logger.error(f"Recording status of analysis job {job.job_id} failed: {e}")
+
+    def _prune(self) -> None:
+        """Forgets the oldest finished jobs beyond max_finished."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
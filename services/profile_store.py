@@ -0,0 +1,220 @@
+"""
+Shared store for students' style profiles.
+
+Profiles (the anomaly baselines) live in the ``style_profiles`` table, one
+row per student, so they survive restarts and every uvicorn worker sees the
+same baseline. Each process keeps a bounded LRU of the profiles it has read
+or written in front of the table:
+
+    - reads are served from the LRU, falling back to one primary-key lookup
+    - writes go through to the table as one atomic upsert and then replace
+      the cached entry (write-through)
+    - every row carries a version that each write increments; ``update``
+      only writes when the row is still at the version it read, and
+      otherwise reloads the row and re-applies its change, so concurrent
+      workers never lose each other's updates
+
+Without a database (``use_database=False``) rows are kept in process with
+the same versioning, as profiles were before the table existed.
+"""
+
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from style_profile_module.style_profile import StyleProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 10000))
+
+# Times update() reloads and re-applies its change after losing a race to another writer
+PROFILE_UPDATE_RETRIES = 3
+
+# Version of a profile that has never been written
+NO_VERSION = 0
+
+
+class ProfileConflictError(Exception):
+    """Raised when an update keeps losing races to other writers."""
+
+
+class ProfileUpdate(NamedTuple):
+    """Outcome of ProfileStore.update."""
+    previous: Optional[StyleProfile]  # The profile the change was applied to (None for a new student)
+    profile: StyleProfile  # The profile now stored
+    version: int
+
+
+class ProfileStore:
+    """
+    Style profiles in the database behind an in-process LRU.
+
+    Profiles handed out are copies; changing one has no effect until it is
+    saved.
+
+    Attributes:
+        max_entries: Maximum number of profiles held in memory
+        use_database: Whether profiles are stored in the style_profiles table
+    """
+
+    def __init__(self, max_entries: int = PROFILE_CACHE_SIZE, use_database: bool = True):
+        self.max_entries = max(0, max_entries)
+        self.use_database = use_database
+
+        # student_id -> (version, profile as a dict)
+        self._entries: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Stand-in for the table when there is no database
+        self._rows: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.conflicts = 0
+
+    async def get(self, student_id: str) -> Optional[StyleProfile]:
+        """Returns the student's profile, or None if none was saved."""
+        version, data = await self._read(student_id)
+        return _to_profile(data)
+
+    async def save(self, student_id: str, profile: StyleProfile) -> int:
+        """
+        Stores a profile whatever version is stored (last writer wins).
+
+        Returns:
+            The new version
+        """
+        data = profile.to_dict()
+        version = await self._write(student_id, data, expected_version=None)
+        self._remember(student_id, version, data)
+        return version
+
+    async def update(
+        self,
+        student_id: str,
+        change: Callable[[Optional[StyleProfile]], StyleProfile]
+    ) -> ProfileUpdate:
+        """
+        Applies a change to the stored profile with one conditional upsert.
+
+        Args:
+            student_id: The student whose profile changes
+            change: Returns the new profile given the stored one (None for a
+                new student); called again if another writer got there first
+
+        Returns:
+            ProfileUpdate with the previous and stored profile and its version
+
+        Raises:
+            ProfileConflictError: If every retry lost a race
+        """
+        for _ in range(PROFILE_UPDATE_RETRIES + 1):
+            version, data = await self._read(student_id)
+            profile = change(_to_profile(data))
+            new_data = profile.to_dict()
+
+            new_version = await self._write(student_id, new_data, expected_version=version)
+            if new_version is not None:
+                self._remember(student_id, new_version, new_data)
+                return ProfileUpdate(_to_profile(data), profile, new_version)
+
+            # Another worker wrote first: drop the stale copy and re-apply to theirs
+            self.conflicts += 1
+            self.invalidate(student_id)
+
+        raise ProfileConflictError(f"Profile for student {student_id} kept changing during update")
+
+    def invalidate(self, student_id: Optional[str] = None) -> None:
+        """
+        Drops cached profiles, so they are read from the table again.
+
+        Args:
+            student_id: Student to drop; None clears the whole cache
+        """
+        with self._lock:
+            if student_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(student_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses, hit rate, version conflicts and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "conflicts": self.conflicts,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
+
+    async def _read(self, student_id: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Returns (version, profile dict) from the cache, else the table; (NO_VERSION, None) if absent."""
+        with self._lock:
+            if student_id in self._entries:
+                self._entries.move_to_end(student_id)
+                self.hits += 1
+                return self._entries[student_id]
+            self.misses += 1
+
+        if self.use_database:
+            # Imported lazily: the database module requires DATABASE_URL at import time
+            from services.analysis_storage import load_profile_row
+            row = await load_profile_row(student_id)
+        else:
+            row = self._rows.get(student_id)
+
+        if row is None:
+            return NO_VERSION, None
+        self._remember(student_id, *row)
+        return row
+
+    async def _write(self, student_id: str, data: Dict[str, Any], expected_version: Optional[int]) -> Optional[int]:
+        """
+        Upserts a profile; with an expected version, only if the stored row is
+        still at it (NO_VERSION: only if there is no row).
+
+        Returns:
+            The new version, or None if the stored version did not match
+        """
+        if self.use_database:
+            from services.analysis_storage import upsert_profile_row
+            return await upsert_profile_row(student_id, data, expected_version)
+
+        with self._lock:
+            stored_version = self._rows.get(student_id, (NO_VERSION, None))[0]
+            if expected_version is not None and stored_version != expected_version:
+                return None
+            self._rows[student_id] = (stored_version + 1, copy.deepcopy(data))
+            return stored_version + 1
+
+    def _remember(self, student_id: str, version: int, data: Dict[str, Any]) -> None:
+        """Caches a profile unless a newer version is already cached."""
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            cached = self._entries.get(student_id)
+            if cached is not None and cached[0] > version:
+                return
+            self._entries[student_id] = (version, copy.deepcopy(data))
+            self._entries.move_to_end(student_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _to_profile(data: Optional[Dict[str, Any]]) -> Optional[StyleProfile]:
+    # A copy, so callers cannot change the cached entry
+    return StyleProfile.from_dict(copy.deepcopy(data)) if data is not None else None
+
+
+# Shared by every request in this process
+profile_store = ProfileStore()
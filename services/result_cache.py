@@ -0,0 +1,180 @@
+"""
+Content-addressed cache for analyzer results.
+
+Results are keyed on a hash of the normalized submission text plus the
+analyzer name and version, so resubmitted drafts and re-run sample texts
+skip the analyzers entirely.
+
+Two tiers are consulted in order:
+    1. An in-process LRU bounded by ``max_entries``
+    2. ``analysis_results`` rows in Postgres, found through
+       ``submissions.text_hash``, so results are shared across workers and
+       survive restarts (optional; the lightweight tier runs without a database)
+
+Results for an analyzer are only reused at the version the caller asks for.
+When a caller asks for a new version, in-memory entries for the old one are
+dropped, and database rows for old versions are never returned.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from analyzers import result_status
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_SIZE", 5000))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for hashing without changing what the analyzers see:
+    Unicode NFC, Unix line endings and no leading or trailing whitespace.
+    """
+    text = unicodedata.normalize("NFC", text)
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def hash_text(text: str) -> str:
+    """
+    Returns the SHA-256 hex digest of the normalized text.
+
+    This is the value stored in ``submissions.text_hash``.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier analyzer result cache with hit and miss counters.
+
+    Cached results are shared between requests and must be treated as read-only.
+
+    Attributes:
+        max_entries: Maximum number of (text, analyzer, version) entries held in memory
+        use_database: Whether to fall back to stored analysis results on a memory miss
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, use_database: bool = True):
+        self.max_entries = max(0, max_entries)
+        self.use_database = use_database
+
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+
+    async def get_many(self, text_hash: str, versions: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Looks up cached results for several analyzers of one text.
+
+        Args:
+            text_hash: Hash of the text, from hash_text
+            versions: Mapping of analyzer name to the version the caller runs
+
+        Returns:
+            Mapping of analyzer name to result for every analyzer that was cached
+        """
+        found = {}
+        with self._lock:
+            for name, version in versions.items():
+                self._check_version(name, version)
+                key = (text_hash, name, version)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[name] = self._entries[key]
+            self.memory_hits += len(found)
+
+        missing = {name: version for name, version in versions.items() if name not in found}
+        if missing and self.use_database:
+            stored = await self._get_from_database(text_hash, missing)
+            if stored:
+                self.put_many(text_hash, missing, stored)
+                self.database_hits += len(stored)
+                found.update(stored)
+
+        self.misses += len(versions) - len(found)
+        return found
+
+    def put_many(self, text_hash: str, versions: Dict[str, str], results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Adds freshly computed results to the in-memory tier.
+
+        Database persistence happens through the normal analysis storage path,
+        which records the text hash and analyzer versions with each submission.
+
+        Args:
+            text_hash: Hash of the text, from hash_text
+            versions: Mapping of analyzer name to the version that produced the result
+            results: Mapping of analyzer name to result
+        """
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            for name, result in results.items():
+                # Degraded results (e.g. timeouts) must be recomputed next time
+                if result is None or name not in versions or result_status(result) != "ok":
+                    continue
+                self._check_version(name, versions[name])
+                key = (text_hash, name, versions[name])
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, analyzer_name: Optional[str] = None) -> None:
+        """
+        Drops in-memory entries for one analyzer, or for every analyzer.
+
+        Args:
+            analyzer_name: Analyzer to invalidate; None clears the whole cache
+        """
+        with self._lock:
+            if analyzer_name is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                self._evict(analyzer_name)
+                self._versions.pop(analyzer_name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits per tier, misses, hit rate and current size
+        """
+        lookups = self.memory_hits + self.database_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "database_hits": self.database_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.database_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
+
+    def _check_version(self, name: str, version: str) -> None:
+        """Evicts an analyzer's entries when it is first seen at a new version (lock held)."""
+        previous = self._versions.get(name)
+        if previous is not None and previous != version:
+            self._evict(name)
+        self._versions[name] = version
+
+    def _evict(self, name: str) -> None:
+        """Removes every in-memory entry for one analyzer (lock held)."""
+        for key in [key for key in self._entries if key[1] == name]:
+            del self._entries[key]
+
+    async def _get_from_database(self, text_hash: str, versions: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        # Imported lazily: the database module requires DATABASE_URL at import time
+        from services.analysis_storage import get_stored_results
+        return await get_stored_results(text_hash, versions)
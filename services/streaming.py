@@ -0,0 +1,99 @@
+"""
+Streaming analysis responses as NDJSON or Server-Sent Events.
+
+Each analyzer's standardized response is sent as a ``result`` event the
+moment it completes, followed by one ``summary`` event (storage, anomaly
+detection and timing) once every analyzer has finished. If an analyzer
+fails, an ``error`` event is sent instead of the summary.
+
+NDJSON lines look like:
+    {"event": "result", "analyzer": "sentiment", "elapsed_ms": 3, "result": {...}}
+    {"event": "summary", "elapsed_ms": 812, ...}
+
+SSE uses the event name as the SSE ``event:`` field and the same JSON as ``data:``.
+"""
+
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def encode_event(event: str, data: Dict[str, Any], stream_format: str) -> str:
+    """
+    Serializes one event in the requested stream format.
+
+    Args:
+        event: Event name ("result", "summary" or "error")
+        data: Event payload
+        stream_format: "ndjson" or "sse"
+
+    Returns:
+        The encoded event, including its trailing newline(s)
+    """
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+    return json.dumps(jsonable_encoder({"event": event, **data})) + "\n"
+
+
+async def stream_analysis_events(
+    results: AsyncIterator,
+    finalize: Callable[[Dict[str, Any], int], Awaitable[Dict[str, Any]]],
+    stream_format: str = "ndjson"
+) -> AsyncIterator[str]:
+    """
+    Encodes analyzer results as they arrive, then the summary.
+
+    Args:
+        results: Async iterator of (analyzer name, result), e.g. AnalysisExecutor.stream_pipeline
+        finalize: Called with every result and the total time in milliseconds
+            once the analyzers finish; returns the summary payload
+        stream_format: "ndjson" or "sse"
+
+    Yields:
+        Encoded events
+    """
+    start_time = time.time()
+    collected: Dict[str, Any] = {}
+
+    try:
+        async for name, result in results:
+            collected[name] = result
+            yield encode_event("result", {
+                "analyzer": name,
+                "elapsed_ms": int((time.time() - start_time) * 1000),
+                "result": result
+            }, stream_format)
+
+        total_time = int((time.time() - start_time) * 1000)
+        summary = await finalize(collected, total_time)
+        yield encode_event("summary", {"elapsed_ms": total_time, **summary}, stream_format)
+
+    except Exception as e:
+        logger.error(f"Streaming analysis failed: {e}")
+        yield encode_event("error", {
+            "error": str(e),
+            "elapsed_ms": int((time.time() - start_time) * 1000),
+            "completed": list(collected)
+        }, stream_format)
+
+
+def streaming_response(events: AsyncIterator[str], stream_format: str = "ndjson") -> StreamingResponse:
+    """
+    Wraps encoded events in a response that is not buffered by proxies.
+    """
+    return StreamingResponse(
+        events,
+        media_type=STREAM_FORMATS[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,4 +1,5 @@
 from .style_profile import StyleProfile
+from .feature_vector import FEATURES, FeatureVector
 from .update import update_style_profile
 
-__all__ = ['StyleProfile', 'update_style_profile'] 
\ No newline at end of file
+__all__ = ['StyleProfile', 'FEATURES', 'FeatureVector', 'update_style_profile'] 
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Array-backed running statistics of style profile metrics.
+
+Every profile metric has a fixed slot in FEATURES, so a profile's
+statistics are a handful of float64 arrays (count, mean, M2 and, when
+PROFILE_DECAY is set, the decayed mean and variance) instead of one object
+per metric. Adding a submission is one vectorized Welford update, comparing
+two profiles is one NumPy expression over all metrics, and profiles stacked
+row by row score a whole class at once (see analyzers.anomaly).
+
+FEATURES is append-only: stored vectors with fewer features are padded with
+empty slots when read, so new metrics go at the end.
+"""
+
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+READABILITY_METRICS = ["flesch_kincaid_grade", "smog_index", "gunning_fog", "dale_chall_score"]
+
+# Metric name -> (section, key) of its value in an analysis dict (see update_style_profile)
+METRIC_SOURCES = {
+    "sentiment": ("sentiment", "polarity"),
+    "lexical_diversity": ("lexical_diversity", "score"),
+    "formality": ("formality", "flesch_kincaid_grade"),
+    "sentence_length": ("complexity", "sentence_length"),
+    "lexical_density": ("complexity", "lexical_density"),
+    "passive_voice_ratio": ("passive_voice", "score"),
+    "hedging": ("hedging", "score"),
+    "grammar_errors": ("grammar", "num_errors"),
+    "lexical_richness": ("lexical_richness", "score"),
+    **{metric: ("readability", metric) for metric in READABILITY_METRICS},
+}
+
+# The vector schema: slot index -> metric name
+FEATURES: Tuple[str, ...] = tuple(METRIC_SOURCES)
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURES)}
+
+# Binary layout: format version, number of features, decay; then the arrays (little-endian float64)
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BHd")
+
+
+def feature_values(analysis: dict) -> np.ndarray:
+    """
+    Extracts every metric of an analysis dict into schema order.
+
+    Returns:
+        float64 array over FEATURES, NaN where the metric is missing or not a number
+    """
+    values = np.full(len(FEATURES), np.nan)
+    for index, (section, key) in enumerate(METRIC_SOURCES.values()):
+        section_values = analysis.get(section)
+        value = section_values.get(key) if isinstance(section_values, dict) else None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[index] = value
+    return values
+
+
+class FeatureVector:
+    """
+    Welford running mean and variance of every metric in FEATURES.
+
+    Attributes:
+        count: Values seen per metric
+        mean: Mean per metric
+        m2: Sum of squared deviations from the mean per metric
+        decay: Weight of each new value in the decayed statistics (0: not kept)
+        decayed_mean: Exponentially weighted mean per metric (NaN until its first value)
+        decayed_variance: Exponentially weighted variance per metric
+    """
+    __slots__ = ("count", "mean", "m2", "decay", "decayed_mean", "decayed_variance")
+
+    def __init__(self, decay: float = 0.0):
+        size = len(FEATURES)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.decay = decay
+        self.decayed_mean = np.full(size, np.nan)
+        self.decayed_variance = np.zeros(size)
+
+    def add(self, values: np.ndarray) -> None:
+        """Adds one submission's values (NaN: metric missing, left unchanged)."""
+        present = ~np.isnan(values)
+        self.count[present] += 1
+        delta = values[present] - self.mean[present]
+        self.mean[present] += delta / self.count[present]
+        self.m2[present] += delta * (values[present] - self.mean[present])
+
+        if self.decay:
+            first = present & np.isnan(self.decayed_mean)
+            self.decayed_mean[first] = values[first]
+            later = present & ~first
+            difference = values[later] - self.decayed_mean[later]
+            increment = self.decay * difference
+            self.decayed_mean[later] += increment
+            self.decayed_variance[later] = (1 - self.decay) * (self.decayed_variance[later] + difference * increment)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance per metric (0.0 with fewer than two values)."""
+        return np.divide(self.m2, self.count - 1, out=np.zeros_like(self.m2), where=self.count > 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation per metric."""
+        return np.sqrt(self.variance)
+
+    def values(self) -> np.ndarray:
+        """Mean per metric, NaN for metrics never seen (a single submission's values)."""
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def center_and_spread(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(mean, standard deviation) per metric, from the decayed statistics where they are kept."""
+        if not self.decay:
+            return self.mean, self.std
+        kept = ~np.isnan(self.decayed_mean)
+        return (
+            np.where(kept, self.decayed_mean, self.mean),
+            np.where(kept, np.sqrt(self.decayed_variance), self.std)
+        )
+
+    def get(self, name: str, default: float = 0.0) -> float:
+        """Mean of one metric, or the default if it was never seen."""
+        index = FEATURE_INDEX[name]
+        return float(self.mean[index]) if self.count[index] else default
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form: a small header and the arrays as little-endian float64."""
+        arrays = [self.count, self.mean, self.m2]
+        if self.decay:
+            arrays += [self.decayed_mean, self.decayed_variance]
+        return _HEADER.pack(_FORMAT_VERSION, len(FEATURES), self.decay) + np.stack(arrays).astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FeatureVector":
+        """
+        Reads the form to_bytes writes.
+
+        Raises:
+            ValueError: If the data is in an unknown format or has more features than FEATURES
+        """
+        version, size, decay = _HEADER.unpack_from(data)
+        if version != _FORMAT_VERSION or size > len(FEATURES):
+            raise ValueError(f"Unsupported feature vector (format {version}, {size} features)")
+        rows = np.frombuffer(data, dtype="<f8", offset=_HEADER.size).reshape(-1, size)
+
+        vector = cls(decay=decay)
+        vector.count[:size], vector.mean[:size], vector.m2[:size] = rows[:3]
+        if decay:
+            vector.decayed_mean[:size], vector.decayed_variance[:size] = rows[3:5]
+        return vector
+
+    @classmethod
+    def from_metrics(cls, metrics: Dict[str, Dict[str, float]], decay: float = 0.0) -> "FeatureVector":
+        """Reads the per-metric dicts profiles were stored as before the vector (name -> count, mean, m2)."""
+        vector = cls(decay=decay)
+        for name, stats in metrics.items():
+            if name not in FEATURE_INDEX:
+                continue
+            index = FEATURE_INDEX[name]
+            vector.count[index] = stats.get("count", 0)
+            vector.mean[index] = stats.get("mean", 0.0)
+            vector.m2[index] = stats.get("m2", 0.0)
+            if decay and stats.get("decayed_mean") is not None:
+                vector.decayed_mean[index] = stats["decayed_mean"]
+                vector.decayed_variance[index] = stats.get("decayed_variance", 0.0)
+        return vector
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FeatureVector):
+            return NotImplemented
+        return self.decay == other.decay and all(
+            np.array_equal(getattr(self, name), getattr(other, name), equal_nan=True)
+            for name in ("count", "mean", "m2", "decayed_mean", "decayed_variance")
+        )
+
+    def __repr__(self) -> str:
+        seen = {name: round(self.get(name), 4) for name in FEATURES if self.count[FEATURE_INDEX[name]]}
+        return f"FeatureVector({seen})"
+
+
+def stack(vectors) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stacks profiles' statistics into matrices, one row per profile.
+
+    Returns:
+        (count, center, spread), each of shape (len(vectors), len(FEATURES))
+    """
+    centers, spreads = zip(*(vector.center_and_spread() for vector in vectors))
+    return np.vstack([vector.count for vector in vectors]), np.vstack(centers), np.vstack(spreads)
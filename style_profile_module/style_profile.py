@@ -1,55 +1,103 @@
+import base64
+import os
 from dataclasses import dataclass, field
-from typing import List, Dict
+from datetime import datetime
+from typing import Any, Dict
 
+from .feature_vector import FEATURE_INDEX, READABILITY_METRICS, FeatureVector, feature_values
 
-@dataclass
+# Weight of each new submission in the decayed per-metric statistics
+# (e.g. 0.2; 0 keeps only the plain running statistics)
+PROFILE_DECAY = float(os.getenv("PROFILE_DECAY", 0))
+
+# Metric name -> the average attribute derived from it
+AVERAGE_FIELDS = {
+    "sentiment": "average_sentiment",
+    "lexical_diversity": "average_lexical_diversity",
+    "formality": "average_formality",
+    "sentence_length": "average_sentence_length",
+    "lexical_density": "average_lexical_density",
+    "passive_voice_ratio": "average_passive_voice_ratio",
+    "grammar_errors": "average_grammar_errors",
+    "lexical_richness": "average_lexical_richness",
+}
+
+
+@dataclass(slots=True)
 class StyleProfile:
+    """
+    A student's writing style, aggregated over their submissions.
+
+    Every numeric metric lives in ``features``; the average_* attributes
+    are read-only views of it, so there is one source of truth and storage
+    holds only the counts and the vector.
+    """
     # Tone and emotion distribution (aggregated counts)
     tone_distribution: Dict[str, int] = field(default_factory=dict)
     emotion_distribution: Dict[str, int] = field(default_factory=dict)
 
-    # Current averages (computed from database, not stored lists)
-    average_sentiment: float = 0.0
-    average_lexical_diversity: float = 0.0
-    average_formality: float = 0.0
-    average_grammar_errors: float = 0.0
-    average_lexical_richness: float = 0.0
-    
-    # Complexity averages
-    average_sentence_length: float = 0.0
-    average_lexical_density: float = 0.0
-    
-    # Passive voice and hedging averages
-    average_passive_voice_ratio: float = 0.0
-    total_hedging_count: int = 0
-    
-    # Readability averages
-    average_readability: Dict[str, float] = field(default_factory=lambda: {
-        "flesch_kincaid_grade": 0.0,
-        "smog_index": 0.0,
-        "gunning_fog": 0.0,
-        "dale_chall_score": 0.0
-    })
-    
+    # Running count, mean and variance of every metric, in FEATURES order
+    features: FeatureVector = field(default_factory=lambda: FeatureVector(decay=PROFILE_DECAY))
+
     # Overall statistics
     total_texts: int = 0
     last_updated: str = ""
 
+    @property
+    def average_sentiment(self) -> float:
+        return self.features.get("sentiment")
+
+    @property
+    def average_lexical_diversity(self) -> float:
+        return self.features.get("lexical_diversity")
+
+    @property
+    def average_formality(self) -> float:
+        return self.features.get("formality")
+
+    @property
+    def average_grammar_errors(self) -> float:
+        return self.features.get("grammar_errors")
+
+    @property
+    def average_lexical_richness(self) -> float:
+        return self.features.get("lexical_richness")
+
+    @property
+    def average_sentence_length(self) -> float:
+        return self.features.get("sentence_length")
+
+    @property
+    def average_lexical_density(self) -> float:
+        return self.features.get("lexical_density")
+
+    @property
+    def average_passive_voice_ratio(self) -> float:
+        return self.features.get("passive_voice_ratio")
+
+    @property
+    def total_hedging_count(self) -> float:
+        """Sum of the hedging scores of every submission."""
+        index = FEATURE_INDEX["hedging"]
+        return float(self.features.count[index] * self.features.mean[index])
+
+    @property
+    def average_readability(self) -> Dict[str, float]:
+        return {metric: self.features.get(metric) for metric in READABILITY_METRICS}
+
+    def averages(self) -> Dict[str, Any]:
+        """The derived averages, by the names the API reports them under."""
+        averages = {field_name: getattr(self, field_name) for field_name in AVERAGE_FIELDS.values()}
+        averages["total_hedging_count"] = self.total_hedging_count
+        averages["average_readability"] = self.average_readability
+        return averages
+
     def to_dict(self) -> Dict:
         """Convert the StyleProfile to a dictionary for storage."""
         return {
             "tone_distribution": self.tone_distribution,
             "emotion_distribution": self.emotion_distribution,
-            "average_sentiment": self.average_sentiment,
-            "average_lexical_diversity": self.average_lexical_diversity,
-            "average_formality": self.average_formality,
-            "average_grammar_errors": self.average_grammar_errors,
-            "average_lexical_richness": self.average_lexical_richness,
-            "average_sentence_length": self.average_sentence_length,
-            "average_lexical_density": self.average_lexical_density,
-            "average_passive_voice_ratio": self.average_passive_voice_ratio,
-            "total_hedging_count": self.total_hedging_count,
-            "average_readability": self.average_readability,
+            "features": base64.b64encode(self.features.to_bytes()).decode("ascii"),
             "total_texts": self.total_texts,
             "last_updated": self.last_updated
         }
@@ -60,80 +108,51 @@ class StyleProfile:
         return cls(
             tone_distribution=data.get("tone_distribution", {}),
             emotion_distribution=data.get("emotion_distribution", {}),
-            average_sentiment=data.get("average_sentiment", 0.0),
-            average_lexical_diversity=data.get("average_lexical_diversity", 0.0),
-            average_formality=data.get("average_formality", 0.0),
-            average_grammar_errors=data.get("average_grammar_errors", 0.0),
-            average_lexical_richness=data.get("average_lexical_richness", 0.0),
-            average_sentence_length=data.get("average_sentence_length", 0.0),
-            average_lexical_density=data.get("average_lexical_density", 0.0),
-            average_passive_voice_ratio=data.get("average_passive_voice_ratio", 0.0),
-            total_hedging_count=data.get("total_hedging_count", 0),
-            average_readability=data.get("average_readability", {
-                "flesch_kincaid_grade": 0.0,
-                "smog_index": 0.0,
-                "gunning_fog": 0.0,
-                "dale_chall_score": 0.0
-            }),
+            features=_features_from_dict(data),
             total_texts=data.get("total_texts", 0),
             last_updated=data.get("last_updated", "")
         )
 
-    def update_averages(self, new_analysis: dict, total_texts: int):
-        """Update the style profile averages with new analysis results."""
-        self.total_texts = total_texts
-        
-        # Update tone distribution
-        tone = new_analysis.get("tone")
+    def add_submission(self, analysis: dict) -> None:
+        """
+        Adds one submission's analysis to the profile in O(1): tone and
+        emotion counts and the running statistics of every metric present.
+
+        Args:
+            analysis: Analysis dict in the shape update_style_profile documents
+        """
+        self.total_texts += 1
+        self.last_updated = datetime.utcnow().isoformat()
+
+        tone = analysis.get("tone")
         if tone:
             self.tone_distribution[tone] = self.tone_distribution.get(tone, 0) + 1
-
-        # Update emotion distribution
-        emotion = new_analysis.get("emotion")
+        emotion = analysis.get("emotion")
         if emotion:
             self.emotion_distribution[emotion] = self.emotion_distribution.get(emotion, 0) + 1
 
-        # Update sentiment average
-        sentiment = new_analysis.get("sentiment", {}).get("polarity", 0)
-        self.average_sentiment = (self.average_sentiment * (total_texts - 1) + sentiment) / total_texts
-
-        # Update lexical diversity average
-        lexical_diversity = new_analysis.get("lexical_diversity", {}).get("score", 0)
-        self.average_lexical_diversity = (self.average_lexical_diversity * (total_texts - 1) + lexical_diversity) / total_texts
-
-        # Update formality average
-        formality = new_analysis.get("formality", {}).get("flesch_kincaid_grade", 0)
-        self.average_formality = (self.average_formality * (total_texts - 1) + formality) / total_texts
-
-        # Update complexity averages
-        complexity_data = new_analysis.get("complexity", {})
-        if "sentence_length" in complexity_data:
-            sentence_length = complexity_data["sentence_length"]
-            self.average_sentence_length = (self.average_sentence_length * (total_texts - 1) + sentence_length) / total_texts
-        if "lexical_density" in complexity_data:
-            lexical_density = complexity_data["lexical_density"]
-            self.average_lexical_density = (self.average_lexical_density * (total_texts - 1) + lexical_density) / total_texts
-
-        # Update passive voice average
-        passive_voice = new_analysis.get("passive_voice", {}).get("score", 0)
-        self.average_passive_voice_ratio = (self.average_passive_voice_ratio * (total_texts - 1) + passive_voice) / total_texts
-
-        # Update hedging count
-        hedging = new_analysis.get("hedging", {}).get("score", 0)
-        self.total_hedging_count += hedging
-        
-        # Update grammar error average
-        grammar_errors = new_analysis.get("grammar", {}).get("num_errors", 0)
-        self.average_grammar_errors = (self.average_grammar_errors * (total_texts - 1) + grammar_errors) / total_texts
-        
-        # Update lexical richness average
-        lexical_richness = new_analysis.get("lexical_richness", {}).get("score", 0)
-        self.average_lexical_richness = (self.average_lexical_richness * (total_texts - 1) + lexical_richness) / total_texts
-        
-        # Update readability averages
-        readability_data = new_analysis.get("readability", {})
-        for metric in ["flesch_kincaid_grade", "smog_index", "gunning_fog", "dale_chall_score"]:
-            if metric in readability_data:
-                current_avg = self.average_readability[metric]
-                new_value = readability_data[metric]
-                self.average_readability[metric] = (current_avg * (total_texts - 1) + new_value) / total_texts 
\ No newline at end of file
+        self.features.add(feature_values(analysis))
+
+    def update_averages(self, new_analysis: dict, total_texts: int):
+        """Update the style profile averages with new analysis results."""
+        self.add_submission(new_analysis)
+        self.total_texts = total_texts
+
+
+def _features_from_dict(data: Dict) -> FeatureVector:
+    """
+    The feature vector of a stored profile: base64 of FeatureVector.to_bytes,
+    per-metric statistics, or (oldest) only the averages, read as
+    total_texts values at the average with no spread.
+    """
+    if "features" in data:
+        return FeatureVector.from_bytes(base64.b64decode(data["features"]))
+    metrics = data.get("metrics")
+    count = data.get("total_texts", 0)
+    if metrics is None and count:
+        averages = {name: data[field_name] for name, field_name in AVERAGE_FIELDS.items() if field_name in data}
+        averages.update(data.get("average_readability", {}))
+        if "total_hedging_count" in data:
+            averages["hedging"] = data["total_hedging_count"] / count
+        metrics = {name: {"count": count, "mean": mean} for name, mean in averages.items()}
+    return FeatureVector.from_metrics(metrics or {}, decay=PROFILE_DECAY)
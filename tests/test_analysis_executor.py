@@ -0,0 +1,190 @@
+"""
+Tests for the concurrent analyzer executor.
+"""
+
+import asyncio
+import time
+import pytest
+from analyzers.pipeline import AnalyzerRegistry, AnalyzerSpec, ArtifactSpec
+from services.analysis_executor import AnalysisExecutor
+from services.result_cache import ResultCache
+
+
+def slow_analyzer(text, delay=0.2):
+    time.sleep(delay)
+    return {"score": len(text)}
+
+
+def shared_input(text, delay=0.05):
+    time.sleep(delay)
+    return text.upper()
+
+
+def failing_analyzer(text):
+    raise ValueError("analyzer failed")
+
+
+@pytest.fixture
+def executor():
+    executor = AnalysisExecutor(thread_workers=4, process_workers=0, max_pending=8, concurrency_limits={"tone": 1})
+    yield executor
+    executor.shutdown()
+
+
+def test_independent_analyzers_overlap(executor):
+    """Latency is roughly the slowest analyzer, not the sum."""
+    calls = {name: (slow_analyzer, ("text",), {}) for name in ("formality", "grammar", "hedging")}
+
+    start = time.perf_counter()
+    results = asyncio.run(executor.run_all(calls))
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == ["formality", "grammar", "hedging"]
+    assert all(result == {"score": 4} for result in results.values())
+    assert elapsed < 0.5
+
+
+def test_per_analyzer_limit_serializes_calls(executor):
+    """Calls of an analyzer limited to one slot run one after another."""
+    async def run_twice():
+        return await asyncio.gather(
+            executor.run("tone", slow_analyzer, "a"),
+            executor.run("tone", slow_analyzer, "b")
+        )
+
+    start = time.perf_counter()
+    asyncio.run(run_twice())
+
+    assert time.perf_counter() - start >= 0.4
+
+
+def test_batched_calls_do_not_hold_shared_threads():
+    """Tone calls waiting to fill a micro-batch leave the shared pool to the other analyzers."""
+    executor = AnalysisExecutor(thread_workers=1, process_workers=0, concurrency_limits={"tone": 4})
+
+    async def scenario():
+        return await asyncio.gather(
+            *(executor.run("tone", slow_analyzer, "a") for _ in range(4)),
+            executor.run("grammar", slow_analyzer, "b")
+        )
+
+    try:
+        start = time.perf_counter()
+        asyncio.run(scenario())
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+    assert elapsed < 0.35
+
+
+def test_errors_propagate(executor):
+    """An analyzer exception reaches the caller."""
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run_all({"grammar": (failing_analyzer, ("text",), {})}))
+
+
+def test_process_bound_calls_run_in_worker_process():
+    """Process-bound calls return the worker's result."""
+    executor = AnalysisExecutor(thread_workers=2, process_workers=1)
+    try:
+        results = asyncio.run(executor.run_all({
+            "grammar": (divmod, (7, 2), {}),
+            "hedging": (divmod, (9, 4), {})
+        }, process_bound=("grammar",)))
+    finally:
+        executor.shutdown()
+
+    assert results == {"grammar": (3, 1), "hedging": (2, 1)}
+
+
+def test_analyzer_past_its_deadline_times_out():
+    """A slow analyzer yields a timeout result; the others, sharing its artifact, still finish."""
+    registry = AnalyzerRegistry(
+        artifacts=[ArtifactSpec("doc", shared_input)],
+        analyzers=[
+            AnalyzerSpec("grammar", lambda text, doc: slow_analyzer(doc, delay=0.6), "v1", requires=("doc",)),
+            AnalyzerSpec("hedging", lambda text, doc: {"score": len(doc)}, "v1", requires=("doc",))
+        ]
+    )
+    executor = AnalysisExecutor(thread_workers=4, process_workers=0, deadlines={"grammar": 0.15})
+    cache = ResultCache(use_database=False)
+    try:
+        start = time.perf_counter()
+        results = asyncio.run(executor.run_pipeline(registry, "text", cache=cache))
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown(wait=False)
+
+    assert results["hedging"] == {"score": 4}
+    assert results["grammar"]["status"] == "timeout"
+    assert results["grammar"]["score"] is None
+    assert elapsed < 0.5
+    # Timeouts are not cached, so the next request retries the analyzer
+    assert cache.stats()["entries"] == 1
+
+
+def test_deadline_does_not_count_time_waiting_for_a_slot():
+    """Calls queued behind their analyzer's limit get their full deadline once they start."""
+    registry = AnalyzerRegistry(analyzers=[AnalyzerSpec("grammar", lambda text: slow_analyzer(text, delay=0.2), "v1")])
+    executor = AnalysisExecutor(thread_workers=4, process_workers=0, concurrency_limits={"grammar": 1}, deadlines={"grammar": 0.3})
+
+    async def two_requests():
+        return await asyncio.gather(
+            executor.run_pipeline(registry, "first"),
+            executor.run_pipeline(registry, "second")
+        )
+
+    try:
+        results = asyncio.run(two_requests())
+    finally:
+        executor.shutdown()
+
+    assert [result["grammar"] for result in results] == [{"score": 5}, {"score": 6}]
+
+
+def test_timed_out_call_keeps_its_pending_slot_until_it_finishes():
+    """A call abandoned at its deadline still occupies a worker, so it still counts as pending."""
+    registry = AnalyzerRegistry(analyzers=[AnalyzerSpec("grammar", lambda text: slow_analyzer(text, delay=0.4), "v1")])
+    executor = AnalysisExecutor(thread_workers=2, process_workers=0, max_pending=1, deadlines={"grammar": 0.1})
+
+    async def scenario():
+        start = time.perf_counter()
+        results = await executor.run_pipeline(registry, "text")
+        timed_out_after = time.perf_counter() - start
+        await executor.run("hedging", slow_analyzer, "text", delay=0)
+        return results, timed_out_after, time.perf_counter() - start
+
+    try:
+        results, timed_out_after, next_call_done_after = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert results["grammar"]["status"] == "timeout"
+    assert timed_out_after < 0.3
+    assert next_call_done_after >= 0.4
+
+
+def test_uncacheable_analyzers_run_every_time(executor):
+    """Results that depend on more than the text (e.g. a profile-driven cascade) are never shared."""
+    calls = []
+
+    def per_student(text, profile):
+        calls.append(profile)
+        return {"score": profile}
+
+    registry = AnalyzerRegistry(
+        artifacts=[ArtifactSpec("profile", lambda text: None)],
+        analyzers=[
+            AnalyzerSpec("tone", per_student, "v1-cascade", requires=("profile",), cacheable=False),
+            AnalyzerSpec("hedging", lambda text: {"score": len(text)}, "v1")
+        ]
+    )
+    cache = ResultCache(use_database=False)
+
+    first = asyncio.run(executor.run_pipeline(registry, "text", cache=cache, provided={"profile": "a"}))
+    second = asyncio.run(executor.run_pipeline(registry, "text", cache=cache, provided={"profile": "b"}))
+
+    assert (first["tone"], second["tone"]) == ({"score": "a"}, {"score": "b"})
+    assert calls == ["a", "b"]
+    assert cache.stats()["entries"] == 1
@@ -42,41 +42,26 @@ class TestAnomalyDetection:
         assert tone_similarity_score({}, {"formal": 1.0}) == 0.0
     
     def test_no_anomaly(self):
-        """Test that similar profiles don't trigger anomalies."""
-        # Create baseline profile
-        baseline = StyleProfile()
-        baseline.complexity = {
-            "sentence_length": [15.0, 16.0, 14.0],
-            "lexical_density": [0.65, 0.68, 0.62]
-        }
-        baseline.average_formality = 0.7
-        baseline.average_lexical_diversity = 0.75
-        baseline.average_sentiment = 0.2
-        baseline.tone_distribution = {"formal": 3, "informal": 1, "neutral": 2}
-        
-        # Create current profile (similar to baseline)
-        current = StyleProfile()
-        current.complexity = {
-            "sentence_length": [16.0, 15.5, 14.5],
-            "lexical_density": [0.67, 0.64, 0.66]
-        }
-        current.average_formality = 0.72
-        current.average_lexical_diversity = 0.73
-        current.average_sentiment = 0.18
-        current.tone_distribution = {"formal": 2, "informal": 1, "neutral": 3}
+        """Test that a submission within the student's usual range is not flagged."""
+        baseline = _baseline(
+            sentence_length=[15.0, 16.0, 14.0, 15.5, 14.5],
+            lexical_density=[0.65, 0.68, 0.62, 0.66, 0.64],
+            formality=[10.0, 11.0, 10.5, 9.5, 10.0],
+        )
+        baseline.tone_distribution = {"formal": 6, "informal": 1, "neutral": 1}
+        
+        current = _submission(sentence_length=15.3, lexical_density=0.66, formality=10.4, tone="formal")
         
         result = detect_anomaly(current, baseline)
         
         assert result["anomaly"] == False
         assert len(result["anomaly_reasons"]) == 0
+        assert abs(result["details"]["sentence_length_z"]) < 1
     
     def test_sentence_length_anomaly(self):
         """Test detection of sentence length anomaly."""
-        baseline = StyleProfile()
-        baseline.complexity = {"sentence_length": [15.0, 16.0, 14.0]}
-        
-        current = StyleProfile()
-        current.complexity = {"sentence_length": [25.0, 28.0, 30.0]}  # Much longer sentences
+        baseline = _baseline(sentence_length=[15.0, 16.0, 14.0, 15.0, 16.0])
+        current = _submission(sentence_length=28.0)  # Much longer sentences
         
         result = detect_anomaly(current, baseline)
         
@@ -85,16 +70,23 @@ class TestAnomalyDetection:
     
     def test_formality_anomaly(self):
         """Test detection of formality anomaly."""
-        baseline = StyleProfile()
-        baseline.average_formality = 0.8  # High formality
-        
-        current = StyleProfile()
-        current.average_formality = 0.3  # Low formality (50% drop)
+        baseline = _baseline(formality=[12.0, 12.5, 11.5, 12.0, 12.2])
+        current = _submission(formality=6.0)  # Much less formal
         
         result = detect_anomaly(current, baseline)
         
         assert result["anomaly"] == True
         assert any("Formality deviation" in reason for reason in result["anomaly_reasons"])
+        assert result["details"]["formality_z"] < -3
+    
+    def test_noisy_student_needs_larger_change(self):
+        """The same change is anomalous for a steady student but not for a noisy one."""
+        steady = _baseline(formality=[10.0, 10.2, 9.8, 10.1, 9.9])
+        noisy = _baseline(formality=[6.0, 14.0, 8.0, 12.0, 10.0])
+        current = _submission(formality=12.0)
+        
+        assert detect_anomaly(current, steady)["anomaly"] == True
+        assert detect_anomaly(current, noisy)["anomaly"] == False
     
     def test_tone_distribution_anomaly(self):
         """Test detection of tone distribution anomaly."""
@@ -111,25 +103,14 @@ class TestAnomalyDetection:
     
     def test_multiple_anomalies(self):
         """Test detection of multiple simultaneous anomalies."""
-        baseline = StyleProfile()
-        baseline.complexity = {
-            "sentence_length": [15.0, 16.0, 14.0],
-            "lexical_density": [0.65, 0.68, 0.62]
-        }
-        baseline.average_formality = 0.8
-        baseline.average_lexical_diversity = 0.75
-        baseline.average_sentiment = 0.2
+        baseline = _baseline(
+            sentence_length=[15.0, 16.0, 14.0, 15.0, 16.0],
+            lexical_density=[0.65, 0.68, 0.62, 0.66, 0.64],
+            formality=[12.0, 12.5, 11.5, 12.0, 12.2],
+        )
         baseline.tone_distribution = {"formal": 10, "informal": 2, "neutral": 3}
         
-        current = StyleProfile()
-        current.complexity = {
-            "sentence_length": [25.0, 28.0, 30.0],  # Long sentences
-            "lexical_density": [0.45, 0.42, 0.48]   # Low lexical density
-        }
-        current.average_formality = 0.3  # Low formality
-        current.average_lexical_diversity = 0.45  # Low diversity
-        current.average_sentiment = -0.5  # Negative sentiment
-        current.tone_distribution = {"formal": 2, "informal": 10, "neutral": 3}  # Tone shift
+        current = _submission(sentence_length=28.0, lexical_density=0.42, formality=6.0, tone="informal")
         
         result = detect_anomaly(current, baseline)
         
@@ -148,15 +129,22 @@ class TestAnomalyDetection:
         assert "anomaly_reasons" in result
         assert "details" in result
     
+    def test_short_history_is_not_scored(self):
+        """A metric needs a few submissions of history before it is scored."""
+        baseline = _baseline(formality=[12.0, 12.5])
+        current = _submission(formality=3.0)
+        
+        result = detect_anomaly(current, baseline)
+        
+        assert result["anomaly"] == False
+        assert "formality_z" not in result["details"]
+    
     def test_partial_data(self):
         """Test handling of profiles with partial data."""
-        baseline = StyleProfile()
-        baseline.average_formality = 0.7
+        baseline = _baseline(formality=[12.0, 12.5, 11.5, 12.0, 12.2])
         baseline.tone_distribution = {"formal": 5, "informal": 2}
         
-        current = StyleProfile()
-        current.average_formality = 0.3  # Only formality data
-        # No tone distribution data
+        current = _submission(formality=6.0)  # Only formality data, no tone
         
         result = detect_anomaly(current, baseline)
         
@@ -164,7 +152,34 @@ class TestAnomalyDetection:
         assert result["anomaly"] == True
         assert any("Formality deviation" in reason for reason in result["anomaly_reasons"])
         assert "tone_similarity" not in result["details"]  # Should not be calculated
+        assert "sentence_length_z" not in result["details"]
+
+
+def _analysis(sentence_length=None, lexical_density=None, formality=None, tone=None):
+    """An analysis dict with only the given metrics."""
+    analysis = {"tone": tone, "complexity": {}}
+    if sentence_length is not None:
+        analysis["complexity"]["sentence_length"] = sentence_length
+    if lexical_density is not None:
+        analysis["complexity"]["lexical_density"] = lexical_density
+    if formality is not None:
+        analysis["formality"] = {"flesch_kincaid_grade": formality}
+    return analysis
+
+
+def _baseline(**history):
+    """A profile built from one submission per position of the given metric histories."""
+    profile = StyleProfile()
+    for index in range(max(len(values) for values in history.values())):
+        profile.add_submission(_analysis(**{name: values[index] for name, values in history.items()}))
+    return profile
+
 
+def _submission(**metrics):
+    """The profile of a single submission."""
+    profile = StyleProfile()
+    profile.add_submission(_analysis(**metrics))
+    return profile
 
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Tests for batch analysis: batched inference must match per-text inference.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+TEXTS = [
+    "I'm really sorry for not getting back to you sooner. I take full responsibility for the delay.",
+    "This solution is clearly the most effective. The results speak for themselves.",
+    "The report summarizes our quarterly performance. No major anomalies were found.",
+]
+
+
+def test_parse_documents_matches_parse_document():
+    """nlp.pipe gives the same parses as one nlp call per text."""
+    from analyzers.document import parse_document, parse_documents
+
+    docs = parse_documents(TEXTS, batch_size=2)
+
+    assert [doc.to_json() for doc in docs] == [parse_document(text).to_json() for text in TEXTS]
+
+
+def test_classify_tone_batch_matches_single():
+    """Batched emotion inference gives the same tone results as single calls."""
+    pytest.importorskip("transformers")
+    from analyzers.tone import classify_tone_model, classify_tone_batch
+
+    batch = classify_tone_batch(TEXTS, batch_size=2)
+
+    assert [result["bucket"] for result in batch] == [classify_tone_model(text)["bucket"] for text in TEXTS]
+    assert classify_tone_batch([]) == []
+
+
+def test_lightweight_batch_endpoint():
+    """The lightweight batch endpoint returns one /analyze-format result per submission."""
+    from routes.analyze_lightweight import router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+
+    response = client.post("/api/analyze/batch", json={"submissions": [{"text": text} for text in TEXTS]})
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["count"] == len(TEXTS)
+    single = client.post("/api/analyze", json={"text": TEXTS[0]}).json()
+    assert body["results"][0]["tone"] == single["tone"]
+    assert set(body["results"][0]) == set(single)
@@ -0,0 +1,67 @@
+"""
+Tests for the inference micro-batcher.
+"""
+
+import threading
+import time
+import pytest
+from analyzers.batching import Histogram, MicroBatcher
+
+
+def test_concurrent_calls_share_a_batch():
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        time.sleep(0.01)
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=50)
+    results = {}
+
+    def call(value):
+        results[value] = batcher.submit(value)
+
+    threads = [threading.Thread(target=call, args=(value,)) for value in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {value: value * 2 for value in range(6)}
+    assert len(batches) < 6
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == len(batches)
+    assert stats["queue_time_ms"]["count"] == 6
+
+
+def test_batch_size_is_capped_and_order_preserved():
+    batches = []
+
+    def process(items):
+        batches.append(len(items))
+        return [f"result-{item}" for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=3, max_wait_ms=20)
+
+    assert batcher.submit_many(list(range(7))) == [f"result-{item}" for item in range(7)]
+    assert max(batches) <= 3
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def process(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(process, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.submit("text")
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0.5, 3, 3, 10):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"le_1": 1, "le_5": 3, "le_inf": 4}
+    assert snapshot["mean"] == 4.125
@@ -0,0 +1,78 @@
+"""
+Tests for cheap-first cascade inference.
+"""
+
+from analyzers import create_standard_response
+from analyzers.cascade import CascadeAnalyzer, tone_disagrees, passive_voice_disagrees
+from style_profile_module import StyleProfile
+
+
+def fast_tone(text):
+    return create_standard_response(score=0.2, bucket=text, confidence=0.4)
+
+
+def slow_tone(text):
+    return create_standard_response(score=0.9, bucket="confident", confidence=0.9)
+
+
+def make_cascade(**kwargs):
+    return CascadeAnalyzer("tone", fast_tone, slow_tone, threshold=0.3, **kwargs)
+
+
+def test_confident_fast_result_is_served():
+    result = make_cascade()("neutral")
+
+    assert result["bucket"] == "neutral"
+    assert result["details"]["cascade"]["path"] == "fast"
+    assert result["details"]["cascade"]["reason"] is None
+
+
+def test_low_confidence_escalates():
+    cascade = CascadeAnalyzer("tone", fast_tone, slow_tone, threshold=0.5)
+    result = cascade("neutral")
+
+    assert result["bucket"] == "confident"
+    assert result["details"]["cascade"] == {
+        "path": "escalated",
+        "reason": "low_confidence",
+        "fast_confidence": 0.4,
+        "fast_bucket": "neutral",
+        "threshold": 0.5
+    }
+
+
+def test_buckets_outside_the_shared_vocabulary_escalate():
+    cascade = make_cascade(accept_buckets=("neutral", "positive"))
+
+    assert cascade("negative")["details"]["cascade"]["reason"] == "bucket_needs_model"
+    assert cascade("positive")["details"]["cascade"]["path"] == "fast"
+
+
+def test_disagreement_with_profile_escalates():
+    cascade = make_cascade(disagrees=tone_disagrees)
+    profile = StyleProfile(tone_distribution={"positive": 5, "neutral": 1}, total_texts=6)
+
+    assert cascade("neutral", profile=profile)["details"]["cascade"]["reason"] == "profile_disagreement"
+    assert cascade("positive", profile=profile)["details"]["cascade"]["path"] == "fast"
+    # Without a baseline there is nothing to disagree with
+    assert cascade("neutral", profile=StyleProfile())["details"]["cascade"]["path"] == "fast"
+
+
+def test_stats_count_paths_and_reasons():
+    cascade = make_cascade(accept_buckets=("neutral",))
+    for bucket in ("neutral", "neutral", "neutral", "negative"):
+        cascade(bucket)
+
+    stats = cascade.stats()
+    assert stats["fast"] == 3
+    assert stats["escalated"]["bucket_needs_model"] == 1
+    assert stats["fast_rate"] == 0.75
+
+
+def test_passive_voice_disagreement_uses_profile_average():
+    profile = StyleProfile()
+    for _ in range(3):
+        profile.add_submission({"passive_voice": {"score": 0.05}})
+
+    assert passive_voice_disagrees({"score": 0.5}, profile)
+    assert not passive_voice_disagrees({"score": 0.1}, profile)
@@ -0,0 +1,51 @@
+"""
+Tests for splitting long texts into model-sized windows.
+"""
+
+from analyzers.chunking import split_sentences, token_windows, aggregate_window_scores
+
+
+def count_words(sentences):
+    return [len(sentence.split()) for sentence in sentences]
+
+
+def test_short_text_is_a_single_unchanged_window():
+    text = "A short essay.  It fits."
+    assert token_windows(text, count_words, max_tokens=10) == [(text, 5)]
+
+
+def test_windows_keep_whole_sentences_within_budget():
+    text = "One two three. Four five six.\n\nSeven eight nine ten. Eleven."
+    windows = token_windows(text, count_words, max_tokens=7)
+
+    assert windows == [
+        ("One two three. Four five six.", 6),
+        ("Seven eight nine ten. Eleven.", 5)
+    ]
+
+
+def test_overlong_sentence_is_split_on_words():
+    text = "Intro. " + " ".join(f"w{i}" for i in range(25)) + " end"
+    windows = token_windows(text, count_words, max_tokens=10)
+
+    assert windows[0] == ("Intro.", 1)
+    assert all(tokens <= 10 for _, tokens in windows)
+    assert sum(tokens for _, tokens in windows) == 27
+
+
+def test_split_sentences_handles_paragraphs():
+    assert split_sentences("First line\n\nSecond! Third?") == ["First line", "Second!", "Third?"]
+
+
+def test_scores_are_weighted_by_window_length():
+    scores = aggregate_window_scores(
+        [
+            [{"label": "joy", "score": 0.9}, {"label": "anger", "score": 0.1}],
+            [{"label": "joy", "score": 0.3}, {"label": "anger", "score": 0.7}]
+        ],
+        weights=[300, 100]
+    )
+
+    assert [entry["label"] for entry in scores] == ["joy", "anger"]
+    assert round(scores[0]["score"], 3) == 0.75
+    assert round(scores[1]["score"], 3) == 0.25
@@ -0,0 +1,49 @@
+"""
+Tests for the shared document layer used by both analyzer tiers.
+"""
+
+import pytest
+from analyzers.document import parse_document
+from analyzers.document_lightweight import LightweightDocument
+from analyzers.grammar import analyze_grammar
+from analyzers.passive_voice import detect_passive_sentences
+from analyzers.lexical_richness import analyze_lexical_richness
+from analyzers.style_metrics import compute_complexity
+from analyzers import grammar_lightweight, passive_voice_lightweight, lexical_richness_lightweight, style_metrics_lightweight
+
+TEXT = (
+    "The essay was written by a student. He go to school every day. "
+    "Because I had practice. The results demonstrate a remarkable improvement."
+)
+
+
+@pytest.mark.parametrize("analyzer", [
+    analyze_grammar,
+    detect_passive_sentences,
+    analyze_lexical_richness,
+    compute_complexity,
+])
+def test_shared_doc_matches_own_parse(analyzer):
+    """A shared spaCy Doc gives the same result as letting the analyzer parse."""
+    doc = parse_document(TEXT)
+    assert analyzer(TEXT, doc=doc) == analyzer(TEXT)
+
+
+@pytest.mark.parametrize("analyzer", [
+    grammar_lightweight.analyze_grammar,
+    passive_voice_lightweight.detect_passive_sentences,
+    lexical_richness_lightweight.analyze_lexical_richness,
+    style_metrics_lightweight.compute_complexity,
+])
+def test_shared_lightweight_doc_matches_own_parse(analyzer):
+    """A shared LightweightDocument gives the same result as per-analyzer tokenization."""
+    doc = LightweightDocument(TEXT)
+    assert analyzer(TEXT, doc=doc) == analyzer(TEXT)
+
+
+def test_lightweight_document_arrays_align():
+    """Sentence, token and tag arrays line up one-to-one."""
+    doc = LightweightDocument(TEXT)
+
+    assert len(doc.sentences) == len(doc.sentence_tokens) == len(doc.sentence_tags)
+    assert [word for word, tag in doc.tags] == doc.tokens
@@ -0,0 +1,148 @@
+"""
+Tests for the array-backed running statistics kept in style profiles.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from analyzers.anomaly import detect_anomaly, score_profiles
+from style_profile_module.feature_vector import FEATURE_INDEX, FEATURES, FeatureVector, feature_values
+from style_profile_module.style_profile import StyleProfile
+
+FORMALITY = FEATURE_INDEX["formality"]
+
+
+def _values(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.gauss(12.0, 3.0) for _ in range(count)]
+
+
+def _profile(formality_values):
+    profile = StyleProfile()
+    for value in formality_values:
+        profile.add_submission({"formality": {"flesch_kincaid_grade": value}})
+    return profile
+
+
+@pytest.mark.parametrize("count", [1, 2, 10, 500])
+def test_matches_batch_mean_and_variance(count):
+    values = _values(count)
+    vector = FeatureVector()
+    for value in values:
+        row = np.full(len(FEATURES), np.nan)
+        row[FORMALITY] = value
+        vector.add(row)
+
+    assert vector.count[FORMALITY] == count
+    assert vector.mean[FORMALITY] == pytest.approx(np.mean(values))
+    expected_variance = np.var(values, ddof=1) if count > 1 else 0.0
+    assert vector.variance[FORMALITY] == pytest.approx(expected_variance)
+    # Metrics never seen stay empty
+    assert np.count_nonzero(vector.count) == 1
+
+
+def test_decayed_statistics_follow_recent_values():
+    vector = FeatureVector(decay=0.3)
+    for value in [10.0] * 20 + [20.0] * 20:
+        vector.add(np.full(len(FEATURES), value))
+
+    center, spread = vector.center_and_spread()
+    # The plain mean sits halfway; the decayed one has moved to the new level
+    assert vector.mean == pytest.approx(15.0)
+    assert center == pytest.approx(20.0, abs=0.01)
+    assert (spread < vector.std).all()
+
+
+def test_feature_values_follow_schema():
+    values = feature_values({"complexity": {"sentence_length": 14}, "grammar": {"num_errors": True}})
+
+    assert values[FEATURE_INDEX["sentence_length"]] == 14.0
+    # Missing sections and non-numbers are NaN
+    assert np.isnan(np.delete(values, FEATURE_INDEX["sentence_length"])).all()
+
+
+@pytest.mark.parametrize("decay", [0.0, 0.2])
+def test_binary_round_trip(decay):
+    vector = FeatureVector(decay=decay)
+    for value in _values(5):
+        vector.add(np.full(len(FEATURES), value))
+
+    data = vector.to_bytes()
+
+    assert FeatureVector.from_bytes(data) == vector
+    rows = 5 if decay else 3
+    assert len(data) < rows * len(FEATURES) * 8 + 16
+
+
+def test_shorter_stored_vector_is_padded():
+    vector = FeatureVector()
+    vector.add(np.arange(len(FEATURES), dtype=float))
+    # As written before the last feature was added to the schema
+    data = bytearray(vector.to_bytes()[:11])
+    data[1:3] = (len(FEATURES) - 1).to_bytes(2, "little")
+    for row in (vector.count, vector.mean, vector.m2):
+        data += row[:-1].astype("<f8").tobytes()
+
+    restored = FeatureVector.from_bytes(bytes(data))
+
+    assert restored.count[-1] == 0
+    assert (restored.mean[:-1] == vector.mean[:-1]).all()
+
+
+def test_profile_round_trips_through_dict():
+    profile = _profile(_values(5))
+
+    restored = StyleProfile.from_dict(profile.to_dict())
+
+    assert restored.features == profile.features
+    assert restored.total_texts == 5
+    assert restored.average_formality == pytest.approx(np.mean(_values(5)))
+    # Only the counts and the vector are stored; the averages are derived
+    assert set(profile.to_dict()) == {"tone_distribution", "emotion_distribution", "features", "total_texts", "last_updated"}
+
+
+def test_averages_are_views_of_the_vector():
+    profile = StyleProfile()
+    for hedging, grade in ((2, 8.0), (3, 10.0)):
+        profile.add_submission({"hedging": {"score": hedging}, "readability": {"smog_index": grade}})
+
+    assert profile.total_hedging_count == 5.0
+    assert profile.average_readability["smog_index"] == 9.0
+    # Metrics never seen read as 0.0
+    assert profile.average_sentiment == 0.0
+    assert profile.averages()["average_readability"]["gunning_fog"] == 0.0
+
+
+def test_reads_per_metric_profiles():
+    data = {"metrics": {"formality": {"count": 3, "mean": 11.0, "m2": 8.0}, "retired_metric": {"count": 1}}}
+
+    vector = StyleProfile.from_dict(data).features
+
+    assert vector.count[FORMALITY] == 3
+    assert vector.variance[FORMALITY] == pytest.approx(4.0)
+
+
+def test_reads_profiles_stored_as_averages():
+    data = {"average_formality": 11.0, "average_readability": {"smog_index": 9.0}, "total_hedging_count": 6, "total_texts": 3}
+
+    profile = StyleProfile.from_dict(data)
+
+    assert profile.features.count[FORMALITY] == 3
+    assert profile.average_formality == 11.0
+    assert profile.average_readability["smog_index"] == 9.0
+    assert profile.total_hedging_count == 6.0
+
+
+def test_class_scoring_matches_one_at_a_time():
+    baselines = [_profile(_values(6, seed=seed)) for seed in range(4)]
+    currents = [_profile([value]) for value in (12.0, 30.0, 2.0, 13.0)]
+
+    matrix = score_profiles(currents, baselines)
+
+    assert matrix.shape == (4, len(FEATURES))
+    for row, current, baseline in zip(matrix, currents, baselines):
+        assert detect_anomaly(current, baseline)["details"]["formality_z"] == round(row[FORMALITY], 2)
+    # Only formality was ever seen
+    assert np.isnan(np.delete(matrix, FORMALITY, axis=1)).all()
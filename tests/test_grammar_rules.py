@@ -0,0 +1,64 @@
+"""
+Tests for the declarative grammar rule engine.
+
+Documents are built by hand with their tags and parse, so these tests run
+without downloading a spaCy model.
+"""
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+from spacy.tokens import Doc
+
+from analyzers.grammar_rules import GrammarRuleEngine, MatchRule, SentenceRule, RULES, run_all_rules
+
+nlp = spacy.blank("en")
+
+# "He go to school. They walks. Because I had practice."
+WORDS = ["He", "go", "to", "school", ".", "They", "walks", ".", "Because", "I", "had", "practice", "."]
+HEADS = [1, 1, 1, 2, 1, 6, 6, 6, 10, 10, 10, 10, 10]
+DEPS = ["nsubj", "ROOT", "prep", "pobj", "punct", "nsubj", "ROOT", "punct", "mark", "nsubj", "ROOT", "dobj", "punct"]
+POS = ["PRON", "VERB", "ADP", "NOUN", "PUNCT", "PRON", "VERB", "PUNCT", "SCONJ", "PRON", "VERB", "NOUN", "PUNCT"]
+TAGS = ["PRP", "VBP", "IN", "NN", ".", "PRP", "VBZ", ".", "IN", "PRP", "VBD", "NN", "."]
+SENT_STARTS = [1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0]
+
+
+def make_doc():
+    return Doc(nlp.vocab, words=WORDS, heads=HEADS, deps=DEPS, pos=POS, tags=TAGS, sent_starts=SENT_STARTS)
+
+
+def test_all_rules_in_one_pass_with_offsets():
+    doc = make_doc()
+    errors = run_all_rules(doc)
+
+    assert [(error["type"], error["error"]) for error in errors] == [
+        ("Subject-Verb Agreement", "'He' may not agree with 'go'"),
+        ("Subject-Verb Agreement", "'They' may not agree with 'walks'"),
+        ("Sentence Fragment", RULES[1].message),
+    ]
+    assert [doc.text[error["start"]:error["end"]] for error in errors] == ["He go", "They walks", "Because I had practice ."]
+    assert errors[2]["sentence"] == "Because I had practice ."
+
+
+def test_correct_sentences_have_no_errors():
+    doc = Doc(
+        nlp.vocab, words=["They", "walk", "."], heads=[1, 1, 1], deps=["nsubj", "ROOT", "punct"],
+        pos=["PRON", "VERB", "PUNCT"], tags=["PRP", "VBP", "."], sent_starts=[1, 0, 0]
+    )
+
+    assert run_all_rules(doc) == []
+
+
+def test_rules_compose_and_compile_once():
+    engine = GrammarRuleEngine([
+        MatchRule(
+            name="flagged_word", type="Flagged Word", message="Flagged '{match}'",
+            token_patterns=[[{"LOWER": "go"}]]
+        ),
+        SentenceRule(name="no_subject", type="Fragment", message="No subject", requires={"subject": [[{"DEP": "nsubj"}]]}),
+    ])
+    doc = make_doc()
+
+    assert [error["error"] for error in engine.run(doc)] == ["Flagged 'go'"]
+    assert engine.compile(doc.vocab) is not None
+    assert len(engine._compiled) == 1
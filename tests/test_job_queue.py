@@ -0,0 +1,108 @@
+"""
+Tests for the asynchronous analysis job queue.
+"""
+
+import asyncio
+import pytest
+from services.job_queue import (
+    AnalysisJob, AnalysisJobQueue, QueueFullError,
+    JOB_QUEUED, JOB_COMPLETED, JOB_FAILED
+)
+
+
+def test_jobs_run_and_expose_partial_results():
+    release = None
+
+    async def handler(job):
+        job.results["sentiment"] = {"score": 0.5}
+        await release.wait()
+        job.results["tone"] = {"bucket": "neutral"}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        queue = AnalysisJobQueue(handler, max_depth=4, workers=1)
+        job = queue.submit(AnalysisJob(1, "An essay."))
+        assert job.status == JOB_QUEUED
+
+        await asyncio.sleep(0)
+        partial = queue.get(1).to_dict()
+        assert partial["status"] == "running"
+        assert partial["completed_analyzers"] == ["sentiment"]
+
+        release.set()
+        await asyncio.sleep(0.01)
+        await queue.shutdown()
+        return job, queue.stats()
+
+    job, stats = asyncio.run(scenario())
+    assert job.status == JOB_COMPLETED
+    assert list(job.results) == ["sentiment", "tone"]
+    assert stats["completed"] == 1
+
+
+def test_full_queue_rejects_jobs():
+    async def handler(job):
+        await asyncio.Event().wait()
+
+    async def scenario():
+        queue = AnalysisJobQueue(handler, max_depth=1, workers=1)
+        queue.submit(AnalysisJob(1, "first"))
+        await asyncio.sleep(0)  # the worker takes the first job
+        queue.submit(AnalysisJob(2, "second"))
+        assert queue.full()
+        with pytest.raises(QueueFullError):
+            queue.submit(AnalysisJob(3, "third"))
+        stats = queue.stats()
+        await queue.shutdown()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert (stats["depth"], stats["running"], stats["rejected"]) == (1, 1, 1)
+
+
+def test_failed_jobs_record_the_error_and_old_jobs_are_forgotten():
+    async def handler(job):
+        raise RuntimeError("model unavailable")
+
+    async def scenario():
+        queue = AnalysisJobQueue(handler, max_depth=4, workers=2, max_finished=1)
+        for job_id in (1, 2):
+            queue.submit(AnalysisJob(job_id, "An essay."))
+        await asyncio.sleep(0.01)
+        await queue.shutdown()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.get(1) is None
+    assert queue.get(2).status == JOB_FAILED
+    assert queue.get(2).to_dict()["error"] == "model unavailable"
+    assert queue.stats()["failed"] == 2
+
+
+def test_status_changes_are_reported_even_if_recording_fails():
+    seen = []
+
+    async def handler(job):
+        if job.job_id == 2:
+            raise RuntimeError("model unavailable")
+
+    async def on_status(job):
+        seen.append((job.job_id, job.status, job.error))
+        if job.job_id == 1:
+            raise ConnectionError("database down")
+
+    async def scenario():
+        queue = AnalysisJobQueue(handler, max_depth=4, workers=1, on_status=on_status)
+        for job_id in (1, 2):
+            queue.submit(AnalysisJob(job_id, "An essay."))
+        await asyncio.sleep(0.01)
+        await queue.shutdown()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert seen == [
+        (1, "running", None), (1, JOB_COMPLETED, None),
+        (2, "running", None), (2, JOB_FAILED, "model unavailable")
+    ]
+    assert queue.get(1).status == JOB_COMPLETED
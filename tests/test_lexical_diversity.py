@@ -0,0 +1,83 @@
+"""
+Tests for the streaming lexical diversity metrics (MATTR, MTLD, HD-D).
+"""
+
+import random
+from math import comb
+
+import pytest
+
+from analyzers.lexical import DiversityAccumulator, compute_lexical_diversity
+
+
+def _tokens(count, vocabulary, seed=0):
+    rng = random.Random(seed)
+    words = [f"w{index}" for index in range(vocabulary)]
+    return [rng.choice(words) for _ in range(count)]
+
+
+def _reference_mattr(tokens, window):
+    windows = [tokens[start:start + window] for start in range(len(tokens) - window + 1)]
+    return sum(len(set(chunk)) / window for chunk in windows) / len(windows)
+
+
+def _reference_mtld(tokens, threshold):
+    factors, start = 0.0, 0
+    for end in range(1, len(tokens) + 1):
+        if len(set(tokens[start:end])) / (end - start) <= threshold:
+            factors += 1
+            start = end
+    if start < len(tokens):
+        rest = tokens[start:]
+        factors += (1 - len(set(rest)) / len(rest)) / (1 - threshold)
+    return len(tokens) / factors
+
+
+def _reference_hdd(tokens, sample_size):
+    total = len(tokens)
+    return sum(
+        1 - comb(total - tokens.count(word), sample_size) / comb(total, sample_size)
+        for word in set(tokens)
+    ) / sample_size
+
+
+@pytest.mark.parametrize("count,vocabulary", [(60, 20), (300, 80), (1000, 400)])
+def test_metrics_match_reference_definitions(count, vocabulary):
+    tokens = _tokens(count, vocabulary)
+    diversity = DiversityAccumulator(window=50).update(tokens)
+
+    assert diversity.mattr == pytest.approx(_reference_mattr(tokens, 50))
+    assert diversity.mtld == pytest.approx(_reference_mtld(tokens, 0.72))
+    assert diversity.hdd() == pytest.approx(_reference_hdd(tokens, 42))
+
+
+def test_short_texts():
+    diversity = DiversityAccumulator(window=50).update(["a", "b", "c"])
+
+    # Fewer tokens than the window or the HD-D sample
+    assert diversity.mattr == diversity.ttr == 1.0
+    assert diversity.hdd() is None
+    # Every word distinct: no repetition, so no factor
+    assert diversity.mtld is None
+
+
+def test_mattr_does_not_fall_with_length():
+    """The plain ratio drops as the same kind of text gets longer; MATTR does not."""
+    short = DiversityAccumulator().update(_tokens(200, 300))
+    long = DiversityAccumulator().update(_tokens(5000, 300))
+
+    assert long.ttr < short.ttr / 2
+    assert long.mattr == pytest.approx(short.mattr, abs=0.05)
+
+
+def test_analyzer_reports_length_robust_metrics():
+    text = " ".join(_tokens(120, 60))
+    result = compute_lexical_diversity(text)
+
+    tokens = text.split()
+    for section in (result["details"], result["raw"]):
+        assert section["mattr"] == round(_reference_mattr(tokens, 50), 4)
+        assert section["mtld"] == round(_reference_mtld(tokens, 0.72), 2)
+        assert section["hdd"] == round(_reference_hdd(tokens, 42), 4)
+        assert section["mattr_window"] == 50
+    assert result["details"]["lexical_diversity"] == round(len(set(tokens)) / len(tokens), 4)
@@ -0,0 +1,68 @@
+"""
+Tests for the single-pass lexicon scanner.
+"""
+
+from analyzers.lexicon import LexiconScanner, LexiconHit, scan_lexicons, HEDGING, NEGATION, CONJUNCTION
+from analyzers.hedging import detect_hedging
+
+
+def test_scan_reports_category_phrase_and_offsets():
+    scanner = LexiconScanner({"hedge": ["sort of", "maybe"], "tone.positive": ["good"]})
+    text = "Maybe it is sort of good."
+
+    assert scanner.scan(text) == [
+        LexiconHit("hedge", "maybe", 0, 5),
+        LexiconHit("hedge", "sort of", 12, 19),
+        LexiconHit("tone.positive", "good", 20, 24),
+    ]
+    assert text[12:19] == "sort of"
+
+
+def test_scan_matches_whole_words_only():
+    scanner = LexiconScanner({"tone.positive": ["like"]})
+
+    assert scanner.scan("I like it, and it is likely alike.") == [LexiconHit("tone.positive", "like", 2, 6)]
+
+
+def test_overlapping_entries_are_all_reported():
+    scanner = LexiconScanner({"hedge": ["could", "could be"], "informal": ["maybe"], "hedge2": ["maybe"]})
+    hits = scanner.scan("It could be, maybe.")
+
+    assert [(hit.category, hit.phrase) for hit in hits] == [
+        ("hedge", "could"), ("hedge", "could be"), ("informal", "maybe"), ("hedge2", "maybe")
+    ]
+
+
+def test_phrase_words_must_be_separated_by_whitespace():
+    scanner = LexiconScanner({"hedge": ["kind of"]})
+
+    assert scanner.scan("It was kind-of odd.") == []
+    assert len(scanner.scan("It was kind\nof odd.")) == 1
+
+
+def test_offsets_index_the_original_text_when_lowercasing_changes_its_length():
+    # "İ".lower() is two characters long
+    text = "İİİ I think it is good"
+    hits = scan_lexicons(text)
+
+    spans = {(hit.category, text[hit.start:hit.end]) for hit in hits}
+    assert (HEDGING, "I think") in spans
+    assert ("tone.neutral", "think") in spans
+    assert ("tone.positive", "good") in spans
+
+
+def test_count_tokens_uses_existing_tokens():
+    counts = LexiconScanner({NEGATION: ["not", "never"], CONJUNCTION: ["and"]}).count_tokens(
+        ["I", "did", "NOT", "and", "never", "will"], (NEGATION,)
+    )
+
+    assert counts == {NEGATION: 2}
+
+
+def test_hedging_reuses_shared_hits():
+    text = "I think it might be right, in my opinion."
+    hits = scan_lexicons(text)
+
+    assert detect_hedging(text, hits=hits) == detect_hedging(text)
+    assert detect_hedging(text)["details"]["found_phrases"] == ["I think", "might be", "in my opinion"]
+    assert all(hit.category != HEDGING for hit in scan_lexicons("The cat sat on the mat."))
@@ -0,0 +1,97 @@
+"""
+Tests for the shared lazy model registry.
+"""
+
+import threading
+import time
+
+import pytest
+
+from analyzers.models import ModelRegistry, MODEL_NOT_LOADED, MODEL_READY, MODEL_FAILED
+
+
+def test_model_loads_once_on_first_use():
+    loads = []
+    registry = ModelRegistry()
+    registry.register("model", lambda: loads.append(1) or object())
+
+    assert registry.status()["models"]["model"]["state"] == MODEL_NOT_LOADED
+    assert registry.get("model") is registry.get("model")
+    assert len(loads) == 1
+    assert registry.status()["models"]["model"]["state"] == MODEL_READY
+
+
+def test_concurrent_first_use_shares_one_load():
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry()
+    registry.register("model", slow_loader)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("model"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_warmup_runs_inference_and_reports_timings():
+    calls = []
+    registry = ModelRegistry()
+    registry.register("model", lambda: "loaded", warmup=calls.append)
+
+    assert not registry.ready
+    registry.start_warmup().join()
+
+    status = registry.status()
+    assert status["ready"]
+    assert calls == ["loaded"]
+    assert status["models"]["model"]["load_seconds"] is not None
+    assert status["models"]["model"]["warmup_seconds"] is not None
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def flaky_loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("model files missing")
+        return "loaded"
+
+    registry = ModelRegistry()
+    registry.register("model", flaky_loader)
+    registry.register("other", lambda: "other")
+    registry.warmup()
+
+    status = registry.status()
+    assert not status["ready"]
+    assert status["models"]["model"] == {
+        "state": MODEL_FAILED, "load_seconds": None, "warmup_seconds": None, "error": "model files missing"
+    }
+    # One failing model does not stop the others from loading
+    assert status["models"]["other"]["state"] == MODEL_READY
+
+    assert registry.get("model") == "loaded"
+    assert registry.ready
+
+
+def test_register_keeps_the_first_loader():
+    registry = ModelRegistry()
+    registry.register("model", lambda: "first")
+    registry.register("model", lambda: "second")
+
+    assert registry.get("model") == "first"
+
+
+def test_unknown_model_raises():
+    with pytest.raises(KeyError):
+        ModelRegistry().get("missing")
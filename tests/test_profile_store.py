@@ -0,0 +1,88 @@
+"""
+Tests for the write-through style profile store.
+"""
+
+import asyncio
+
+import pytest
+
+from services.profile_store import NO_VERSION, ProfileConflictError, ProfileStore
+from style_profile_module.style_profile import StyleProfile
+
+
+def _profile(total_texts, tone="neutral"):
+    return StyleProfile(tone_distribution={tone: total_texts}, total_texts=total_texts)
+
+
+def _another_worker_saves(store, student_id, profile):
+    """Writes the stored row directly, as another process would, leaving this store's cache stale."""
+    version = store._rows.get(student_id, (NO_VERSION, None))[0]
+    store._rows[student_id] = (version + 1, profile.to_dict())
+
+
+def test_save_writes_through_and_reads_from_cache():
+    store = ProfileStore(use_database=False)
+
+    assert asyncio.run(store.get("s1")) is None
+    assert asyncio.run(store.save("s1", _profile(3))) == 1
+
+    profile = asyncio.run(store.get("s1"))
+    assert profile.total_texts == 3
+    assert store.stats()["hits"] == 1
+
+
+def test_profiles_handed_out_are_copies():
+    store = ProfileStore(use_database=False)
+    asyncio.run(store.save("s1", _profile(1)))
+
+    profile = asyncio.run(store.get("s1"))
+    profile.tone_distribution["formal"] = 5
+
+    assert asyncio.run(store.get("s1")).tone_distribution == {"neutral": 1}
+
+
+def test_update_applies_change_to_stored_profile():
+    store = ProfileStore(use_database=False)
+
+    first = asyncio.run(store.update("s1", lambda profile: _profile(1)))
+    assert (first.previous, first.version) == (None, 1)
+
+    second = asyncio.run(store.update("s1", lambda profile: _profile(profile.total_texts + 1)))
+    assert second.previous.total_texts == 1
+    assert (second.profile.total_texts, second.version) == (2, 2)
+
+
+def test_update_reapplies_change_after_a_concurrent_write():
+    store = ProfileStore(use_database=False)
+    asyncio.run(store.save("s1", _profile(1)))
+    _another_worker_saves(store, "s1", _profile(10, tone="formal"))
+
+    update = asyncio.run(store.update("s1", lambda profile: _profile(profile.total_texts + 1)))
+
+    # The stale cached profile (1 text) was not written over the newer one
+    assert update.previous.total_texts == 10
+    assert update.profile.total_texts == 11
+    assert store.stats()["conflicts"] == 1
+    assert asyncio.run(store.get("s1")).total_texts == 11
+
+
+def test_update_gives_up_when_every_attempt_conflicts():
+    store = ProfileStore(use_database=False)
+
+    def change(profile):
+        _another_worker_saves(store, "s1", _profile(99))
+        return _profile(1)
+
+    with pytest.raises(ProfileConflictError):
+        asyncio.run(store.update("s1", change))
+
+
+def test_lru_bound_keeps_rows():
+    store = ProfileStore(max_entries=2, use_database=False)
+    for index in range(3):
+        asyncio.run(store.save(f"s{index}", _profile(index)))
+
+    assert store.stats()["entries"] == 2
+    # Evicted from the cache, still in the table
+    assert asyncio.run(store.get("s0")).total_texts == 0
+    assert store.stats()["misses"] == 1
@@ -0,0 +1,46 @@
+"""
+Tests for the single-pass readability engine.
+"""
+
+import pytest
+import textstat
+
+from analyzers.readability_engine import count_readability, count_syllables
+
+TEXTS = [
+    "",
+    "Hi",
+    "The quick brown fox jumps over the lazy dog.",
+    "DON'T stop! It's 3.5 km away, e.g. past the U.S.A. border... isn't it?",
+    "'Twas the night before Christmas. Rock'n'roll ain't dead; the café's naïve owner said so.",
+    "Notwithstanding considerable methodological heterogeneity, the investigators concluded "
+    "that interdisciplinary collaboration substantially improves outcomes. Students agreed. "
+    "Zyxquorbit flimbrantly quazzled the snorkelwump!",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_counts_match_textstat(text):
+    counts = count_readability(text)
+
+    assert counts.sentence_count == textstat.sentence_count(text)
+    assert counts.word_count == textstat.lexicon_count(text, removepunct=True)
+    assert counts.syllable_count == textstat.syllable_count(text)
+    assert counts.polysyllable_count == textstat.polysyllabcount(text)
+    assert counts.difficult_word_count == textstat.difficult_words(text, syllable_threshold=3, unique=False)
+    assert counts.dale_chall_difficult_word_count == textstat.difficult_words(text, syllable_threshold=0, unique=False)
+
+
+@pytest.mark.parametrize("word", ["the", "Readability", "heterogeneity", "snorkelwump", "don't"])
+def test_syllables_match_textstat(word):
+    """Dictionary words and rule-based fallbacks both count like textstat."""
+    assert count_syllables(word) == textstat.syllable_count(word)
+
+
+def test_repeated_words_count_every_occurrence():
+    text = "Collaboration matters. " * 50
+
+    assert count_readability(text) == count_readability("Collaboration matters. ")._replace(
+        word_count=100, syllable_count=50 * textstat.syllable_count("Collaboration matters."),
+        polysyllable_count=50, difficult_word_count=50, dale_chall_difficult_word_count=100
+    )
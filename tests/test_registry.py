@@ -0,0 +1,110 @@
+"""
+Tests for the analyzer registry and selective execution.
+"""
+
+import asyncio
+import pytest
+from analyzers.pipeline import AnalyzerRegistry, AnalyzerSpec, ArtifactSpec, COST_CHEAP, COST_EXPENSIVE
+from services.analysis_executor import AnalysisExecutor
+from services.result_cache import ResultCache
+
+
+def make_registry(built):
+    def build_sentences(text):
+        built.append("sentences")
+        return text.split(". ")
+
+    def build_doc(text, sentences):
+        built.append("doc")
+        return [sentence.split() for sentence in sentences]
+
+    def count_sentences(text, sentences):
+        return {"score": len(sentences)}
+
+    def count_words(text, doc):
+        return {"score": sum(len(words) for words in doc)}
+
+    def text_length(text):
+        return {"score": len(text)}
+
+    return AnalyzerRegistry(
+        artifacts=[
+            ArtifactSpec("sentences", build_sentences),
+            ArtifactSpec("doc", build_doc, ("sentences",)),
+        ],
+        analyzers=[
+            AnalyzerSpec("length", text_length, "v1", COST_CHEAP),
+            AnalyzerSpec("sentences", count_sentences, "v1", COST_CHEAP, ("sentences",)),
+            AnalyzerSpec("words", count_words, "v1", COST_EXPENSIVE, ("doc",)),
+        ],
+    )
+
+
+TEXT = "One two three. Four five"
+
+
+@pytest.fixture
+def executor():
+    executor = AnalysisExecutor(thread_workers=2, process_workers=0)
+    yield executor
+    executor.shutdown()
+
+
+def test_select_validates_names():
+    registry = make_registry([])
+
+    assert registry.select(None) == ["length", "sentences", "words"]
+    assert registry.select(["words", "length", "words"]) == ["length", "words"]
+    with pytest.raises(ValueError):
+        registry.select(["length", "grammar"])
+
+
+def test_artifact_plan_includes_upstream_first():
+    registry = make_registry([])
+
+    assert registry.artifact_plan(["length"]) == []
+    assert registry.artifact_plan(["words"]) == ["sentences", "doc"]
+
+
+def test_registering_unknown_artifact_fails():
+    with pytest.raises(ValueError):
+        AnalyzerRegistry(analyzers=[AnalyzerSpec("words", len, "v1", requires=("doc",))])
+
+
+def test_only_required_artifacts_are_built(executor):
+    built = []
+    registry = make_registry(built)
+
+    results = asyncio.run(executor.run_pipeline(registry, TEXT, ["length"]))
+    assert results == {"length": {"score": len(TEXT)}}
+    assert built == []
+
+    results = asyncio.run(executor.run_pipeline(registry, TEXT))
+    assert results == {"length": {"score": len(TEXT)}, "sentences": {"score": 2}, "words": {"score": 5}}
+    assert built == ["sentences", "doc"]
+
+
+def test_cached_and_precomputed_results_skip_work(executor):
+    built = []
+    registry = make_registry(built)
+    cache = ResultCache(use_database=False)
+
+    asyncio.run(executor.run_pipeline(registry, TEXT, cache=cache))
+    built.clear()
+    results = asyncio.run(executor.run_pipeline(registry, TEXT, cache=cache))
+
+    assert results["words"] == {"score": 5}
+    assert built == []
+
+    results = asyncio.run(executor.run_pipeline(registry, "Other text", ["words"], precomputed={"words": {"score": 0}}))
+    assert results == {"words": {"score": 0}}
+    assert built == []
+
+
+def test_lightweight_selection_skips_tagging():
+    """Dashboards asking for sentiment and tone do not tokenize or tag."""
+    from analyzers.registry_lightweight import registry
+
+    assert registry.artifact_plan(["sentiment", "tone"]) == []
+    assert registry.artifact_plan(["lexical_richness"]) == ["sentences"]
+    assert registry.artifact_plan(["grammar"]) == ["sentences", "doc"]
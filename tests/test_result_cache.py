@@ -0,0 +1,64 @@
+"""
+Tests for the content-addressed analysis result cache.
+"""
+
+import asyncio
+from services.result_cache import ResultCache, hash_text
+
+VERSIONS = {"tone": "v1", "grammar": "v1"}
+RESULTS = {"tone": {"score": 0.9, "bucket": "neutral"}, "grammar": {"score": 1.0, "bucket": "excellent"}}
+
+
+def test_hash_ignores_surrounding_whitespace_and_line_endings():
+    assert hash_text("  An essay.\r\nSecond line.\n") == hash_text("An essay.\nSecond line.")
+    assert hash_text("An essay.") != hash_text("An essay!")
+
+
+def test_memory_hits_and_misses_are_counted():
+    cache = ResultCache(use_database=False)
+    key = hash_text("An essay.")
+
+    assert asyncio.run(cache.get_many(key, VERSIONS)) == {}
+    cache.put_many(key, VERSIONS, RESULTS)
+
+    assert asyncio.run(cache.get_many(key, VERSIONS)) == RESULTS
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["database_hits"], stats["misses"]) == (2, 0, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_bound_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, use_database=False)
+    first, second = hash_text("first"), hash_text("second")
+    cache.put_many(first, VERSIONS, RESULTS)
+    cache.put_many(second, {"tone": "v1"}, {"tone": RESULTS["tone"]})
+
+    assert cache.stats()["entries"] == 2
+    assert asyncio.run(cache.get_many(first, VERSIONS)) == {"grammar": RESULTS["grammar"]}
+
+
+def test_version_change_invalidates_analyzer():
+    cache = ResultCache(use_database=False)
+    key = hash_text("An essay.")
+    cache.put_many(key, VERSIONS, RESULTS)
+
+    assert asyncio.run(cache.get_many(key, {"tone": "v2", "grammar": "v1"})) == {"grammar": RESULTS["grammar"]}
+    # The old version's entries are gone, not just shadowed
+    assert asyncio.run(cache.get_many(key, VERSIONS)) == {"grammar": RESULTS["grammar"]}
+
+
+def test_database_tier_fills_memory_tier():
+    cache = ResultCache()
+    lookups = []
+
+    async def stored(text_hash, versions):
+        lookups.append(sorted(versions))
+        return {"tone": RESULTS["tone"]}
+
+    cache._get_from_database = stored
+    key = hash_text("An essay.")
+
+    assert asyncio.run(cache.get_many(key, VERSIONS)) == {"tone": RESULTS["tone"]}
+    assert asyncio.run(cache.get_many(key, {"tone": "v1"})) == {"tone": RESULTS["tone"]}
+    assert lookups == [["grammar", "tone"]]
+    assert cache.stats()["database_hits"] == 1
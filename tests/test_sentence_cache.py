@@ -0,0 +1,107 @@
+"""
+Tests for the sentence-level cache used to re-analyze revised drafts.
+"""
+
+from analyzers.sentence_cache import SentenceCache
+from analyzers.grammar_lightweight import analyze_grammar
+
+
+class TaggedDraft:
+    """A pre-split, pre-tagged draft in the shape of a LightweightDocument."""
+
+    def __init__(self, sentence_tags):
+        self.sentence_tags = sentence_tags
+        self.sentences = [" ".join(word for word, tag in tags) for tags in sentence_tags]
+
+
+FIRST = [("The", "DT"), ("cat", "NN"), ("sat", "VBD"), ("down", "RP"), (".", ".")]
+SECOND = [("They", "PRP"), ("is", "VBZ"), ("late", "JJ"), (".", ".")]
+REVISED = [("They", "PRP"), ("are", "VBP"), ("late", "JJ"), (".", ".")]
+
+
+def test_values_are_computed_once_per_sentence():
+    cache = SentenceCache(max_entries=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("tags", "A sentence.", compute) == 1
+    assert cache.get_or_compute("tags", "A sentence.", compute) == 1
+    assert cache.get_or_compute("grammar", "A sentence.", compute) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_misses_are_computed_in_one_batch():
+    cache = SentenceCache(max_entries=10)
+    cache.get_or_compute("tags", "two", lambda: "TWO")
+    batches = []
+
+    def compute_many(missing):
+        batches.append(missing)
+        return [f"tagged {index}" for index in missing]
+
+    assert cache.get_or_compute_many("tags", ["one", "two", "three"], compute_many) == ["tagged 0", "TWO", "tagged 2"]
+    assert batches == [[0, 2]]
+
+    # Everything is cached now, so nothing is computed
+    assert cache.get_or_compute_many("tags", ["three", "one"], compute_many) == ["tagged 2", "tagged 0"]
+    assert batches == [[0, 2]]
+    assert cache.stats()["hits"] == 3
+
+
+def test_lru_bound_evicts_oldest_sentence():
+    cache = SentenceCache(max_entries=2)
+    for sentence in ("one", "two", "three"):
+        cache.get_or_compute("tags", sentence, lambda: sentence)
+
+    assert cache.stats()["entries"] == 2
+    cache.get_or_compute("tags", "one", lambda: "recomputed")
+    assert cache.stats()["misses"] == 4
+
+
+def test_revised_draft_only_checks_changed_sentences():
+    from analyzers import grammar_lightweight
+    cache = SentenceCache()
+    original_cache = grammar_lightweight.sentence_cache
+    grammar_lightweight.sentence_cache = cache
+    try:
+        draft = analyze_grammar("", doc=TaggedDraft([FIRST, SECOND]))
+        revision = analyze_grammar("", doc=TaggedDraft([FIRST, REVISED]))
+    finally:
+        grammar_lightweight.sentence_cache = original_cache
+
+    assert draft["raw"]["issue_count"] == 1
+    assert revision["raw"]["issue_count"] == 0
+    # The unchanged first sentence was not checked again
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_revised_draft_only_classifies_changed_tone_windows():
+    from analyzers import tone_base
+    cache = SentenceCache()
+    classified = []
+
+    def classify_windows(windows):
+        classified.extend(windows)
+        return [[{"label": "neutral", "score": 0.9}] for _ in windows]
+
+    def count_tokens(sentences):
+        return [len(sentence.split()) for sentence in sentences]
+
+    original_cache = tone_base.sentence_cache
+    tone_base.sentence_cache = cache
+    try:
+        classify = tone_base.cached_per_unit("emotions", classify_windows)
+        count = tone_base.cached_per_unit("tokens", count_tokens)
+        draft = "The cat sat down. They is late. We left early."
+        tone_base.classify_texts([draft], classify, count, threshold=0.4, score_diff=0.05, max_tokens=4)
+        classified.clear()
+        tone_base.classify_texts([draft.replace("is", "are")], classify, count, threshold=0.4, score_diff=0.05, max_tokens=4)
+    finally:
+        tone_base.sentence_cache = original_cache
+
+    # Each sentence is its own window here; only the edited one reached the model
+    assert classified == ["They are late."]
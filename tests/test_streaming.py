@@ -0,0 +1,94 @@
+"""
+Tests for streaming analysis results as they complete.
+"""
+
+import asyncio
+import json
+import time
+from analyzers.pipeline import AnalyzerRegistry, AnalyzerSpec, ArtifactSpec, COST_CHEAP, COST_EXPENSIVE
+from services.analysis_executor import AnalysisExecutor
+from services.streaming import encode_event, stream_analysis_events
+
+
+def slow_parse(text):
+    time.sleep(0.3)
+    return text.split()
+
+
+def count_words(text, doc):
+    return {"score": len(doc)}
+
+
+def text_length(text):
+    return {"score": len(text)}
+
+
+def failing(text):
+    raise RuntimeError("model unavailable")
+
+
+REGISTRY = AnalyzerRegistry(
+    artifacts=[ArtifactSpec("doc", slow_parse)],
+    analyzers=[
+        AnalyzerSpec("words", count_words, "v1", COST_EXPENSIVE, ("doc",)),
+        AnalyzerSpec("length", text_length, "v1", COST_CHEAP),
+    ],
+)
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_cheap_results_stream_before_artifacts_are_built():
+    executor = AnalysisExecutor(thread_workers=2, process_workers=0)
+    start = time.perf_counter()
+    arrivals = []
+
+    async def run():
+        async for name, result in executor.stream_pipeline(REGISTRY, "one two three"):
+            arrivals.append((name, result, time.perf_counter() - start))
+
+    asyncio.run(run())
+    executor.shutdown()
+
+    assert [name for name, _, _ in arrivals] == ["length", "words"]
+    assert arrivals[0][2] < 0.2
+    assert arrivals[1][1] == {"score": 3}
+
+
+def test_events_end_with_summary():
+    executor = AnalysisExecutor(thread_workers=2, process_workers=0)
+
+    async def finalize(results, total_time):
+        return {"analyzers": sorted(results), "anomaly": False}
+
+    events = asyncio.run(collect(stream_analysis_events(
+        executor.stream_pipeline(REGISTRY, "one two", ["length"]), finalize
+    )))
+    executor.shutdown()
+
+    lines = [json.loads(event) for event in events]
+    assert [line["event"] for line in lines] == ["result", "summary"]
+    assert lines[0]["analyzer"] == "length" and lines[0]["result"] == {"score": 7}
+    assert lines[1]["analyzers"] == ["length"]
+
+
+def test_failure_ends_stream_with_error_event():
+    registry = AnalyzerRegistry(analyzers=[AnalyzerSpec("tone", failing, "v1")])
+    executor = AnalysisExecutor(thread_workers=1, process_workers=0)
+
+    async def finalize(results, total_time):
+        raise AssertionError("summary must not be sent after a failure")
+
+    events = asyncio.run(collect(stream_analysis_events(executor.stream_pipeline(registry, "text"), finalize)))
+    executor.shutdown()
+
+    assert json.loads(events[-1])["event"] == "error"
+    assert "model unavailable" in json.loads(events[-1])["error"]
+
+
+def test_sse_encoding():
+    event = encode_event("result", {"analyzer": "tone"}, "sse")
+
+    assert event == 'event: result\ndata: {"analyzer": "tone"}\n\n'
@@ -0,0 +1,54 @@
+"""
+Tests for the request-scoped text statistics shared by readability, formality and complexity.
+"""
+
+import pytest
+import textstat
+from unittest.mock import patch
+from analyzers.readability_engine import count_readability
+from analyzers.text_stats import TextStatistics
+from analyzers.readability import analyze_readability
+
+TEXTS = [
+    "The quick brown fox jumps over the lazy dog.",
+    "Notwithstanding considerable methodological heterogeneity, the investigators concluded "
+    "that interdisciplinary collaboration substantially improves outcomes. Students agreed.",
+    "It is a truth universally acknowledged, that a single man in possession of a good fortune, "
+    "must be in want of a wife.",
+    "Hi",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_indices_match_textstat(text):
+    """Indices derived from shared counts match textstat's own functions."""
+    stats = TextStatistics(text)
+
+    assert stats.readability_scores == {
+        "flesch_kincaid_grade": round(textstat.flesch_kincaid_grade(text), 2),
+        "smog_index": round(textstat.smog_index(text), 2),
+        "gunning_fog": round(textstat.gunning_fog(text), 2),
+        "dale_chall_score": round(textstat.dale_chall_readability_score(text), 2),
+        "word_count": textstat.lexicon_count(text, removepunct=True),
+        "sentence_count": textstat.sentence_count(text)
+    }
+
+
+def test_counts_are_memoized():
+    """The text is counted once no matter how many analyzers read it."""
+    text = TEXTS[1]
+    stats = TextStatistics(text)
+
+    with patch("analyzers.text_stats.count_readability", wraps=count_readability) as counter:
+        analyze_readability(text, stats=stats)
+        analyze_readability(text, stats=stats)
+        _ = stats.flesch_kincaid_grade
+
+    assert counter.call_count == 1
+
+
+def test_readability_with_shared_stats_matches_default():
+    """Passing shared statistics does not change the readability response."""
+    text = TEXTS[2]
+
+    assert analyze_readability(text, stats=TextStatistics(text)) == analyze_readability(text)
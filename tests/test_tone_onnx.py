@@ -0,0 +1,45 @@
+"""
+Parity tests between the torch and ONNX Runtime tone backends.
+
+Skipped unless torch, transformers and onnxruntime are installed and the
+ONNX model has been exported (python export_tone_onnx.py).
+"""
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+pytest.importorskip("transformers")
+
+from pathlib import Path
+
+MODEL_DIR = Path(__file__).resolve().parent.parent / "models" / "go_emotions_onnx"
+if not (MODEL_DIR / "model.int8.onnx").exists():
+    pytest.skip("ONNX tone model not exported", allow_module_level=True)
+
+from analyzers import tone, tone_onnx
+
+TEXTS = [
+    "I am thrilled with how this project turned out and proud of the team.",
+    "This is frustrating. Nothing works and I keep running into the same errors.",
+    "The results indicate a moderate correlation between the two variables.",
+    "Thank you so much for the helpful feedback on my draft!",
+    " ".join("The trial was repeated to confirm the findings. The numbers varied slightly." for _ in range(80)),
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_onnx_matches_torch(text):
+    expected = tone.classify_tone_model(text)
+    actual = tone_onnx.classify_tone_model(text)
+
+    assert set(actual) == set(expected)
+    assert actual["raw"]["windows"] == expected["raw"]["windows"]
+    assert actual["details"]["top_emotion"] == expected["details"]["top_emotion"]
+    # int8 weights move scores a little, never the ranking of a clear winner
+    assert actual["score"] == pytest.approx(expected["score"], abs=0.05)
+
+
+def test_onnx_batch_matches_single_calls():
+    batch = tone_onnx.classify_tone_batch(TEXTS)
+    assert [result["bucket"] for result in batch] == [tone_onnx.classify_tone_model(text)["bucket"] for text in TEXTS]
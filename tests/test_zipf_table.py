@@ -0,0 +1,55 @@
+"""
+Tests for the memory-mapped Zipf frequency table.
+"""
+
+import numpy as np
+import pytest
+from wordfreq import zipf_frequency
+
+from analyzers.zipf_table import ZipfTable, summarize_zipf_scores, write_zipf_table, zipf_frequencies
+
+WORDS = ["the", "cat", "ubiquitous", "café", "serendipity", "zebra"]
+
+
+def test_table_matches_wordfreq(tmp_path):
+    write_zipf_table(tmp_path, WORDS)
+    table = ZipfTable.load(tmp_path)
+
+    assert isinstance(table.vocab, np.memmap)
+    assert table.lookup(WORDS).tolist() == [zipf_frequency(word, "en") for word in WORDS]
+
+
+def test_words_outside_the_table_are_nan(tmp_path):
+    write_zipf_table(tmp_path, WORDS)
+    table = ZipfTable.load(tmp_path)
+
+    # "cats" sorts next to "cat"; "serendipityx" is longer than any stored word
+    scores = table.lookup(["cats", "serendipityx", "zebra", "aardvark", "zzz"])
+    assert np.isnan(scores[[0, 1, 3, 4]]).all()
+    assert scores[2] == zipf_frequency("zebra", "en")
+
+
+def test_batch_lookup_falls_back_to_wordfreq():
+    tokens = ["the", "photosynthesis", "qzxvbn"]
+
+    assert zipf_frequencies(tokens).tolist() == [zipf_frequency(token, "en") for token in tokens]
+    assert zipf_frequencies([]).tolist() == []
+
+
+def test_summary_matches_python_statistics():
+    scores = [2.5, 3.0, 4.49, 4.5, 5.99, 6.0, 7.2, 3.8, 5.1]
+    summary = summarize_zipf_scores(np.array(scores))
+
+    ordered = sorted(scores)
+    assert summary["mean"] == pytest.approx(sum(scores) / len(scores))
+    assert (summary["min"], summary["max"]) == (min(scores), max(scores))
+    # Observed scores: the median is the upper median, as sorted(scores)[n // 2]
+    assert summary["median"] == ordered[len(scores) // 2]
+    assert (summary["p10"], summary["p90"]) == (ordered[1], ordered[-1])
+    assert summary["rare_count"] == sum(1 for score in scores if score < 4.5)
+    assert summary["bands"] == {
+        "very_rare_words": sum(1 for score in scores if score < 3.0),
+        "rare_words": sum(1 for score in scores if 3.0 <= score < 4.5),
+        "common_words": sum(1 for score in scores if 4.5 <= score < 6.0),
+        "very_common_words": sum(1 for score in scores if score >= 6.0)
+    }